@@ -1,10 +1,18 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse, RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 import os
 import pathlib
+from config.settings import settings
+from services import assets
+from services.lifespan import lifespan
+from services.responses import FastJSONResponse
+from services.metrics import MetricsMiddleware
+from services.resilience import ServiceUnavailableError, service_unavailable_handler
+from services.warmup import WarmupMiddleware
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -14,6 +22,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size, compresslevel=settings.gzip_level)
+app.add_middleware(WarmupMiddleware)
+# Outermost, so its timings cover every other middleware
+app.add_middleware(MetricsMiddleware)
+# Upstream outages and exhausted retries become 503 with Retry-After
+app.add_exception_handler(ServiceUnavailableError, service_unavailable_handler)
 
 # Get base directory (for resolving templates)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -54,12 +68,12 @@ async def get_firebase_config():
     }
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """Serve the main index.html file"""
     try:
-        index_path = os.path.join(TEMPLATES_DIR, "index.html")
-        if os.path.exists(index_path) and os.path.isfile(index_path):
-            return FileResponse(index_path)
+        response = assets.response(request, "templates/index.html")
+        if response is not None:
+            return response
         
         # Fallback content if file doesn't exist
         return HTMLResponse(content="""
@@ -103,21 +117,22 @@ async def root():
         """, status_code=500)
 
 @app.get("/templates/{path:path}")
-async def serve_template(path: str):
+async def serve_template(request: Request, path: str):
     """Serve template files directly"""
-    file_path = os.path.join(TEMPLATES_DIR, path)
-    if os.path.exists(file_path) and os.path.isfile(file_path):
-        return FileResponse(file_path)
-    return {"error": "Template not found"}
+    response = assets.response(request, f"templates/{path}")
+    if response is not None:
+        return response
+    return JSONResponse(status_code=404, content={"error": "Template not found"})
 
 @app.get("/components/{component_type}/{file_name}")
-async def get_component(component_type: str, file_name: str):
+async def get_component(request: Request, component_type: str, file_name: str):
     """Serve component templates for backward compatibility"""
     try:
-        file_path = os.path.join(TEMPLATES_DIR, component_type, file_name)
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            return FileResponse(file_path)
-        return {"error": f"Template not found: {component_type}/{file_name}"}
+        # Lookups only match files cached at startup, so traversal paths cannot escape templates/
+        response = assets.response(request, f"templates/{component_type}/{file_name}")
+        if response is not None:
+            return response
+        return JSONResponse(status_code=404, content={"error": f"Template not found: {component_type}/{file_name}"})
     except Exception as e:
         return {"error": f"Error serving template: {str(e)}"}
 
@@ -148,8 +163,13 @@ async def debug_templates():
         return {"error": f"Error checking templates: {str(e)}"}
 
 # Import routes at the bottom to avoid circular imports
-from routes import auth, company, jd
+from routes import auth, company, dashboard, export, jd, metrics, skills, stats
 
 app.include_router(auth.router, prefix="/auth")
 app.include_router(company.router, prefix="/company")
-app.include_router(jd.router, prefix="/jd") 
\ No newline at end of file
+app.include_router(jd.router, prefix="/jd")
+app.include_router(dashboard.router, prefix="/dashboard")
+app.include_router(skills.router, prefix="/skills")
+app.include_router(export.router, prefix="/export")
+app.include_router(stats.router, prefix="/api/stats")
+app.include_router(metrics.router) 
\ No newline at end of file
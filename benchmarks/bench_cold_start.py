@@ -0,0 +1,64 @@
+# benchmarks/bench_cold_start.py
+"""
+Cold-start benchmark: time from process launch to the first 200 response.
+
+    python -m benchmarks.bench_cold_start --runs 10 --path /api/health
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def cold_start(app: str, path: str, timeout: float) -> float:
+    port = free_port()
+    env = dict(os.environ, VERCEL="1")  # same lazy startup path as a Vercel cold start
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                connection.request("GET", path)
+                if connection.getresponse().status == 200:
+                    return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError(f"No 200 response from {path} within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="api.index:app")
+    parser.add_argument("--path", default="/api/health")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30)
+    args = parser.parse_args()
+
+    samples = [cold_start(args.app, args.path, args.timeout) * 1000 for _ in range(args.runs)]
+    print(json.dumps({
+        "app": args.app,
+        "path": args.path,
+        "runs": args.runs,
+        "min_ms": round(min(samples), 1),
+        "median_ms": round(statistics.median(samples), 1),
+        "max_ms": round(max(samples), 1),
+        "samples_ms": [round(sample, 1) for sample in samples],
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
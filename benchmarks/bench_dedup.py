@@ -0,0 +1,63 @@
+# benchmarks/bench_dedup.py
+"""
+Near-duplicate lookup latency as one company's backlog grows. LSH lookups
+should stay roughly flat while a pairwise scan grows linearly.
+
+    python -m benchmarks.bench_dedup --sizes 1000 10000 50000 --queries 200
+"""
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from benchmarks.bench_search import percentile, synthetic_jd
+from services.dedup_index import DedupIndex
+
+def run(sizes, queries, seed=0):
+    rng = random.Random(seed)
+    results = []
+    for size in sizes:
+        rows = [dict(synthetic_jd(rng, i), company_id=1) for i in range(1, size + 1)]
+        index = DedupIndex()
+        start = time.perf_counter()
+        index.add_many(rows, in_order=True)
+        build = time.perf_counter() - start
+
+        probes = []
+        for row in rng.sample(rows, min(queries, size)):
+            # A lightly edited repost of an existing posting
+            probe = dict(row, job_summary=(row["job_summary"] or "") + " apply today")
+            probes.append(probe)
+        lookup, pairwise, found = [], [], 0
+        for probe in probes:
+            start = time.perf_counter()
+            signature = index.signature(probe)
+            found += bool(index.query(1, signature))
+            lookup.append((time.perf_counter() - start) * 1000)
+        stored = np.frombuffer(index.signatures, dtype=np.uint32).reshape(-1, index.num_perm)
+        for probe in probes[:20]:
+            start = time.perf_counter()
+            signature = index.signature(probe)
+            (stored == signature).mean(axis=1)
+            pairwise.append((time.perf_counter() - start) * 1000)
+        results.append({
+            "postings": size,
+            "build_us_per_jd": round(build / size * 1e6, 1),
+            "lookup_p50_ms": round(percentile(lookup, 50), 3),
+            "lookup_p99_ms": round(percentile(lookup, 99), 3),
+            "pairwise_p50_ms": round(percentile(pairwise, 50), 3),
+            "recall": round(found / len(probes), 3),
+        })
+    return {"num_perm": index.num_perm, "bands": index.bands, "rows_per_band": index.rows, "results": results}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.queries), indent=2))
+
+if __name__ == "__main__":
+    main()
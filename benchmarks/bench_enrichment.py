@@ -0,0 +1,90 @@
+# benchmarks/bench_enrichment.py
+"""
+Job description enrichment cost. "per_row" is what enriching inline in
+/jd/submit would add to each request. "backfill" is the resumable backfill's
+throughput over a scratch SQLite database seeded with synthetic job
+descriptions, for each process pool size (0 enriches in a thread of the
+event loop's process).
+
+    python -m benchmarks.bench_enrichment --rows 20000 --workers 0,1,2,4
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.standins import synthetic_job
+from services import enrichment, enrichment_worker, hasura_service, sql_storage
+
+SALARIES = ("$120,000 - $150,000 per year", "60-70k EUR", "up to 45/hr", "Competitive", "£55k + bonus")
+LOCATIONS = ("San Francisco, CA; New York, NY", "Remote (US)", "London, UK / Berlin", "NYC or Remote", "Bangalore, India")
+
+def job(rng, company_id):
+    row = synthetic_job(rng, 0, company_id)
+    del row["id"]
+    row["base_salary"] = rng.choice(SALARIES)
+    row["work_locations"] = rng.choice(LOCATIONS)
+    return row
+
+def per_row(rows):
+    samples = []
+    for index, row in enumerate(rows):
+        start = time.perf_counter()
+        enrichment.enrich({**row, "id": index})
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {"mean_us": round(statistics.fmean(samples), 1), "p99_us": round(samples[int(len(samples) * 0.99)], 1)}
+
+async def backfill(path, workers, page_size):
+    backend = sql_storage.SQLiteBackend(path)
+    hasura_service._backend = backend
+    worker = enrichment_worker.EnrichmentWorker(workers, page_size, page_size)
+    try:
+        start = time.perf_counter()
+        progress = await worker.backfill(0, page_size)
+        elapsed = time.perf_counter() - start
+    finally:
+        worker.close()
+        await backend.close()
+        hasura_service._backend = None
+    return {"rows": progress["enriched"], "rows_per_second": round(progress["enriched"] / elapsed)}
+
+async def seed(path, rows):
+    backend = sql_storage.SQLiteBackend(path)
+    try:
+        company = await backend.insert_company({"user_id": "user-1", "name": "Company 1"})
+        for start in range(0, len(rows), 1000):
+            await backend.insert_jobs([{**row, "company_id": company["id"]} for row in rows[start:start + 1000]])
+    finally:
+        await backend.close()
+
+def run(args):
+    rng = random.Random(0)
+    rows = [job(rng, 1) for _ in range(args.rows)]
+    results = {"rows": args.rows, "per_row": per_row(rows[:2000]), "backfill": {}}
+    directory = tempfile.mkdtemp(prefix="bench_enrichment_")
+    path = os.path.join(directory, "enrichment.db")
+    try:
+        asyncio.run(seed(path, rows))
+        for workers in (int(count) for count in args.workers.split(",")):
+            results["backfill"][f"workers_{workers}"] = asyncio.run(backfill(path, workers, args.page_size))
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--workers", default="0,1,2,4", help="comma-separated process pool sizes")
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_export.py
+"""
+Streaming export throughput and peak memory as the job table grows, against
+a scratch SQLite database seeded with synthetic job descriptions. For each
+size and format it reports rows per second and the peak Python heap
+(tracemalloc) plus Arrow's peak allocation; the "materialized" row loads
+every row first and then encodes it, which is what callers did before.
+
+    python -m benchmarks.bench_export --sizes 5000,20000,80000 [--formats jsonl,csv,parquet]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import orjson
+
+from benchmarks.standins import synthetic_job
+from services import export, hasura_service, sql_storage
+
+async def seed(backend, total, companies, rng):
+    if await backend.get_company_by_user_id("user-1") is None:
+        for number in range(1, companies + 1):
+            await backend.insert_company({"user_id": f"user-{number}", "name": f"Company {number}"})
+    existing = len(await backend.export_page("job_descriptions", 0, total + 1, ("id",)))
+    for start in range(existing, total, 1000):
+        rows = []
+        for _ in range(min(1000, total - start)):
+            row = synthetic_job(rng, 0, rng.randint(1, companies))
+            del row["id"]
+            rows.append(row)
+        await backend.insert_jobs(rows)
+
+def arrow_peak():
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow.default_memory_pool().max_memory()
+
+async def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = await run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {"rows_per_second": round(rows / elapsed), "peak_python_mb": round(peak / 2**20, 1)}
+    arrow = arrow_peak()
+    if arrow is not None:
+        result["peak_arrow_mb"] = round(arrow / 2**20, 1)
+    return result
+
+async def streamed(export_format, page_size):
+    progress = {}
+    async for _ in export.export_stream("jobs", export_format, page_size=page_size, progress=progress):
+        pass
+    return progress["rows"]
+
+async def materialized(page_size):
+    fields = export.export_fields("jobs")
+    rows = []
+    async for page in export.iter_pages("jobs", fields, page_size=page_size):
+        rows.extend(page)
+    b"".join(orjson.dumps(row) + b"\n" for row in rows)
+    return len(rows)
+
+async def run(args):
+    formats = args.formats.split(",")
+    results = {"page_size": args.page_size, "sizes": {}}
+    directory = tempfile.mkdtemp(prefix="bench_export_")
+    path = os.path.join(directory, "export.db")
+    backend = sql_storage.SQLiteBackend(path)
+    hasura_service._backend = backend
+    rng = random.Random(0)
+    try:
+        await backend.open()
+        for size in (int(size) for size in args.sizes.split(",")):
+            await seed(backend, size, args.companies, rng)
+            level = {}
+            for export_format in formats:
+                level[export_format] = await measure(lambda: streamed(export_format, args.page_size))
+            level["materialized_jsonl"] = await measure(lambda: materialized(args.page_size))
+            results["sizes"][size] = level
+    finally:
+        await backend.close()
+        hasura_service._backend = None
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="5000,20000,80000", help="comma-separated job counts")
+    parser.add_argument("--formats", default="jsonl,csv,parquet")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--companies", type=int, default=100)
+    args = parser.parse_args()
+    if "parquet" in args.formats.split(","):
+        export.check_format("parquet")
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_facets.py
+"""
+Facet bitmap index: bulk build, incremental insert and filter + count query
+latency over synthetic postings.
+
+    python -m benchmarks.bench_facets --jds 100000 --queries 500
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.bench_search import percentile
+from services.facet_index import FacetIndex
+
+VALUES = {
+    "job_level": ("Senior", "Sr.", "Junior", "Mid Level", "Lead", "Staff", "Principal"),
+    "department": ("Engineering", "Eng", "Sales", "Marketing", "HR", "Finance", "Design", "Support", "Legal", "Operations"),
+    "job_function": ("Software Development", "Data", "Product", "Security", "Infrastructure", "Research"),
+    "work_model": ("Remote", "Fully Remote", "Hybrid", "On-site", "Hybrid / Remote"),
+    "time_commitment": ("Full-time", "Part time", "Contract"),
+    "shift_type": ("Day", "Night", "Rotating", None),
+    "visa_sponsorship": ("Yes", "No", None),
+}
+
+def synthetic_row(rng, jd_id):
+    return {"id": jd_id, **{field: rng.choice(values) for field, values in VALUES.items()}}
+
+def run(jds, queries, seed=0):
+    rng = random.Random(seed)
+    rows = [synthetic_row(rng, i) for i in range(1, jds + 1)]
+    index = FacetIndex()
+    start = time.perf_counter()
+    index.add_many(rows, in_order=True)
+    build = time.perf_counter() - start
+
+    inserts = []
+    for jd_id in range(jds + 1, jds + 201):
+        start = time.perf_counter()
+        index.add_many([synthetic_row(rng, jd_id)])
+        inserts.append((time.perf_counter() - start) * 1e6)
+
+    scenarios = {
+        "counts_only": lambda: ({}, ("department",)),
+        "one_filter": lambda: ({"job_level": ["senior"]}, ("department",)),
+        "senior_and_remote_by_department": lambda: ({"job_level": ["senior"], "work_model": ["remote"]}, ("department",)),
+        "three_filters_all_facets": lambda: (
+            {"job_level": [rng.choice(VALUES["job_level"])], "work_model": ["remote", "hybrid"], "time_commitment": ["full-time"]},
+            tuple(VALUES),
+        ),
+    }
+    results = {}
+    for label, scenario in scenarios.items():
+        samples = []
+        for _ in range(queries):
+            filters, facets = scenario()
+            start = time.perf_counter()
+            index.query(filters, facets, limit=20)
+            samples.append((time.perf_counter() - start) * 1000)
+        results[label] = {f"p{p}_ms": round(percentile(samples, p), 3) for p in (50, 95, 99)}
+
+    return {
+        "jds": len(index),
+        "bitmaps": sum(len(bitmaps) for bitmaps in index.bitmaps.values()),
+        "build_s": round(build, 3),
+        "insert_p50_us": round(percentile(inserts, 50), 1),
+        "query": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jds", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(run(args.jds, args.queries), indent=2))
+
+if __name__ == "__main__":
+    main()
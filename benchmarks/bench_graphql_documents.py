@@ -0,0 +1,100 @@
+# benchmarks/bench_graphql_documents.py
+"""
+Micro-benchmark: per-request GraphQL string building vs registered documents.
+
+Run from the project root:
+    python -m benchmarks.bench_graphql_documents
+"""
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from services import graphql_queries
+from routes.jd import JDInput
+
+ITERATIONS = 20000
+
+def legacy_gql_type(key, value):
+    if key == "company_id" or key == "id" or key == "year_founded":
+        return "Int!"
+    if isinstance(value, bool):
+        return "Boolean!"
+    return "String!"
+
+def legacy_build(jd):
+    # The pre-registry insert_job_description query builder
+    fields = []
+    variables = {}
+    for key, value in jd.model_dump().items():
+        if key != "id" and value is not None:
+            fields.append(f"{key}: ${key}")
+            variables[key] = value
+    query = f"""
+    mutation ({', '.join(f"${key}: {legacy_gql_type(key, value)}" for key, value in variables.items())}) {{
+      insert_job_descriptions(objects: {{{', '.join(fields)}}}) {{
+        returning {{
+          id
+          company_id
+          title
+        }}
+      }}
+    }}
+    """
+    return {"query": query, "variables": variables}
+
+def registry_build(jd):
+    document = graphql_queries.INSERT_JOB_DESCRIPTION
+    return {
+        "operationName": document.name,
+        "query": document.query,
+        "variables": {"object": jd.model_dump(exclude={"id"}, exclude_none=True)},
+    }
+
+def sample_jds(count):
+    rng = random.Random(42)
+    optional = [name for name in JDInput.model_fields if name not in ("company_id", "title")]
+    samples = []
+    for i in range(count):
+        filled = rng.sample(optional, rng.randint(0, len(optional)))
+        samples.append(JDInput(company_id=1, title=f"Job {i}", **{name: f"value {i}" for name in filled}))
+    return samples
+
+def time_build(builder, jds):
+    start = time.perf_counter()
+    for jd in jds:
+        builder(jd)
+    return (time.perf_counter() - start) / len(jds) * 1e6
+
+async def time_send(builder, jds):
+    def handler(request):
+        return httpx.Response(200, json={"data": {"insert_job_descriptions": {"returning": [{"id": 1, "company_id": 1, "title": "t"}]}}})
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        start = time.perf_counter()
+        for jd in jds:
+            response = await client.post("http://hasura.test/v1/graphql", json=builder(jd))
+            response.json()
+        return (time.perf_counter() - start) / len(jds) * 1e6
+
+def main():
+    jds = sample_jds(ITERATIONS)
+    distinct_legacy = len({legacy_build(jd)["query"] for jd in jds})
+    results = {
+        "iterations": ITERATIONS,
+        "legacy": {
+            "build_us": round(time_build(legacy_build, jds), 2),
+            "build_and_send_us": round(asyncio.run(time_send(legacy_build, jds)), 2),
+            "distinct_documents": distinct_legacy,
+        },
+        "registry": {
+            "build_us": round(time_build(registry_build, jds), 2),
+            "build_and_send_us": round(asyncio.run(time_send(registry_build, jds)), 2),
+            "distinct_documents": len(graphql_queries.all_documents()),
+        },
+    }
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
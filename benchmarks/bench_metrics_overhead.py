@@ -0,0 +1,63 @@
+# benchmarks/bench_metrics_overhead.py
+"""
+Cost of the metrics middleware, Hasura/Firebase instrumentation and the
+Server-Timing header: the request pipeline benchmark with instrumentation
+off, metrics only, and metrics plus Server-Timing, plus the raw cost of
+single metric updates.
+
+    python -m benchmarks.bench_metrics_overhead --requests 1000 --rounds 3
+"""
+import argparse
+import asyncio
+import json
+import timeit
+
+from benchmarks import bench_request_pipeline
+from services import metrics
+
+MODES = {
+    "off": (False, False),
+    "metrics": (True, False),
+    "metrics+server_timing": (True, True),
+}
+
+def micro(number=200000):
+    histogram = metrics.Histogram("bench_seconds", "benchmark only", ("route", "method"))
+    counter = metrics.Counter("bench_total", "benchmark only", ("route", "method", "status"))
+    metrics._registry.remove(histogram)
+    metrics._registry.remove(counter)
+    return {
+        "histogram_observe_ns": round(timeit.timeit(lambda: histogram.observe(("/jd/company/{company_id}", "GET"), 0.0042), number=number) / number * 1e9),
+        "counter_inc_ns": round(timeit.timeit(lambda: counter.inc(("/jd/company/{company_id}", "GET", "200")), number=number) / number * 1e9),
+        "graphql_operation_ns": round(timeit.timeit(lambda: metrics.graphql_operation("query GetX { job_descriptions { id } }"), number=number) / number * 1e9),
+    }
+
+async def run(requests, rounds=3):
+    # The first run also pays for the background warmup, so it is discarded
+    await bench_request_pipeline.run(requests)
+    best = {}
+    for _ in range(rounds):
+        # Modes are interleaved and the fastest round kept, to cancel out machine noise
+        for mode, (enabled, server_timing) in MODES.items():
+            metrics.settings.metrics_enabled = enabled
+            metrics.settings.server_timing_enabled = server_timing
+            result = await bench_request_pipeline.run(requests)
+            for route, measured in result.items():
+                if isinstance(measured, dict):
+                    cpu = measured["cpu_us_per_request"]
+                    best.setdefault(mode, {})[route] = min(cpu, best.get(mode, {}).get(route, cpu))
+    overhead = {
+        route: round(best["metrics+server_timing"][route] - baseline, 1)
+        for route, baseline in best["off"].items()
+    }
+    return {"requests": requests, "rounds": rounds, "cpu_us_per_request": best, "cpu_overhead_us_per_request": overhead, "micro": micro()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.requests, args.rounds)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_request_pipeline.py
+"""
+Per-request CPU cost of the company and job description routes, with Hasura
+replaced by an in-process mock so only application work is measured.
+
+    python -m benchmarks.bench_request_pipeline --requests 2000 [--gzip]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from services import hasura_service
+
+FULL_JD = {
+    "company_id": 1,
+    "title": "Senior Backend Engineer",
+    **{name: f"{name.replace('_', ' ')} " * 12 for name in hasura_service.JOB_FIELDS if name not in ("id", "company_id", "title")},
+}
+FULL_COMPANY = {"user_id": "bench-user", "name": "Bench Corp", "overview": "overview " * 40, "year_founded": 2001}
+# Job descriptions the mock holds, so keyset paging (the index bootstrap) comes to an end
+MOCK_JOBS = 1000
+
+def hasura_handler(request):
+    body = json.loads(request.content)
+    root = body["query"].split("{", 2)[1].split("(")[0].strip()
+    if root == "insert_job_descriptions":
+        data = {"returning": [{"id": 1, "company_id": 1, "title": "t"}]}
+    elif root == "job_descriptions":
+        after, limit = body["variables"]["after"], body["variables"]["limit"]
+        data = [dict(FULL_JD, id=i) for i in range(after + 1, min(after + limit, MOCK_JOBS) + 1)]
+    elif root == "company_profiles":
+        data = []
+    elif root == "insert_company_profiles_one":
+        data = {"id": 1, "user_id": "bench-user", "name": "Bench Corp"}
+    else:
+        data = {"returning": [{"id": 1, "user_id": "bench-user", "name": "Bench Corp"}]}
+    return httpx.Response(200, json={"data": {root: data}})
+
+async def measure(app, method, path, payload, requests, encoding):
+    transport = httpx.ASGITransport(app=app)
+    headers = {"accept-encoding": encoding}
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+        for _ in range(20):
+            await client.request(method, path, json=payload, headers=headers)
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        for _ in range(requests):
+            response = await client.request(method, path, json=payload, headers=headers)
+            assert response.status_code == 200, response.text
+        return {
+            "cpu_us_per_request": round((time.process_time() - cpu) / requests * 1e6, 1),
+            "wall_us_per_request": round((time.perf_counter() - wall) / requests * 1e6, 1),
+            "response_bytes": int(response.headers.get("content-length", len(response.content))),
+        }
+
+async def run(requests, encoding="identity"):
+    from api.index import app
+    hasura_service.settings.hasura_graphql_endpoint = hasura_service.settings.hasura_graphql_endpoint or "http://hasura.bench/v1/graphql"
+    hasura_service._client = httpx.AsyncClient(transport=httpx.MockTransport(hasura_handler))
+    hasura_service.company_cache = hasura_service.cache.NullCache()
+    return {
+        "requests": requests,
+        "accept_encoding": encoding,
+        "POST /company/create": await measure(app, "POST", "/company/create", FULL_COMPANY, requests, encoding),
+        "POST /jd/submit": await measure(app, "POST", "/jd/submit", FULL_JD, requests, encoding),
+        "GET /jd/company/1?limit=50": await measure(app, "GET", "/jd/company/1?limit=50", None, requests, encoding),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--gzip", action="store_true", help="request gzip-compressed responses")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.requests, "gzip" if args.gzip else "identity")), indent=2))
+
+if __name__ == "__main__":
+    main()
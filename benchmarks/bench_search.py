@@ -0,0 +1,83 @@
+# benchmarks/bench_search.py
+"""
+Build time, snapshot size and query latency of the job description search
+index over synthetic job descriptions.
+
+    python -m benchmarks.bench_search --jds 100000 --queries 500
+"""
+import argparse
+import json
+import pickle
+import random
+import time
+
+from services.search_index import SEARCH_FIELDS, SearchIndex
+
+VOCABULARY = (
+    "python java golang rust typescript react kubernetes docker terraform aws gcp azure sql postgres "
+    "kafka spark airflow pandas pytorch tensorflow graphql rest grpc linux security compliance agile "
+    "scrum kanban leadership mentoring communication stakeholder roadmap analytics finance healthcare "
+    "retail logistics marketing sales design research testing automation monitoring reliability"
+).split()
+TITLES = ("Backend Engineer", "Data Scientist", "Product Manager", "DevOps Engineer", "Frontend Developer",
+          "Security Analyst", "Engineering Manager", "QA Engineer")
+
+def synthetic_jd(rng, jd_id):
+    row = {"id": jd_id, "company_id": rng.randint(1, 1000), "title": f"{rng.choice(('Senior', 'Staff', 'Junior', 'Lead'))} {rng.choice(TITLES)}"}
+    for field in SEARCH_FIELDS:
+        if field != "title":
+            row[field] = " ".join(rng.choices(VOCABULARY, k=rng.randint(5, 40)))
+    return row
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+def run(jds, queries, seed=0):
+    rng = random.Random(seed)
+    rows = [synthetic_jd(rng, i) for i in range(1, jds + 1)]
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.add_many(rows, in_order=True)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    blob = pickle.dumps(index.snapshot(), protocol=pickle.HIGHEST_PROTOCOL)
+    save = time.perf_counter() - start
+    start = time.perf_counter()
+    SearchIndex().restore(pickle.loads(blob))
+    restore = time.perf_counter() - start
+
+    index.search("warmup")
+    texts = [" ".join(rng.sample(VOCABULARY, rng.randint(1, 3))) for _ in range(queries)]
+    results = {}
+    # "all" includes each term's first query, which computes and caches its weights;
+    # "all_cached" repeats the same queries once every term is cached
+    for label, company in (("all", None), ("all_cached", None), ("company_filter", 1)):
+        samples = []
+        for query in texts:
+            start = time.perf_counter()
+            index.search(query, company_id=company, limit=20)
+            samples.append((time.perf_counter() - start) * 1000)
+        results[label] = {f"p{p}_ms": round(percentile(samples, p), 3) for p in (50, 95, 99)}
+
+    return {
+        "jds": jds,
+        "terms": len(index.doc_freq),
+        "build_s": round(build, 2),
+        "build_us_per_jd": round(build / jds * 1e6, 1),
+        "snapshot_mb": round(len(blob) / 2**20, 1),
+        "snapshot_save_s": round(save, 2),
+        "snapshot_restore_s": round(restore, 2),
+        "query": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jds", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(run(args.jds, args.queries), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_similarity.py
+"""
+Similar-jobs index: build time, snapshot save and memory-mapped load, and
+top-k latency for single and batched queries over synthetic JDs.
+
+    python -m benchmarks.bench_similarity --jds 50000 --queries 200
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+
+from benchmarks.bench_search import percentile, synthetic_jd
+from services import similarity_index
+
+def run(jds, queries, k=10, seed=0):
+    rng = random.Random(seed)
+    rows = [synthetic_jd(rng, i) for i in range(1, jds + 1)]
+    index = similarity_index.SimilarityIndex()
+    start = time.perf_counter()
+    index.add_many(rows, in_order=True)
+    build = time.perf_counter() - start
+    nnz = index._tail_matrix().nnz
+
+    probe_ids = [rng.randint(1, jds) for _ in range(queries)]
+    index.similar(probe_ids[0], k)
+    in_memory = []
+    for jd_id in probe_ids:
+        start = time.perf_counter()
+        index.similar(jd_id, k)
+        in_memory.append((time.perf_counter() - start) * 1000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        similarity_index.settings.jd_index_dir = directory
+        start = time.perf_counter()
+        index.save()
+        save = time.perf_counter() - start
+        mapped = similarity_index.SimilarityIndex()
+        start = time.perf_counter()
+        mapped.load()
+        load = time.perf_counter() - start
+
+        from_mmap = []
+        for jd_id in probe_ids:
+            start = time.perf_counter()
+            mapped.similar(jd_id, k)
+            from_mmap.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        mapped.similar_many(probe_ids, k)
+        batched = (time.perf_counter() - start) * 1000 / len(probe_ids)
+
+    return {
+        "jds": jds,
+        "terms": len(index.vocabulary),
+        "nnz": nnz,
+        "build_us_per_jd": round(build / jds * 1e6, 1),
+        "save_s": round(save, 3),
+        "mmap_load_s": round(load, 3),
+        "single_in_memory": {f"p{p}_ms": round(percentile(in_memory, p), 3) for p in (50, 95, 99)},
+        "single_mmap": {f"p{p}_ms": round(percentile(from_mmap, p), 3) for p in (50, 95, 99)},
+        "batched_ms_per_query": round(batched, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jds", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(run(args.jds, args.queries, args.k), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# benchmarks/bench_storage.py
+"""
+The same reads and writes through each storage backend: Hasura (the local
+stand-in from benchmarks/standins.py, with no injected latency, or a real
+instance via --hasura-url), SQLite and optionally Postgres. Each backend is
+seeded with the same synthetic companies and jobs.
+
+    python -m benchmarks.bench_storage --ops 500 [--postgres-dsn postgresql://localhost/athena_bench]
+
+--postgres-dsn should point at a scratch database: the tables are created if
+missing and seeded with benchmark rows.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_cold_start import free_port
+from benchmarks.bench_search import percentile
+from benchmarks.load_test import launch, wait_ready
+from benchmarks.standins import synthetic_job
+from services import hasura_service, sql_storage
+
+async def seed(backend, companies, jobs_per_company, seed_value):
+    rng = random.Random(seed_value)
+    for number in range(1, companies + 1):
+        company = await backend.insert_company({"user_id": f"user-{number}", "name": f"Company {number}"})
+        if company is None:
+            # Already seeded by an earlier run
+            return
+        rows = []
+        for _ in range(jobs_per_company):
+            row = synthetic_job(rng, 0, company["id"])
+            del row["id"]
+            rows.append(row)
+        await backend.insert_jobs(rows)
+
+async def measure(ops, call):
+    await call(0)
+    samples = []
+    for number in range(ops):
+        start = time.perf_counter()
+        await call(number)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {f"p{p}_ms": round(percentile(samples, p), 3) for p in (50, 95, 99)}
+
+async def throughput(ops, concurrency, call):
+    remaining = iter(range(ops))
+
+    async def worker():
+        for number in remaining:
+            await call(number)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return round(ops / (time.perf_counter() - start), 1)
+
+async def bench_backend(backend, ops, concurrency, companies):
+    rng = random.Random(1)
+    fields = hasura_service.JOB_FIELDS
+    user_ids = [f"user-{rng.randint(1, companies)}" for _ in range(ops + 1)]
+    company = await backend.get_company_by_user_id("user-1")
+    ids = [row["id"] for row in await backend.company_jobs(company["id"], 0, 20, ("id",))]
+    job = synthetic_job(rng, 0, company["id"])
+    del job["id"]
+
+    async def company_jobs(number):
+        owner = await backend.get_company_by_user_id(user_ids[number])
+        await backend.company_jobs(owner["id"], 0, 20, fields)
+
+    results = {
+        "get_company_by_user_id": await measure(ops, lambda number: backend.get_company_by_user_id(user_ids[number])),
+        "company_jobs_20": await measure(ops, lambda number: backend.company_jobs(company["id"], 0, 20, fields)),
+        "dashboard_20": await measure(ops, lambda number: backend.dashboard(user_ids[number], 0, 20, fields)),
+        "jobs_by_ids_20": await measure(ops, lambda number: backend.jobs_by_ids(ids, fields)),
+        "insert_job": await measure(ops, lambda number: backend.insert_job(job)),
+        "insert_jobs_100": await measure(max(ops // 10, 1), lambda number: backend.insert_jobs([job] * 100)),
+    }
+    results["profile_lookup_then_jobs_rps"] = await throughput(ops, concurrency, company_jobs)
+    return results
+
+async def run(args):
+    results = {"ops": args.ops, "concurrency": args.concurrency}
+    processes = []
+    directory = tempfile.mkdtemp(prefix="bench_storage_")
+    try:
+        hasura_url = args.hasura_url
+        if hasura_url is None:
+            port = free_port()
+            processes.append(launch([
+                "benchmarks.standins", "--port", str(port), "--companies", str(args.companies),
+                "--jobs-per-company", str(args.jobs_per_company), "--seed", str(args.seed),
+            ]))
+            await wait_ready(f"http://127.0.0.1:{port}/health")
+            hasura_url = f"http://127.0.0.1:{port}/v1/graphql"
+        hasura_service.settings.hasura_graphql_endpoint = hasura_url
+        # Each call should reach the backend, not the read coalescer or the company cache
+        hasura_service.settings.hasura_coalesce_reads = False
+
+        backends = [("hasura", hasura_service.HasuraBackend()), ("sqlite", sql_storage.SQLiteBackend(os.path.join(directory, "bench.db")))]
+        if args.postgres_dsn:
+            backends.append(("postgres", sql_storage.PostgresBackend(args.postgres_dsn)))
+        for name, backend in backends:
+            await backend.open()
+            try:
+                if name == "postgres":
+                    async with backend._pool.acquire() as connection:
+                        await connection.execute(sql_storage.schema_sql("postgres"))
+                if name != "hasura":
+                    await seed(backend, args.companies, args.jobs_per_company, args.seed)
+                results[name] = await bench_backend(backend, args.ops, args.concurrency, args.companies)
+            finally:
+                await backend.close()
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--companies", type=int, default=100)
+    parser.add_argument("--jobs-per-company", type=int, default=50)
+    parser.add_argument("--hasura-url", help="a real Hasura GraphQL endpoint instead of the local stand-in")
+    parser.add_argument("--postgres-dsn", help="scratch Postgres database to include in the comparison")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
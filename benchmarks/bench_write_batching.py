@@ -0,0 +1,109 @@
+# benchmarks/bench_write_batching.py
+"""
+Concurrent single job description inserts (the /jd/submit path) against the
+local Hasura stand-in, with JD_SUBMIT_BATCHING off and on. For each
+concurrency level it reports inserts per second, upstream mutations per
+second, the average batch size and p50/p99 insert latency.
+
+    python -m benchmarks.bench_write_batching --concurrency 1,8,32,128 --duration 3 --latency-ms 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from benchmarks.bench_cold_start import free_port
+from benchmarks.bench_search import percentile
+from benchmarks.load_test import launch, wait_ready
+from benchmarks.standins import synthetic_job
+from services import hasura_service
+from services.microbatch import MicroBatcher
+from services.schemas import JDInput
+
+async def upstream_requests(health_url):
+    async with httpx.AsyncClient() as client:
+        return (await client.get(health_url)).json()["requests"]
+
+async def run_level(concurrency, duration, companies, health_url):
+    rng = random.Random(concurrency)
+    jobs = []
+    for number in range(1000):
+        row = synthetic_job(rng, number, rng.randint(1, companies))
+        del row["id"]
+        jobs.append(JDInput(**row))
+    samples = []
+
+    async def worker(number):
+        position = number
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await hasura_service.insert_job_description(jobs[position % len(jobs)])
+            samples.append((time.perf_counter() - start) * 1000)
+            position += concurrency
+
+    before = await upstream_requests(health_url)
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    mutations = await upstream_requests(health_url) - before
+    return {
+        "inserts_per_second": round(len(samples) / elapsed, 1),
+        "mutations_per_second": round(mutations / elapsed, 1),
+        "average_batch": round(len(samples) / mutations, 2) if mutations else 0.0,
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+    }
+
+async def run(args):
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = {
+        "latency_ms": args.latency_ms,
+        "window_ms": args.window_ms,
+        "max_batch": args.max_batch,
+        "duration": args.duration,
+        "unbatched": {},
+        "batched": {},
+    }
+    port = free_port()
+    process = launch([
+        "benchmarks.standins", "--port", str(port), "--companies", str(args.companies),
+        "--jobs-per-company", "0", "--latency-ms", str(args.latency_ms),
+    ])
+    try:
+        await wait_ready(f"http://127.0.0.1:{port}/health")
+        hasura_service.settings.hasura_graphql_endpoint = f"http://127.0.0.1:{port}/v1/graphql"
+        # Notifying the in-process indexes is not what is being measured
+        async def skip_indexes(rows):
+            pass
+        hasura_service.jd_indexes.notify_inserted = skip_indexes
+        hasura_service.submit_batcher = MicroBatcher(
+            hasura_service._insert_job_batch, args.window_ms / 1000, args.max_batch, args.queue_depth, 30,
+        )
+        for mode in ("unbatched", "batched"):
+            hasura_service.settings.jd_submit_batching = mode == "batched"
+            for concurrency in levels:
+                results[mode][concurrency] = await run_level(concurrency, args.duration, args.companies, f"http://127.0.0.1:{port}/health")
+        await hasura_service.close_client()
+    finally:
+        process.terminate()
+        process.wait()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,8,32,128", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=3, help="seconds per level")
+    parser.add_argument("--latency-ms", type=float, default=10, help="injected Hasura latency")
+    parser.add_argument("--window-ms", type=float, default=5)
+    parser.add_argument("--max-batch", type=int, default=50)
+    parser.add_argument("--queue-depth", type=int, default=1000)
+    parser.add_argument("--companies", type=int, default=100)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
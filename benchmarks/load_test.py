@@ -0,0 +1,239 @@
+# benchmarks/load_test.py
+"""
+Load test of the app against the local Hasura and Firebase stand-ins in
+benchmarks/standins.py. Both run as uvicorn processes on free ports, then
+each scripted workload runs with `--concurrency` virtual users for
+`--duration` seconds and reports throughput and p50/p95/p99 latency per
+endpoint as JSON, so runs can be compared between commits.
+
+    python -m benchmarks.load_test --workloads profile,jd_listing,jd_submit_storm \\
+        --concurrency 32 --duration 20 --latency-ms 20 --jitter-ms 10 --output before.json
+
+Workloads:
+- profile: the profile page, i.e. /auth/verify, the user's company and their dashboard
+- jd_listing: a company's job list, following next_cursor for up to three pages
+- jd_submit_storm: concurrent POST /jd/submit of distinct job descriptions
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.bench_cold_start import free_port
+from benchmarks.bench_search import percentile
+from benchmarks.standins import synthetic_job
+
+class Recorder:
+    """Latency samples and error counts per endpoint label."""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.recording = False
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            response, failed = None, True
+        if self.recording:
+            self.samples.setdefault(label, []).append((time.perf_counter() - start) * 1000)
+            if failed:
+                self.errors[label] = self.errors.get(label, 0) + 1
+        return None if failed else response
+
+    def report(self, duration: float) -> dict:
+        endpoints = {}
+        for label, samples in sorted(self.samples.items()):
+            endpoints[label] = {
+                "requests": len(samples),
+                "errors": self.errors.get(label, 0),
+                "throughput_rps": round(len(samples) / duration, 1),
+                **{f"p{p}_ms": round(percentile(samples, p), 2) for p in (50, 95, 99)},
+                "max_ms": round(max(samples), 2),
+            }
+        total = sum(len(samples) for samples in self.samples.values())
+        return {
+            "duration_s": round(duration, 2),
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "throughput_rps": round(total / duration, 1),
+            "endpoints": endpoints,
+        }
+
+async def profile(client, recorder, rng, context):
+    user_id = rng.choice(context["users"])
+    await recorder.request(client, "POST /auth/verify", "POST", "/auth/verify", json={"id_token": context["tokens"][user_id]})
+    await recorder.request(client, "GET /company/user/{user_id}", "GET", f"/company/user/{user_id}")
+    await recorder.request(client, "GET /dashboard/{user_id}", "GET", f"/dashboard/{user_id}", params={"limit": 20})
+
+async def jd_listing(client, recorder, rng, context):
+    company_id = rng.randint(1, context["companies"])
+    after = 0
+    for _ in range(3):
+        response = await recorder.request(client, "GET /jd/company/{company_id}", "GET", f"/jd/company/{company_id}", params={"limit": 20, "after": after})
+        after = response.json().get("next_cursor") if response is not None else None
+        if after is None:
+            return
+
+async def jd_submit_storm(client, recorder, rng, context):
+    context["submitted"] += 1
+    job = synthetic_job(rng, 0, rng.randint(1, context["companies"]))
+    del job["id"]
+    job["title"] = f"{job['title']} #{context['submitted']}"
+    await recorder.request(client, "POST /jd/submit", "POST", "/jd/submit", json=job)
+
+WORKLOADS = {"profile": profile, "jd_listing": jd_listing, "jd_submit_storm": jd_submit_storm}
+
+async def run_workload(base_url, script, context, concurrency, duration, warmup, seed):
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + warmup
+
+        async def user(number):
+            rng = random.Random(seed * 1000 + number)
+            while time.perf_counter() < deadline:
+                await script(client, recorder, rng, context)
+
+        await asyncio.gather(*(user(number) for number in range(concurrency)))
+        recorder.recording = True
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(user(number) for number in range(concurrency)))
+        return recorder.report(time.perf_counter() - start)
+
+def launch(args, env=None) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-m", *args], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+async def wait_ready(url: str, timeout: float = 60):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(timeout=2) as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.05)
+    raise RuntimeError(f"{url} did not become ready within {timeout}s")
+
+async def wait_indexes(base_url: str, timeout: float = 300):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=5) as client:
+        while time.perf_counter() < deadline:
+            indexes = (await client.get("/api/stats/indexes")).json()["data"]
+            if all(index["ready"] for index in indexes.values()):
+                return
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Indexes were not ready within {timeout}s")
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+async def run(args) -> dict:
+    processes = []
+    try:
+        standins_url = args.standins_url
+        if standins_url is None:
+            port = free_port()
+            standins_url = f"http://127.0.0.1:{port}"
+            processes.append(launch([
+                "benchmarks.standins", "--port", str(port), "--latency-ms", str(args.latency_ms),
+                "--jitter-ms", str(args.jitter_ms), "--error-rate", str(args.error_rate),
+                "--slow-rate", str(args.slow_rate), "--slow-ms", str(args.slow_ms),
+                "--companies", str(args.companies), "--jobs-per-company", str(args.jobs_per_company),
+                "--project-id", args.project_id, "--seed", str(args.seed),
+            ]))
+            await wait_ready(f"{standins_url}/health")
+
+        app_url = args.app_url
+        if app_url is None:
+            port = free_port()
+            app_url = f"http://127.0.0.1:{port}"
+            env = dict(
+                os.environ,
+                HASURA_GRAPHQL_ENDPOINT=f"{standins_url}/v1/graphql",
+                FIREBASE_CERTS_URL=f"{standins_url}/certs",
+                FIREBASE_PROJECT_ID=args.project_id,
+            )
+            if not args.indexes:
+                env.update(JD_SEARCH_ENABLED="false", JD_SIMILARITY_ENABLED="false", JD_FACETS_ENABLED="false",
+                           JD_SKILLS_ENABLED="false", JD_DEDUP_MODE="off")
+            processes.append(launch(["uvicorn", "api.index:app", "--port", str(port), "--workers", str(args.workers), "--log-level", "warning"], env))
+            await wait_ready(f"{app_url}/api/health")
+        if args.indexes:
+            await wait_indexes(app_url)
+
+        users = [f"user-{number}" for number in range(1, min(args.companies, 200) + 1)]
+        async with httpx.AsyncClient(base_url=standins_url) as client:
+            tokens = {user_id: (await client.post("/token", json={"uid": user_id})).json()["id_token"] for user_id in users}
+        context = {"companies": args.companies, "users": users, "tokens": tokens, "submitted": 0}
+
+        results = {}
+        for name in args.workloads.split(","):
+            results[name] = await run_workload(app_url, WORKLOADS[name], context, args.concurrency, args.duration, args.warmup, args.seed)
+        return {
+            "commit": git_commit(),
+            "config": {
+                "concurrency": args.concurrency,
+                "duration_s": args.duration,
+                "workers": args.workers,
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "error_rate": args.error_rate,
+                "slow_rate": args.slow_rate,
+                "slow_ms": args.slow_ms,
+                "indexes": args.indexes,
+            },
+            "workloads": results,
+        }
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help="comma-separated, run in order")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users per workload")
+    parser.add_argument("--duration", type=float, default=10, help="measured seconds per workload")
+    parser.add_argument("--warmup", type=float, default=2, help="unmeasured seconds before each workload")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes for the app")
+    parser.add_argument("--latency-ms", type=float, default=10, help="injected Hasura latency")
+    parser.add_argument("--jitter-ms", type=float, default=5)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--slow-rate", type=float, default=0, help="fraction of Hasura requests delayed by --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=1000)
+    parser.add_argument("--companies", type=int, default=100)
+    parser.add_argument("--jobs-per-company", type=int, default=50)
+    parser.add_argument("--project-id", default="bench-project")
+    parser.add_argument("--indexes", action="store_true", help="keep the in-process JD indexes enabled and wait for them to load")
+    parser.add_argument("--app-url", help="use an already running app instead of launching one")
+    parser.add_argument("--standins-url", help="use already running stand-ins instead of launching them")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+    unknown = set(args.workloads.split(",")) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"Unknown workloads: {', '.join(sorted(unknown))}")
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    print(report)
+
+if __name__ == "__main__":
+    main()
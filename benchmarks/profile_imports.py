@@ -0,0 +1,48 @@
+# benchmarks/profile_imports.py
+"""
+Startup profile: import time per module for an entry point, using the
+interpreter's -X importtime report.
+
+    python -m benchmarks.profile_imports                 # api.index
+    python -m benchmarks.profile_imports main --top 40
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+def profile(module: str):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({"module": name.strip(), "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", nargs="?", default="api.index")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    rows = profile(args.module)
+    packages = {}
+    for row in rows:
+        package = row["module"].split(".")[0]
+        packages[package] = round(packages.get(package, 0) + row["self_ms"], 3)
+    print(json.dumps({
+        "entry_point": args.module,
+        "total_ms": round(sum(row["self_ms"] for row in rows), 3),
+        "by_package_ms": dict(sorted(packages.items(), key=lambda item: -item[1])[:args.top]),
+        "slowest_modules": sorted(rows, key=lambda row: -row["cumulative_ms"])[:args.top],
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# benchmarks/standins.py
+"""
+Local stand-ins for Hasura and Firebase, so the app can be load tested
+without either service:
+
+- POST /v1/graphql answers the company_profiles / job_descriptions /
+  job_enrichments operations in services/graphql_queries.py from an
+  in-memory store, after an injected latency (plus optional failures and
+  slow outliers).
+- GET /certs serves signing certificates in the format of Google's
+  securetoken endpoint; point FIREBASE_CERTS_URL at it.
+- POST /token {"uid": ...} mints an ID token that /auth/verify accepts for
+  FIREBASE_PROJECT_ID=<--project-id>.
+
+    python -m benchmarks.standins --port 8081 --latency-ms 20 --jitter-ms 10
+"""
+import argparse
+import asyncio
+import datetime
+import random
+import re
+import time
+from typing import Dict, List, Optional
+
+import orjson
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from services.schemas import JobDescriptionModel
+
+JOB_FIELDS = tuple(JobDescriptionModel.model_fields)
+WORDS = (
+    "python java golang typescript react kubernetes docker terraform aws gcp sql postgres kafka spark "
+    "graphql grpc linux security agile scrum leadership mentoring communication analytics design testing"
+).split()
+LEVELS = ("Senior", "Staff", "Junior", "Mid-level", "Lead")
+WORK_MODELS = ("Remote", "Hybrid", "Onsite")
+# Innermost selection set, e.g. "{ id title company_id }"
+SELECTION = re.compile(r"\{([\w\s]+)\}[\s}]*$")
+
+def synthetic_job(rng: random.Random, jd_id: int, company_id: int) -> dict:
+    row = {"id": jd_id, "company_id": company_id, "title": f"{rng.choice(LEVELS)} Engineer {jd_id}"}
+    for field in JOB_FIELDS:
+        if field not in row:
+            row[field] = " ".join(rng.choices(WORDS, k=rng.randint(3, 20)))
+    row["job_level"] = rng.choice(LEVELS)
+    row["work_model"] = rng.choice(WORK_MODELS)
+    return row
+
+class Store:
+    """Companies and job descriptions, shaped like the Hasura tables the app queries."""
+
+    def __init__(self, companies: int, jobs_per_company: int, seed: int = 0):
+        rng = random.Random(seed)
+        self.companies: Dict[int, dict] = {}
+        self.company_by_user: Dict[str, dict] = {}
+        self.jobs: Dict[int, dict] = {}
+        self.jobs_by_company: Dict[int, List[int]] = {}
+        self.enrichments: Dict[int, dict] = {}
+        self.next_company_id = 1
+        self.next_job_id = 1
+        for _ in range(companies):
+            company = self.insert_company({"user_id": f"user-{self.next_company_id}", "name": f"Company {self.next_company_id}"})
+            for _ in range(jobs_per_company):
+                self.insert_job(synthetic_job(rng, self.next_job_id, company["id"]))
+
+    def insert_company(self, values: dict) -> Optional[dict]:
+        if values.get("user_id") in self.company_by_user:
+            return None  # unique_user_id conflict with update_columns: []
+        company = {**values, "id": self.next_company_id, "updated_at": _now()}
+        self.next_company_id += 1
+        self.companies[company["id"]] = company
+        self.company_by_user[company["user_id"]] = company
+        return company
+
+    def update_company(self, company_id: int, values: dict, updated_at: Optional[str] = None) -> Optional[dict]:
+        company = self.companies.get(company_id)
+        if company is None or (updated_at is not None and company["updated_at"] != updated_at):
+            return None
+        del self.company_by_user[company["user_id"]]
+        company.update(values)
+        if "updated_at" in values:
+            company["updated_at"] = _now()
+        self.company_by_user[company["user_id"]] = company
+        return company
+
+    def insert_job(self, values: dict) -> dict:
+        row = {field: None for field in JOB_FIELDS}
+        row.update(values, id=self.next_job_id, updated_at=_now())
+        self.next_job_id += 1
+        self.jobs[row["id"]] = row
+        # Ids only grow, so each company's list stays sorted
+        self.jobs_by_company.setdefault(row["company_id"], []).append(row["id"])
+        return row
+
+    def page(self, ids: List[int], after: int, limit: int) -> List[dict]:
+        from bisect import bisect_right
+        start = bisect_right(ids, after)
+        return [self.jobs[jd_id] for jd_id in ids[start:start + limit]]
+
+def _now() -> str:
+    # Hasura's rendering of a timestamptz column
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+def _company(company: Optional[dict]) -> Optional[dict]:
+    if company is None:
+        return None
+    return {"id": company["id"], "user_id": company["user_id"], "name": company["name"], "updated_at": company["updated_at"]}
+
+def _project(rows: List[dict], fields: List[str]) -> List[dict]:
+    return [{field: row.get(field) for field in fields} for row in rows]
+
+def resolve(store: Store, operation: str, query: str, variables: dict) -> dict:
+    """The `data` object for one registered operation."""
+    match = SELECTION.search(query)
+    fields = match.group(1).split() if match else ["id"]
+    if operation == "InsertCompanyProfile":
+        return {"insert_company_profiles_one": _company(store.insert_company(variables["object"]))}
+    if operation == "UpdateCompanyProfile":
+        return {"update_company_profiles_by_pk": _company(store.update_company(variables["id"], variables["set_fields"]))}
+    if operation == "UpdateCompanyProfileIfUnmodified":
+        company = store.update_company(variables["id"], variables["set_fields"], variables["updated_at"])
+        return {"update_company_profiles": {"returning": [_company(company)] if company else []}}
+    if operation == "GetCompanyByUserId":
+        company = store.company_by_user.get(variables["user_id"])
+        return {"company_profiles": [_company(company)] if company else []}
+    if operation == "InsertJobDescription":
+        row = store.insert_job(variables["object"])
+        return {"insert_job_descriptions": {"returning": [{"id": row["id"], "company_id": row["company_id"], "title": row["title"]}]}}
+    if operation == "InsertJobDescriptions":
+        rows = [store.insert_job(values) for values in variables["objects"]]
+        return {"insert_job_descriptions": {"affected_rows": len(rows), "returning": [{"id": row["id"]} for row in rows]}}
+    if operation == "UpsertJobEnrichments":
+        for values in variables["objects"]:
+            store.enrichments[values["job_id"]] = {**values, "enriched_at": _now()}
+        return {"insert_job_enrichments": {"affected_rows": len(variables["objects"])}}
+    if operation == "GetJobEnrichments":
+        rows = [store.enrichments[jd_id] for jd_id in variables["ids"] if jd_id in store.enrichments]
+        return {"job_enrichments": _project(rows, fields)}
+    if operation.startswith("GetCompanyJobsPage_"):
+        ids = store.jobs_by_company.get(variables["company_id"], [])
+        return {"job_descriptions": _project(store.page(ids, variables["after"], variables["limit"]), fields)}
+    if operation.startswith("GetAllJobsPage_"):
+        return {"job_descriptions": _project(store.page(list(store.jobs), variables["after"], variables["limit"]), fields)}
+    if operation.startswith(("ExportJobsPage_", "ExportCompaniesPage_")):
+        table, rows = ("job_descriptions", store.jobs) if operation.startswith("ExportJobs") else ("company_profiles", store.companies)
+        since = variables.get("since")
+        ids = [row_id for row_id, row in rows.items() if since is None or row["updated_at"] >= since]
+        from bisect import bisect_right
+        start = bisect_right(ids, variables["after"])
+        return {table: _project([rows[row_id] for row_id in ids[start:start + variables["limit"]]], fields)}
+    if operation.startswith("GetJobsByIds_"):
+        return {"job_descriptions": _project([store.jobs[jd_id] for jd_id in variables["ids"] if jd_id in store.jobs], fields)}
+    if operation.startswith("GetDashboard_"):
+        company = store.company_by_user.get(variables["user_id"])
+        if company is None:
+            return {"company_profiles": []}
+        jobs = store.page(store.jobs_by_company.get(company["id"], []), variables["after"], variables["limit"])
+        return {"company_profiles": [{**_company(company), "job_descriptions": _project(jobs, fields)}]}
+    raise KeyError(operation)
+
+class TokenIssuer:
+    """A throwaway RSA key pair standing in for Firebase Auth's signing keys."""
+
+    def __init__(self, project_id: str, kid: str = "bench-key"):
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from cryptography.x509.oid import NameOID
+        self.project_id = project_id
+        self.kid = kid
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken.local")])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(self.private_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=30))
+            .sign(self.private_key, hashes.SHA256())
+        )
+        self.certs = {kid: certificate.public_bytes(serialization.Encoding.PEM).decode("ascii")}
+
+    def issue(self, uid: str, lifetime: int = 3600, **claims) -> str:
+        import jwt
+        now = int(time.time())
+        payload = {
+            "iss": f"https://securetoken.google.com/{self.project_id}",
+            "aud": self.project_id,
+            "sub": uid,
+            "user_id": uid,
+            "auth_time": now,
+            "iat": now,
+            "exp": now + lifetime,
+            **claims,
+        }
+        return jwt.encode(payload, self.private_key, algorithm="RS256", headers={"kid": self.kid})
+
+def create_app(store: Store, issuer: TokenIssuer, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+               slow_rate: float = 0, slow_ms: float = 0, seed: int = 0) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(seed)
+    counters = {"requests": 0, "errors": 0}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", **counters, "companies": len(store.companies), "jobs": len(store.jobs)}
+
+    @app.post("/v1/graphql")
+    async def graphql(request: Request):
+        body = orjson.loads(await request.body())
+        counters["requests"] += 1
+        delay = latency_ms + rng.uniform(0, jitter_ms)
+        if slow_rate and rng.random() < slow_rate:
+            delay += slow_ms
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if error_rate and rng.random() < error_rate:
+            counters["errors"] += 1
+            return Response(status_code=503, content=b"injected failure")
+
+        try:
+            data = resolve(store, body.get("operationName") or "", body.get("query") or "", body.get("variables") or {})
+        except KeyError as e:
+            return JSONResponse({"errors": [{"message": f"Unsupported operation or missing variable: {e}"}]})
+        return Response(orjson.dumps({"data": data}), media_type="application/json")
+
+    @app.get("/certs")
+    async def certs():
+        return JSONResponse(issuer.certs, headers={"cache-control": "public, max-age=3600"})
+
+    @app.post("/token")
+    async def token(request: Request):
+        body = orjson.loads(await request.body() or b"{}")
+        return {"id_token": issuer.issue(body.get("uid", "user-1"), int(body.get("lifetime", 3600)))}
+
+    return app
+
+def main():
+    import uvicorn
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0, help="fixed delay added to every GraphQL request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="extra uniformly distributed delay")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of GraphQL requests answered with a 503")
+    parser.add_argument("--slow-rate", type=float, default=0, help="fraction of GraphQL requests delayed by an extra --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=1000)
+    parser.add_argument("--companies", type=int, default=100)
+    parser.add_argument("--jobs-per-company", type=int, default=50)
+    parser.add_argument("--project-id", default="bench-project")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    app = create_app(
+        Store(args.companies, args.jobs_per_company, args.seed),
+        TokenIssuer(args.project_id),
+        args.latency_ms, args.jitter_ms, args.error_rate, args.slow_rate, args.slow_ms, args.seed,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
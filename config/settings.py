@@ -9,6 +9,15 @@ class Settings:
     # Firebase Backend Settings
     firebase_project_id: str = os.environ.get("FIREBASE_PROJECT_ID", "")
     firebase_service_account: str = os.environ.get("FIREBASE_SERVICE_ACCOUNT", "./firebase/service-account.json")
+    firebase_service_account_json: str = os.environ.get("FIREBASE_SERVICE_ACCOUNT_JSON", "")
+    
+    # Firebase ID Token Verification
+    firebase_certs_url: str = os.environ.get(
+        "FIREBASE_CERTS_URL",
+        "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+    )
+    firebase_certs_refresh_margin: float = float(os.environ.get("FIREBASE_CERTS_REFRESH_MARGIN", 300))
+    token_cache_max_entries: int = int(os.environ.get("TOKEN_CACHE_MAX_ENTRIES", 10000))
 
     # Firebase Frontend Settings
     firebase_api_key: str = os.environ.get("FIREBASE_API_KEY", "")
@@ -23,11 +32,122 @@ class Settings:
     hasura_graphql_endpoint: str = os.environ.get("HASURA_GRAPHQL_ENDPOINT", "")
     hasura_admin_secret: str = os.environ.get("HASURA_ADMIN_SECRET", "")
     
+    # Hasura Client Pool Settings
+    hasura_timeout: float = float(os.environ.get("HASURA_TIMEOUT", 10))
+    hasura_connect_timeout: float = float(os.environ.get("HASURA_CONNECT_TIMEOUT", 5))
+    hasura_max_connections: int = int(os.environ.get("HASURA_MAX_CONNECTIONS", 100))
+    hasura_max_keepalive_connections: int = int(os.environ.get("HASURA_MAX_KEEPALIVE_CONNECTIONS", 20))
+    hasura_keepalive_expiry: float = float(os.environ.get("HASURA_KEEPALIVE_EXPIRY", 30))
+    hasura_http2: bool = os.environ.get("HASURA_HTTP2", "true").lower() == "true"
+    # Coalesce concurrent identical read queries into one upstream call
+    hasura_coalesce_reads: bool = os.environ.get("HASURA_COALESCE_READS", "true").lower() == "true"
+    hasura_coalesce_timeout: float = float(os.environ.get("HASURA_COALESCE_TIMEOUT", 15))
+
+    # Hasura Tail Latency Controls (deadlines cover every attempt of one call)
+    hasura_read_deadline: float = float(os.environ.get("HASURA_READ_DEADLINE", 5))
+    hasura_write_deadline: float = float(os.environ.get("HASURA_WRITE_DEADLINE", 10))
+    hasura_retries: int = int(os.environ.get("HASURA_RETRIES", 2))
+    hasura_retry_backoff: float = float(os.environ.get("HASURA_RETRY_BACKOFF", 0.05))
+    hasura_retry_backoff_max: float = float(os.environ.get("HASURA_RETRY_BACKOFF_MAX", 1))
+    # Mutations are always retried when the request never reached Hasura. Enabling this also
+    # resends ones that may have been applied, so a timed-out insert can be written twice
+    hasura_retry_mutations: bool = os.environ.get("HASURA_RETRY_MUTATIONS", "false").lower() == "true"
+    # Send a duplicate read once the first has taken longer than that operation's recent p95
+    hasura_hedge_reads: bool = os.environ.get("HASURA_HEDGE_READS", "false").lower() == "true"
+    hasura_hedge_min_delay: float = float(os.environ.get("HASURA_HEDGE_MIN_DELAY", 0.01))
+    # Fail fast after this many consecutive failures, for HASURA_BREAKER_RESET seconds (0 disables)
+    hasura_breaker_failures: int = int(os.environ.get("HASURA_BREAKER_FAILURES", 5))
+    hasura_breaker_reset: float = float(os.environ.get("HASURA_BREAKER_RESET", 30))
+
+    # Admission Control: concurrent calls per upstream (0 = unlimited). Callers beyond the limit
+    # queue by priority (interactive reads, then writes, then bulk work) and get 503 when the
+    # queue is full or they would wait longer than ADMISSION_QUEUE_TIMEOUT seconds
+    hasura_read_concurrency: int = int(os.environ.get("HASURA_READ_CONCURRENCY", 64))
+    hasura_write_concurrency: int = int(os.environ.get("HASURA_WRITE_CONCURRENCY", 16))
+    firebase_verify_concurrency: int = int(os.environ.get("FIREBASE_VERIFY_CONCURRENCY", 16))
+    admission_max_queue: int = int(os.environ.get("ADMISSION_MAX_QUEUE", 256))
+    admission_queue_timeout: float = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 1))
+
+    # Storage Backend ("hasura", or "sqlite" / "postgres" to query the database directly)
+    storage_backend: str = os.environ.get("STORAGE_BACKEND", "hasura").lower()
+    # A file path (or sqlite:///path) for SQLite, a postgresql:// DSN for Postgres
+    database_url: str = os.environ.get("DATABASE_URL", "")
+    database_pool_min_size: int = int(os.environ.get("DATABASE_POOL_MIN_SIZE", 1))
+    database_pool_max_size: int = int(os.environ.get("DATABASE_POOL_MAX_SIZE", 10))
+    # Prepared statements cached per connection (asyncpg statement_cache_size / sqlite3 cached_statements)
+    database_statement_cache_size: int = int(os.environ.get("DATABASE_STATEMENT_CACHE_SIZE", 256))
+    database_timeout: float = float(os.environ.get("DATABASE_TIMEOUT", 10))
+
+    # Company Profile Cache ("memory" or "none"; others via services.cache.register_backend)
+    company_cache_backend: str = os.environ.get("COMPANY_CACHE_BACKEND", "memory")
+    company_cache_max_entries: int = int(os.environ.get("COMPANY_CACHE_MAX_ENTRIES", 10000))
+    company_cache_ttl: float = float(os.environ.get("COMPANY_CACHE_TTL", 60))
+    company_cache_negative_ttl: float = float(os.environ.get("COMPANY_CACHE_NEGATIVE_TTL", 10))
+    
+    # Job Listing Pagination
+    jd_page_size: int = int(os.environ.get("JD_PAGE_SIZE", 50))
+    jd_max_page_size: int = int(os.environ.get("JD_MAX_PAGE_SIZE", 500))
+    
+    # Bulk Job Description Ingestion
+    jd_bulk_chunk_size: int = int(os.environ.get("JD_BULK_CHUNK_SIZE", 500))
+    jd_bulk_max_error_reports: int = int(os.environ.get("JD_BULK_MAX_ERROR_REPORTS", 1000))
+    jd_bulk_max_record_bytes: int = int(os.environ.get("JD_BULK_MAX_RECORD_BYTES", 1024 * 1024))
+    
+    # Write Coalescing for /jd/submit: concurrent inserts wait up to the window (or until the
+    # batch is full) and go out as one multi-row insert
+    jd_submit_batching: bool = os.environ.get("JD_SUBMIT_BATCHING", "false").lower() == "true"
+    jd_submit_batch_window_ms: float = float(os.environ.get("JD_SUBMIT_BATCH_WINDOW_MS", 5))
+    jd_submit_batch_max_size: int = int(os.environ.get("JD_SUBMIT_BATCH_MAX_SIZE", 50))
+    # Submissions waiting or in flight; beyond this callers wait JD_SUBMIT_QUEUE_TIMEOUT seconds, then get 503
+    jd_submit_queue_depth: int = int(os.environ.get("JD_SUBMIT_QUEUE_DEPTH", 1000))
+    jd_submit_queue_timeout: float = float(os.environ.get("JD_SUBMIT_QUEUE_TIMEOUT", 1))
+    
+    # In-Process Job Description Indexes (snapshots are skipped when JD_INDEX_DIR is empty)
+    jd_index_dir: str = os.environ.get("JD_INDEX_DIR", "")
+    jd_index_page_size: int = int(os.environ.get("JD_INDEX_PAGE_SIZE", 1000))
+    # Seconds between catch-ups that pick up rows inserted by other workers or instances (0 disables)
+    jd_index_refresh_interval: float = float(os.environ.get("JD_INDEX_REFRESH_INTERVAL", 30))
+    jd_search_enabled: bool = os.environ.get("JD_SEARCH_ENABLED", "false" if "VERCEL" in os.environ else "true").lower() == "true"
+    jd_similarity_enabled: bool = os.environ.get("JD_SIMILARITY_ENABLED", "false" if "VERCEL" in os.environ else "true").lower() == "true"
+    jd_facets_enabled: bool = os.environ.get("JD_FACETS_ENABLED", "false" if "VERCEL" in os.environ else "true").lower() == "true"
+    jd_skills_enabled: bool = os.environ.get("JD_SKILLS_ENABLED", "false" if "VERCEL" in os.environ else "true").lower() == "true"
+    skills_backfill_workers: int = int(os.environ.get("SKILLS_BACKFILL_WORKERS", min(os.cpu_count() or 1, 4)))
+    skills_backfill_chunk_size: int = int(os.environ.get("SKILLS_BACKFILL_CHUNK_SIZE", 500))
+    # Near-duplicate detection on submit: "flag", "reject" or "off"
+    jd_dedup_mode: str = os.environ.get("JD_DEDUP_MODE", "off" if "VERCEL" in os.environ else "flag").lower()
+    jd_dedup_threshold: float = float(os.environ.get("JD_DEDUP_THRESHOLD", 0.85))
+    jd_dedup_num_perm: int = int(os.environ.get("JD_DEDUP_NUM_PERM", 128))
+    
+    # Background Enrichment of new job descriptions (text stats, reading level, salary range, locations)
+    enrichment_enabled: bool = os.environ.get("ENRICHMENT_ENABLED", "false").lower() == "true"
+    # Worker processes for the CPU-bound part (0 runs it in a thread of the app process)
+    enrichment_workers: int = int(os.environ.get("ENRICHMENT_WORKERS", min(os.cpu_count() or 1, 4)))
+    # Ids read, enriched and written back per batch; ids beyond the queue size are left to the backfill
+    enrichment_batch_size: int = int(os.environ.get("ENRICHMENT_BATCH_SIZE", 200))
+    enrichment_queue_size: int = int(os.environ.get("ENRICHMENT_QUEUE_SIZE", 100000))
+    enrichment_backfill_page_size: int = int(os.environ.get("ENRICHMENT_BACKFILL_PAGE_SIZE", 1000))
+    
+    # Bulk Export (/export and export.py)
+    export_page_size: int = int(os.environ.get("EXPORT_PAGE_SIZE", 1000))
+    # Rows buffered per Parquet row group, which bounds export memory
+    export_parquet_row_group_size: int = int(os.environ.get("EXPORT_PARQUET_ROW_GROUP_SIZE", 10000))
+    
+    # Response Compression (large JD lists and streams)
+    gzip_minimum_size: int = int(os.environ.get("GZIP_MINIMUM_SIZE", 1024))
+    gzip_level: int = int(os.environ.get("GZIP_LEVEL", 5))
+    
+    # Observability
+    metrics_enabled: bool = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    server_timing_enabled: bool = os.environ.get("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    
     # Application Settings
     environment: str = os.environ.get("ENVIRONMENT", "development")
     app_port: int = int(os.environ.get("APP_PORT", 8000))
     
     # Check if running on Vercel
     is_vercel: bool = "VERCEL" in os.environ
+    
+    # Defer loading heavy clients until after the first response (cold starts)
+    lazy_startup: bool = os.environ.get("LAZY_STARTUP", "true" if "VERCEL" in os.environ else "false").lower() == "true"
 
 settings = Settings()
@@ -0,0 +1,59 @@
+# export.py
+"""
+Export company profiles or job descriptions to a JSONL, CSV or Parquet file,
+streaming one page at a time from the configured storage backend.
+
+    python export.py jobs --format parquet --output jobs.parquet
+    python export.py companies --format csv --output - > companies.csv
+
+With --state, the largest updated_at exported is saved per entity and used
+as the watermark of the next run, so repeated runs export only new and
+changed rows:
+
+    python export.py jobs --format jsonl --output jobs-delta.jsonl --state export_state.json
+"""
+import argparse
+import asyncio
+import sys
+
+from services import export, hasura_service
+from services.state_file import read_state, write_state
+
+async def run(args):
+    state = read_state(args.state)
+    since = args.since if args.since is not None else state.get(args.entity)
+    fields = [name.strip() for name in args.fields.split(",") if name.strip()] if args.fields else None
+    export.export_fields(args.entity, fields)
+    export.check_format(args.format)
+    progress = {}
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    await hasura_service.open_storage()
+    try:
+        async for chunk in export.export_stream(args.entity, args.format, fields, since, args.page_size, progress):
+            output.write(chunk)
+    finally:
+        await hasura_service.close_storage()
+        if output is not sys.stdout.buffer:
+            output.close()
+    if args.state and progress["watermark"] is not None:
+        state[args.entity] = progress["watermark"]
+        write_state(args.state, state)
+    print(f"Exported {progress['rows']} {args.entity} (watermark {progress['watermark']})", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entity", choices=sorted(export.ENTITIES))
+    parser.add_argument("--format", choices=sorted(export.MEDIA_TYPES), default="jsonl")
+    parser.add_argument("--output", required=True, help="file to write, or - for stdout")
+    parser.add_argument("--since", help="only rows with updated_at at or after this timestamp")
+    parser.add_argument("--state", help="JSON file holding the watermark per entity, read and updated on success")
+    parser.add_argument("--fields", help="comma-separated fields to export (id and updated_at are always included)")
+    parser.add_argument("--page-size", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except ValueError as e:
+        parser.error(str(e))
+
+if __name__ == "__main__":
+    main()
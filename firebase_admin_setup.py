@@ -1,17 +1,29 @@
 # firebase_admin_setup.py
 import os
-import firebase_admin
-from firebase_admin import credentials
+import json
 from config.settings import settings
 
 def initialize_firebase():
+    """
+    Initialize the Firebase Admin SDK once per process. Credentials come from
+    FIREBASE_SERVICE_ACCOUNT_JSON when set (Vercel), otherwise from the
+    service account file resolved against the project root.
+    """
+    # Imported here so firebase_admin and the Google client libraries are
+    # only loaded by processes that actually need the Admin SDK
+    import firebase_admin
+    from firebase_admin import credentials
     if not firebase_admin._apps:  # Initialize only once
-        # Resolve the relative path based on the directory of this file (project root)
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        service_account_path = os.path.join(base_dir, settings.firebase_service_account)
-        cred = credentials.Certificate(service_account_path)
+        if settings.firebase_service_account_json:
+            cred = credentials.Certificate(json.loads(settings.firebase_service_account_json))
+        else:
+            # Resolve the relative path based on the directory of this file (project root)
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            service_account_path = os.path.join(base_dir, settings.firebase_service_account)
+            cred = credentials.Certificate(service_account_path)
         firebase_admin.initialize_app(cred, {
             "projectId": settings.firebase_project_id,
         })
+    return firebase_admin.get_app()
 
 initialize_firebase()
@@ -1,13 +1,18 @@
 # main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
-from routes import auth, company, jd
+from fastapi.middleware.gzip import GZipMiddleware
+from routes import auth, company, dashboard, export, jd, metrics, skills, stats
 from config.settings import settings
+from services import assets
+from services.lifespan import lifespan
+from services.responses import FastJSONResponse
+from services.metrics import MetricsMiddleware
+from services.resilience import ServiceUnavailableError, service_unavailable_handler
+from services.warmup import WarmupMiddleware
 import firebase_admin_setup  # This ensures Firebase is initialized
 
-app = FastAPI(title="Athena - Firebase + Hasura Integration")
+app = FastAPI(title="Athena - Firebase + Hasura Integration", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Configure CORS to allow all origins for simplicity
 app.add_middleware(
@@ -17,18 +22,34 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size, compresslevel=settings.gzip_level)
+app.add_middleware(WarmupMiddleware)
+# Outermost, so its timings cover every other middleware
+app.add_middleware(MetricsMiddleware)
+# Upstream outages and exhausted retries become 503 with Retry-After
+app.add_exception_handler(ServiceUnavailableError, service_unavailable_handler)
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Static files are served from the in-memory asset cache (ETags, precompressed variants)
+@app.get("/static/{path:path}")
+async def get_static(request: Request, path: str):
+    response = assets.response(request, f"static/{path}")
+    if response is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    return response
 
 # Include routers with prefixes
 app.include_router(auth.router, prefix="/auth")
 app.include_router(company.router, prefix="/company")
 app.include_router(jd.router, prefix="/jd")
+app.include_router(dashboard.router, prefix="/dashboard")
+app.include_router(skills.router, prefix="/skills")
+app.include_router(export.router, prefix="/export")
+app.include_router(stats.router, prefix="/api/stats")
+app.include_router(metrics.router)
 
 @app.get("/")
-async def read_root():
-    return FileResponse('templates/index.html')
+async def read_root(request: Request):
+    return assets.response(request, "templates/index.html")
 
 @app.get("/api/config/firebase")
 async def get_firebase_config():
@@ -44,9 +65,12 @@ async def get_firebase_config():
     }
 
 @app.get("/components/{component_type}/{file_name}")
-async def get_component(component_type: str, file_name: str):
+async def get_component(request: Request, component_type: str, file_name: str):
     """Serve component templates"""
-    return FileResponse(f'templates/{component_type}/{file_name}')
+    response = assets.response(request, f"templates/{component_type}/{file_name}")
+    if response is None:
+        raise HTTPException(status_code=404, detail="Template not found")
+    return response
 
 if __name__ == "__main__":
     import uvicorn
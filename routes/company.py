@@ -1,65 +1,17 @@
 # routes/company.py
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Header, HTTPException, Request
 from typing import Optional
 from services import hasura_service
+from services.resilience import ServiceUnavailableError
+from services.responses import FastJSONResponse, conditional_response, version_etag, version_from_etag
+from services.schemas import CompanyProfile, CompanyProfilePatch, CompanyProfileUpdate
 
 router = APIRouter()
 
-# Company Profile Input Model
-class CompanyProfile(BaseModel):
-    # Required fields
-    user_id: str
-    name: str
-    
-    # Company Identity - optional fields
-    overview: Optional[str] = None
-    industry: Optional[str] = None
-    year_founded: Optional[int] = None
-    headquarters_location: Optional[str] = None
-    global_presence: Optional[str] = None
-    company_size: Optional[str] = None
-    ownership_type: Optional[str] = None
-    company_type: Optional[str] = None
-    products_services: Optional[str] = None
-    specialties: Optional[str] = None
-    growth_stage: Optional[str] = None
-    key_markets: Optional[str] = None
-    
-    # Leadership & Team
-    founders: Optional[str] = None
-    leadership_team: Optional[str] = None
-    board_members: Optional[str] = None
-    team_composition: Optional[str] = None
-    
-    # Culture & Brand
-    work_culture: Optional[str] = None
-    dei_statement: Optional[str] = None
-    sustainability_initiatives: Optional[str] = None
-    awards: Optional[str] = None
-    milestones: Optional[str] = None
-    media_mentions: Optional[str] = None
-    success_stories: Optional[str] = None
-    unique_differentiators: Optional[str] = None
-    brand_voice: Optional[str] = None
-    employer_brand_sentiment: Optional[str] = None
-    
-    # Hiring & Operations
-    hiring_volumes: Optional[str] = None
-    company_languages: Optional[str] = None
-    workplace_model: Optional[str] = None
-    hiring_regions: Optional[str] = None
-    
-    # Web Presence & Links
-    logo_url: Optional[str] = None
-    website_url: Optional[str] = None
-    careers_page_url: Optional[str] = None
-    social_media_links: Optional[str] = None
-    employer_review_links: Optional[str] = None
-
-class CompanyProfileUpdate(CompanyProfile):
-    id: int
-    user_id: Optional[str] = None  # Make user_id optional for updates
+def _with_etag(response, company):
+    if company is not None and company.updated_at:
+        response.headers["ETag"] = version_etag(company.updated_at)
+    return response
 
 @router.post("/create", tags=["Company Profile"])
 async def create_company(profile: CompanyProfile):
@@ -67,15 +19,15 @@ async def create_company(profile: CompanyProfile):
     Creates a company profile by inserting data into Hasura.
     """
     try:
-        # Check if user already has a company
-        existing_company = hasura_service.get_company_by_user_id(profile.user_id)
-        if existing_company:
+        # Single upsert round trip; None means the user already has a company
+        result = await hasura_service.insert_company_profile(profile)
+        if result is None:
             raise HTTPException(status_code=400, detail="User already has a company profile")
-            
-        result = hasura_service.insert_company_profile(profile)
-        return {"status": "success", "data": result}
+        return FastJSONResponse({"status": "success", "data": result})
     except HTTPException as e:
         raise e
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create company profile: {e}")
 
@@ -85,20 +37,55 @@ async def update_company(profile: CompanyProfileUpdate):
     Updates an existing company profile.
     """
     try:
-        result = hasura_service.update_company_profile(profile)
-        return {"status": "success", "data": result}
+        result = await hasura_service.update_company_profile(profile)
+        return _with_etag(FastJSONResponse({"status": "success", "data": result}), result)
+    except ServiceUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update company profile: {e}")
+
+@router.patch("/{company_id}", tags=["Company Profile"])
+async def patch_company(company_id: int, patch: CompanyProfilePatch, if_match: Optional[str] = Header(None)):
+    """
+    Updates only the fields present in the body. With an `If-Match` header
+    holding the ETag from a previous read, the update is applied only if the
+    profile has not changed since; otherwise 412 is returned.
+    """
+    # Fields the client sent, including explicit nulls; the rest are left as they are
+    values = patch.model_dump(exclude_unset=True)
+    if not values:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    version = None
+    if if_match is not None and if_match.strip() != "*":
+        version = version_from_etag(if_match.split(",")[0])
+        if version is None:
+            raise HTTPException(status_code=412, detail="If-Match does not name a version of this company profile")
+    try:
+        result = await hasura_service.patch_company_profile(company_id, values, version)
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update company profile: {e}")
+    if result is None:
+        if if_match is not None:
+            raise HTTPException(status_code=412, detail="Company profile has changed since it was read")
+        raise HTTPException(status_code=404, detail=f"Company profile {company_id} not found")
+    return _with_etag(FastJSONResponse({"status": "success", "data": result}), result)
 
 @router.get("/user/{user_id}", tags=["Company Profile"])
-async def get_user_company(user_id: str):
+async def get_user_company(user_id: str, request: Request):
     """
-    Retrieves a company profile for a specific user.
+    Retrieves a company profile for a specific user. The ETag names the
+    profile's version; send it back as If-None-Match to get a 304 when the
+    profile is unchanged, or as If-Match on PATCH.
     """
     try:
-        company = hasura_service.get_company_by_user_id(user_id)
+        company = await hasura_service.get_company_by_user_id(user_id)
         if not company:
-            return {"status": "success", "data": None}
-        return {"status": "success", "data": company}
+            return FastJSONResponse({"status": "success", "data": None})
+        etag = version_etag(company.updated_at) if company.updated_at else None
+        return conditional_response(request, {"status": "success", "data": company}, etag)
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve company profile: {e}")
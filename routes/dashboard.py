@@ -0,0 +1,36 @@
+# routes/dashboard.py
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from config.settings import settings
+from services import hasura_service
+from services.resilience import ServiceUnavailableError
+from services.responses import FastJSONResponse
+
+router = APIRouter()
+
+@router.get("/{user_id}", tags=["Dashboard"])
+async def get_dashboard(
+    user_id: str,
+    limit: int = Query(settings.jd_page_size, ge=1, le=settings.jd_max_page_size),
+    after: int = Query(0, ge=0),
+    fields: Optional[str] = None
+):
+    """
+    Retrieves a user's company profile and the first page of its job
+    descriptions in a single Hasura round trip.
+    """
+    try:
+        projection = hasura_service.job_projection([name.strip() for name in fields.split(",") if name.strip()] if fields else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        company, jobs, next_cursor = await hasura_service.get_dashboard(user_id, limit, after, projection)
+        return FastJSONResponse({
+            "status": "success",
+            "data": {"company": company, "jobs": jobs, "next_cursor": next_cursor}
+        })
+    except ServiceUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve dashboard: {e}")
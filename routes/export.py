@@ -0,0 +1,62 @@
+# routes/export.py
+import orjson
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from config.settings import settings
+from services import export
+
+router = APIRouter()
+
+def _export_response(entity: str, export_format: str, fields: Optional[str], since: Optional[str], page_size: int):
+    requested = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    try:
+        export.export_fields(entity, requested)
+        export.check_format(export_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def body():
+        try:
+            async for chunk in export.export_stream(entity, export_format, requested, since, page_size):
+                yield chunk
+        except Exception as e:
+            if export_format != "jsonl":
+                # A truncated CSV or Parquet body must not look complete; abort the response
+                raise
+            # Headers are already sent, so report the failure in-band
+            yield orjson.dumps({"error": f"Failed to export {entity}: {e}"}) + b"\n"
+
+    return StreamingResponse(
+        body(),
+        media_type=export.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{export_format}"'},
+    )
+
+@router.get("/jobs", tags=["Export"])
+async def export_jobs(
+    format: str = Query("jsonl"),
+    since: Optional[str] = None,
+    fields: Optional[str] = None,
+    page_size: int = Query(settings.export_page_size, ge=1, le=10000),
+):
+    """
+    Streams every job description as JSONL, CSV or Parquet (`format`),
+    paging through storage by id. `since` (an updated_at value) limits the
+    export to rows written at or after it; `fields` is a comma-separated
+    projection.
+    """
+    return _export_response("jobs", format, fields, since, page_size)
+
+@router.get("/companies", tags=["Export"])
+async def export_companies(
+    format: str = Query("jsonl"),
+    since: Optional[str] = None,
+    fields: Optional[str] = None,
+    page_size: int = Query(settings.export_page_size, ge=1, le=10000),
+):
+    """
+    Streams every company profile as JSONL, CSV or Parquet, with the same
+    options as /export/jobs.
+    """
+    return _export_response("companies", format, fields, since, page_size)
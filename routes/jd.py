@@ -1,89 +1,196 @@
 # routes/jd.py
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import asyncio
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional
-from services import hasura_service
+from config.settings import settings
+from services import bulk_ingest, dedup_index, facet_index, hasura_service, search_index, similarity_index
+from services.resilience import ServiceUnavailableError
+from services.responses import FastJSONResponse, conditional_response
+from services.schemas import JDInput
 
 router = APIRouter()
 
-class JDInput(BaseModel):
-    # Required fields
-    company_id: int
-    title: str
-    
-    # Basic Job Info - optional fields
-    job_code: Optional[str] = None
-    job_level: Optional[str] = None
-    department: Optional[str] = None
-    job_function: Optional[str] = None
-    
-    # Job Posting Metadata
-    contract_duration: Optional[str] = None
-    time_commitment: Optional[str] = None
-    
-    # Detailed Role Description
-    job_summary: Optional[str] = None
-    day_to_day_tasks: Optional[str] = None
-    performance_indicators: Optional[str] = None
-    decision_making: Optional[str] = None
-    stakeholder_interactions: Optional[str] = None
-    
-    # Requirements Breakdown
-    required_qualifications: Optional[str] = None
-    preferred_qualifications: Optional[str] = None
-    mandatory_certifications: Optional[str] = None
-    legal_eligibility: Optional[str] = None
-    background_checks: Optional[str] = None
-    clearance_level: Optional[str] = None
-    
-    # Skills Classification
-    hard_skills: Optional[str] = None
-    soft_skills: Optional[str] = None
-    domain_expertise: Optional[str] = None
-    methodologies: Optional[str] = None
-    languages: Optional[str] = None
-    skills_priority: Optional[str] = None
-    
-    # Compensation Details
-    base_salary: Optional[str] = None
-    bonus_structure: Optional[str] = None
-    equity_options: Optional[str] = None
-    benefits: Optional[str] = None
-    relocation_assistance: Optional[str] = None
-    visa_sponsorship: Optional[str] = None
-    
-    # Work Environment
-    work_model: Optional[str] = None
-    work_locations: Optional[str] = None
-    travel_requirements: Optional[str] = None
-    shift_type: Optional[str] = None
-    
-    # Career Path Info
-    growth_opportunities: Optional[str] = None
-    training_development: Optional[str] = None
-    mentorship: Optional[str] = None
-    succession_planning: Optional[str] = None
-    culture_page_link: Optional[str] = None
-    careers_page_link: Optional[str] = None
-
 @router.post("/submit", tags=["Job Description"])
 async def submit_jd(jd: JDInput):
     """
-    Submits a job description for a specific company.
+    Submits a job description for a specific company. Near-duplicates of the
+    company's existing postings are listed in `duplicates`, or rejected with
+    409 when JD_DEDUP_MODE is "reject".
     """
+    duplicates = []
+    if settings.jd_dedup_mode != "off":
+        # Hashing the text and probing the index run off the event loop
+        duplicates = await asyncio.to_thread(dedup_index.index.find_duplicates, jd.model_dump())
+        if duplicates and settings.jd_dedup_mode == "reject":
+            ids = ", ".join(str(match["id"]) for match in duplicates)
+            raise HTTPException(status_code=409, detail=f"Near-duplicate of existing job description(s): {ids}")
     try:
-        result = hasura_service.insert_job_description(jd)
-        return {"status": "success", "data": result}
+        result = await hasura_service.insert_job_description(jd)
+        body = {"status": "success", "data": result}
+        if duplicates:
+            body["duplicates"] = duplicates
+        return FastJSONResponse(body)
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit job description: {e}")
 
+@router.post("/bulk", tags=["Job Description"])
+async def bulk_submit_jds(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000)
+):
+    """
+    Ingests a streamed NDJSON or CSV body of job descriptions in batched inserts
+    and reports per-row errors and near-duplicates.
+    """
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    try:
+        report = await bulk_ingest.ingest_job_descriptions(request.stream(), format, JDInput, chunk_size)
+        return FastJSONResponse({"status": "success", "data": report.as_dict()})
+    except bulk_ingest.RecordTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ServiceUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to ingest job descriptions: {e}")
+
 @router.get("/company/{company_id}", tags=["Job Description"])
-async def get_company_jobs(company_id: int):
+async def get_company_jobs(
+    company_id: int,
+    request: Request,
+    limit: int = Query(settings.jd_page_size, ge=1, le=settings.jd_max_page_size),
+    after: int = Query(0, ge=0),
+    fields: Optional[str] = None,
+    stream: bool = False
+):
     """
-    Retrieves all job descriptions for a specific company.
+    Retrieves job descriptions for a specific company, one keyset page at a
+    time. `fields` is a comma-separated projection; `stream=true` returns
+    every job after the cursor as NDJSON, emitted as each page arrives.
+    Pages carry a weak ETag; a matching If-None-Match gets an empty 304.
     """
     try:
-        jobs = hasura_service.get_company_jobs(company_id)
-        return {"status": "success", "data": jobs}
+        projection = hasura_service.job_projection([name.strip() for name in fields.split(",") if name.strip()] if fields else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if stream:
+        async def rows():
+            try:
+                async for page in hasura_service.iter_company_jobs(company_id, limit, after, projection):
+                    yield b"".join(orjson.dumps(job) + b"\n" for job in page)
+            except Exception as e:
+                # Headers are already sent, so report the failure in-band
+                yield orjson.dumps({"error": f"Failed to retrieve job descriptions: {e}"}) + b"\n"
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+    
+    try:
+        jobs, next_cursor = await hasura_service.get_company_jobs(company_id, limit, after, projection)
+        return conditional_response(request, {"status": "success", "data": jobs, "next_cursor": next_cursor})
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve job descriptions: {e}")
+
+@router.get("/search", tags=["Job Description"])
+async def search_jds(
+    q: str = Query(..., min_length=1, max_length=500),
+    company_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    boost: Optional[str] = None
+):
+    """
+    Ranked full-text search over job descriptions. `boost` overrides per-field
+    weights, e.g. `title:5,hard_skills:3`; a weight of 0 excludes the field.
+    """
+    if not settings.jd_search_enabled:
+        raise HTTPException(status_code=503, detail="Job description search is disabled")
+    boosts = {}
+    for part in (boost or "").split(","):
+        if not part.strip():
+            continue
+        field, _, weight = part.partition(":")
+        field = field.strip()
+        if field not in search_index.SEARCH_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Unknown search field: {field}")
+        try:
+            boosts[field] = float(weight)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid boost for {field}: {weight!r}")
+    total, hits = await asyncio.to_thread(search_index.index.search, q, company_id, limit, offset, boosts)
+    return FastJSONResponse({
+        "status": "success",
+        "data": hits,
+        "total": total,
+        "complete": search_index.index.ready
+    })
+
+@router.get("/facets", tags=["Job Description"])
+async def facet_jds(
+    request: Request,
+    facets: Optional[str] = None,
+    limit: int = Query(0, ge=0, le=settings.jd_max_page_size)
+):
+    """
+    Filters job descriptions by categorical fields and returns per-category
+    counts. Pass filters as query parameters, e.g.
+    `?job_level=senior&work_model=remote,hybrid&facets=department`; values
+    are OR'd within a field and AND'd across fields. `limit` also returns the
+    ids of the newest matches.
+    """
+    if not settings.jd_facets_enabled:
+        raise HTTPException(status_code=503, detail="Job description facets are disabled")
+    filters = {}
+    for field in facet_index.FACET_FIELDS:
+        values = [value for raw in request.query_params.getlist(field) for value in raw.split(",") if value.strip()]
+        if values:
+            filters[field] = values
+    requested = facet_index.FACET_FIELDS
+    if facets:
+        requested = tuple(name.strip() for name in facets.split(",") if name.strip())
+        unknown = set(requested) - set(facet_index.FACET_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown facet fields: {', '.join(sorted(unknown))}")
+    result = await asyncio.to_thread(facet_index.index.query, filters, requested, limit)
+    return FastJSONResponse({"status": "success", "data": result, "complete": facet_index.index.ready})
+
+@router.get("/{jd_id}/similar", tags=["Job Description"])
+async def similar_jds(
+    jd_id: int,
+    k: int = Query(10, ge=1, le=100),
+    exclude_company: bool = False
+):
+    """
+    Returns the k job descriptions most similar to this one across all
+    companies, by TF-IDF cosine similarity.
+    """
+    if not settings.jd_similarity_enabled:
+        raise HTTPException(status_code=503, detail="Similar job recommendations are disabled")
+    # Keep the sparse products off the event loop
+    similar = await asyncio.to_thread(similarity_index.index.similar, jd_id, k, exclude_company)
+    if similar is None:
+        raise HTTPException(status_code=404, detail=f"Job description {jd_id} is not indexed")
+    return FastJSONResponse({"status": "success", "data": similar, "complete": similarity_index.index.ready})
+
+@router.get("/{jd_id}/enrichment", tags=["Job Description"])
+async def get_jd_enrichment(jd_id: int):
+    """
+    Returns the derived data for a job description: normalized text, word and
+    sentence counts, reading level, parsed salary range and canonical
+    locations. 404 until the background enrichment worker has processed it.
+    """
+    try:
+        enrichment = await hasura_service.get_job_enrichment(jd_id)
+    except ServiceUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve job description enrichment: {e}")
+    if enrichment is None:
+        raise HTTPException(status_code=404, detail=f"Job description {jd_id} has not been enriched")
+    return FastJSONResponse({"status": "success", "data": enrichment})
@@ -0,0 +1,13 @@
+# routes/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from services import metrics
+
+router = APIRouter()
+
+@router.get("/metrics", tags=["Diagnostics"], include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Exposes request, Hasura and Firebase metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
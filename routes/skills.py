@@ -0,0 +1,65 @@
+# routes/skills.py
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from config.settings import settings
+from services import hasura_service, skills, skills_index
+from services.resilience import ServiceUnavailableError
+from services.responses import FastJSONResponse
+
+router = APIRouter()
+
+def _require_enabled():
+    if not settings.jd_skills_enabled:
+        raise HTTPException(status_code=503, detail="The skills index is disabled")
+
+@router.get("/top", tags=["Skills"])
+async def top_skills(
+    field: Optional[str] = Query(None, pattern="^(" + "|".join(skills.SKILL_FIELDS) + ")$"),
+    prefix: str = "",
+    limit: int = Query(20, ge=1, le=500)
+):
+    """
+    Returns the most requested normalized skills with their job counts,
+    optionally within one skill field or starting with `prefix`.
+    """
+    _require_enabled()
+    top = await asyncio.to_thread(skills_index.index.top, field, limit, prefix)
+    return FastJSONResponse({
+        "status": "success",
+        "data": top,
+        "complete": skills_index.index.ready
+    })
+
+@router.get("/{skill:path}/jobs", tags=["Skills"])
+async def skill_jobs(
+    skill: str,
+    limit: int = Query(settings.jd_page_size, ge=1, le=settings.jd_max_page_size),
+    before: Optional[int] = Query(None, ge=1),
+    fields: Optional[str] = None
+):
+    """
+    Retrieves job descriptions listing a skill, newest first. Aliases such as
+    "k8s" resolve to their canonical skill; `before` is the cursor from the
+    previous page and `fields` a comma-separated projection.
+    """
+    _require_enabled()
+    try:
+        projection = hasura_service.job_projection([name.strip() for name in fields.split(",") if name.strip()] if fields else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    name, total, ids, next_cursor = await asyncio.to_thread(skills_index.index.jobs, skill, limit, before)
+    try:
+        jobs = await hasura_service.get_jobs_by_ids(ids, projection)
+    except ServiceUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve job descriptions: {e}")
+    return FastJSONResponse({
+        "status": "success",
+        "skill": name,
+        "total": total,
+        "data": jobs,
+        "next_cursor": next_cursor
+    })
@@ -0,0 +1,76 @@
+# routes/stats.py
+from fastapi import APIRouter
+from config.settings import settings
+from services import enrichment_worker, hasura_service, jd_indexes
+from services.token_verifier import verifier
+
+router = APIRouter()
+
+@router.get("/cache", tags=["Diagnostics"])
+async def cache_stats():
+    """
+    Returns hit/miss counters for the company profile and ID token caches.
+    """
+    return {
+        "status": "success",
+        "data": {
+            "company": hasura_service.company_cache.stats(),
+            "firebase_tokens": verifier.cache.stats()
+        }
+    }
+
+@router.get("/coalescing", tags=["Diagnostics"])
+async def coalescing_stats():
+    """
+    Returns how many concurrent identical Hasura reads were collapsed into one call.
+    """
+    return {"status": "success", "data": hasura_service.read_coalescer.stats()}
+
+@router.get("/batching", tags=["Diagnostics"])
+async def batching_stats():
+    """
+    Returns how many /jd/submit inserts were coalesced into each multi-row write, and the current queue depth.
+    """
+    return {
+        "status": "success",
+        "data": {"enabled": settings.jd_submit_batching, **hasura_service.submit_batcher.stats()}
+    }
+
+@router.get("/upstream", tags=["Diagnostics"])
+async def upstream_stats():
+    """
+    Returns the Hasura circuit breaker state, the per-operation p95 latencies used to time hedged
+    reads, and each upstream admission limiter's in-flight calls, queue depth and rejections.
+    """
+    limiters = (hasura_service.read_limiter, hasura_service.write_limiter, verifier.limiter)
+    return {
+        "status": "success",
+        "data": {
+            "hasura": {**hasura_service.breaker.stats(), "p95_seconds": hasura_service.latencies.stats()},
+            "admission": {limiter.name: limiter.stats() for limiter in limiters},
+        }
+    }
+
+@router.get("/indexes", tags=["Diagnostics"])
+async def index_stats():
+    """
+    Returns load progress and size of the in-process job description indexes.
+    """
+    return {"status": "success", "data": jd_indexes.stats()}
+
+@router.get("/enrichment", tags=["Diagnostics"])
+async def enrichment_stats():
+    """
+    Returns the background enrichment worker's queue depth and how many job descriptions it has enriched, failed or dropped.
+    """
+    return {
+        "status": "success",
+        "data": {"enabled": settings.enrichment_enabled, **enrichment_worker.worker.stats()}
+    }
+
+@router.get("/storage", tags=["Diagnostics"])
+async def storage_stats():
+    """
+    Returns the active storage backend and its connection pool usage.
+    """
+    return {"status": "success", "data": hasura_service.get_backend().stats()}
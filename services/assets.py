@@ -0,0 +1,143 @@
+# services/assets.py
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from typing import Dict, NamedTuple, Optional
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli variants are skipped when the package is missing
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Directories served from memory, keyed by the URL prefix used to look them up
+ASSET_ROOTS = {"static": os.path.join(BASE_DIR, "static"), "templates": os.path.join(BASE_DIR, "templates")}
+
+COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MIN_COMPRESS_SIZE = 512
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# "/static/css/styles.css" references inside HTML, rewritten to content-hashed URLs
+STATIC_REF = re.compile(r"""(["'])/static/([^"'?#]+)\1""")
+
+class Asset(NamedTuple):
+    body: bytes
+    media_type: str
+    version: str
+    gzip: Optional[bytes]
+    br: Optional[bytes]
+
+_assets: Dict[str, Asset] = {}
+
+def _build(body: bytes, media_type: str, compress: bool) -> Asset:
+    version = hashlib.sha256(body).hexdigest()[:16]
+    gzipped = encoded_br = None
+    if compress and media_type.startswith(COMPRESSIBLE) and len(body) >= MIN_COMPRESS_SIZE:
+        gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            encoded_br = brotli.compress(body, quality=11)
+    return Asset(body, media_type, version, gzipped, encoded_br)
+
+def load(compress: bool = True):
+    """
+    Read every static file and template into memory with content hashes and
+    precompressed gzip/brotli variants. Compression takes a few hundred ms at
+    maximum levels, so cold starts load uncompressed first and warmup
+    reloads with compression in a worker thread.
+    """
+    global _assets
+    assets = {}
+    for prefix, root in ASSET_ROOTS.items():
+        for directory, _, files in os.walk(root):
+            for name in files:
+                path = os.path.join(directory, name)
+                key = posixpath.join(prefix, os.path.relpath(path, root).replace(os.sep, "/"))
+                with open(path, "rb") as handle:
+                    body = handle.read()
+                media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                assets[key] = (body, media_type)
+
+    built = {key: _build(body, media_type, compress) for key, (body, media_type) in assets.items() if media_type != "text/html"}
+
+    def versioned(match):
+        asset = built.get("static/" + match.group(2))
+        if asset is None:
+            return match.group(0)
+        return f"{match.group(1)}/static/{match.group(2)}?v={asset.version}{match.group(1)}"
+
+    # HTML is built last so its /static/ references can point at hashed URLs
+    for key, (body, media_type) in assets.items():
+        if media_type == "text/html":
+            body = STATIC_REF.sub(versioned, body.decode("utf-8")).encode("utf-8")
+            built[key] = _build(body, media_type, compress)
+
+    # One assignment, so requests served while this runs in a thread see the old or the new cache, never an empty one
+    _assets = built
+
+def get(path: str) -> Optional[Asset]:
+    """
+    Look up an asset by its path under ASSET_ROOTS. Only files loaded at
+    startup can match, so "..", absolute paths and encoded traversal
+    sequences never reach the filesystem.
+    """
+    if not _assets:
+        load(compress=False)
+    return _assets.get(path)
+
+def url(path: str) -> str:
+    """Content-hashed URL for a static asset, served with immutable caching."""
+    asset = get("static/" + path)
+    return f"/static/{path}?v={asset.version}" if asset else f"/static/{path}"
+
+def _accepts(accept_encoding: str) -> Dict[str, float]:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            quality = float(match.group(1))
+        if token:
+            accepted[token.lower()] = quality
+    return accepted
+
+def _not_modified(if_none_match: str, version: str) -> bool:
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        # Weak comparison: ignore W/ and the per-encoding suffix
+        if (tag[2:] if tag.startswith("W/") else tag).strip('"').split("-")[0] == version:
+            return True
+    return False
+
+def response(request: Request, path: str) -> Optional[Response]:
+    """Build the response for an asset, or None when it does not exist."""
+    asset = get(path)
+    if asset is None:
+        return None
+
+    headers = {
+        "Cache-Control": IMMUTABLE if request.query_params.get("v") == asset.version else REVALIDATE,
+        "Vary": "Accept-Encoding",
+    }
+    accepted = _accepts(request.headers.get("accept-encoding", ""))
+    body, encoding = asset.body, None
+    if asset.br is not None and accepted.get("br", 0) > 0:
+        body, encoding = asset.br, "br"
+    elif asset.gzip is not None and accepted.get("gzip", 0) > 0:
+        body, encoding = asset.gzip, "gzip"
+    headers["ETag"] = f'"{asset.version}-{encoding}"' if encoding else f'"{asset.version}"'
+
+    if _not_modified(request.headers.get("if-none-match", ""), asset.version):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=asset.media_type, headers=headers)
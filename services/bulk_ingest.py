@@ -0,0 +1,203 @@
+# services/bulk_ingest.py
+import asyncio
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+from pydantic import ValidationError
+from config.settings import settings
+from services import dedup_index, hasura_service
+from services.resilience import BULK, ServiceUnavailableError, priority
+
+class RecordTooLarge(Exception):
+    pass
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_bytes: int) -> AsyncIterator[str]:
+    """Split a byte stream into text lines (newline kept) without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        start = 0
+        while True:
+            end = buffer.find("\n", start)
+            if end == -1:
+                break
+            yield buffer[start:end + 1]
+            start = end + 1
+        buffer = buffer[start:]
+        if len(buffer) > max_bytes:
+            raise RecordTooLarge(f"Record exceeds {max_bytes} bytes")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+async def iter_ndjson_records(chunks, max_bytes: int) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (row, record, error) for every non-blank NDJSON line."""
+    row = 0
+    async for line in iter_lines(chunks, max_bytes):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Each line must be a JSON object"
+            continue
+        yield row, record, None
+
+async def iter_csv_records(chunks, max_bytes: int) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield (row, record, error) for every CSV data row. The first row is the
+    header; quoted fields may span lines, so lines are joined until the quote
+    count balances. Empty cells become None.
+    """
+    header = None
+    row = 0
+    pending = ""
+    async for line in iter_lines(chunks, max_bytes):
+        pending += line
+        if pending.count('"') % 2:
+            if len(pending) > max_bytes:
+                raise RecordTooLarge(f"Record exceeds {max_bytes} bytes")
+            continue
+        text, pending = pending, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row, {name: (value if value != "" else None) for name, value in zip(header, values)}, None
+    if pending.strip():
+        yield row + 1, None, "Unterminated quoted field"
+
+class BulkReport:
+    def __init__(self, max_errors: int):
+        self.received = 0
+        self.inserted = 0
+        self.failed = 0
+        self.flagged = 0
+        self.errors: List[dict] = []
+        self.duplicates: List[dict] = []
+        self.max_errors = max_errors
+
+    def fail(self, row: int, error: str):
+        self.failed += 1
+        # Cap stored errors so a bad upload cannot grow the report without bound
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "error": error})
+
+    def flag(self, row: int, matches: List[dict]):
+        self.flagged += 1
+        if len(self.duplicates) < self.max_errors:
+            self.duplicates.append({"row": row, "matches": matches})
+
+    def as_dict(self):
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "flagged": self.flagged,
+            "duplicates": self.duplicates,
+        }
+
+async def _flush(batch: List[Tuple[int, object]], report: BulkReport):
+    # Imports queue behind interactive writes for Hasura admission slots
+    with priority(BULK):
+        try:
+            await hasura_service.insert_job_descriptions([jd for _, jd in batch])
+            report.inserted += len(batch)
+            return
+        except ServiceUnavailableError as e:
+            # Isolating rows one by one would only be rejected again
+            for row, _ in batch:
+                report.fail(row, str(e))
+            return
+        except Exception:
+            pass
+        # The multi-object insert is atomic, so isolate the failing rows one by one
+        for row, jd in batch:
+            try:
+                await hasura_service.insert_job_descriptions([jd])
+                report.inserted += 1
+            except Exception as e:
+                report.fail(row, str(e))
+
+class DuplicateChecker:
+    """
+    Checks rows against the shared dedup index and against earlier rows of
+    the current chunk, which are not indexed until the chunk is inserted.
+    Matches within the chunk are reported by row number instead of id. Rows
+    of earlier chunks are in the shared index once inserted, so only the
+    current chunk is held here and memory stays bounded by the chunk size.
+    """
+
+    def __init__(self, reject: bool):
+        self.reject = reject
+        self.index = dedup_index.index
+        self.upload = dedup_index.DedupIndex(self.index.num_perm, self.index.threshold)
+
+    def check(self, row: int, jd) -> List[dict]:
+        record = jd.model_dump()
+        company_id = record.get("company_id") or 0
+        signature = self.index.signature(record)
+        matches = self.index.query(company_id, signature)
+        matches += [{"row": -match["id"], "similarity": match["similarity"]} for match in self.upload.query(company_id, signature)]
+        # Rejected rows are never inserted, so later rows are not compared with them
+        if not (matches and self.reject):
+            self.upload.insert(-row, company_id, signature)
+        return matches
+
+    def clear(self):
+        """Forget the rows of a chunk that has been flushed to the shared index."""
+        self.upload = dedup_index.DedupIndex(self.index.num_perm, self.index.threshold)
+
+async def ingest_job_descriptions(chunks, fmt: str, model, chunk_size: int = None) -> BulkReport:
+    """
+    Parse, validate and insert job descriptions from a streamed NDJSON or CSV
+    body, writing one multi-object mutation per chunk.
+    """
+    chunk_size = chunk_size or settings.jd_bulk_chunk_size
+    records = iter_csv_records if fmt == "csv" else iter_ndjson_records
+    report = BulkReport(settings.jd_bulk_max_error_reports)
+    checker = DuplicateChecker(settings.jd_dedup_mode == "reject") if settings.jd_dedup_mode != "off" else None
+    batch = []
+    async for row, record, error in records(chunks, settings.jd_bulk_max_record_bytes):
+        report.received += 1
+        if error is not None:
+            report.fail(row, error)
+            continue
+        try:
+            jd = model(**record)
+        except ValidationError as e:
+            report.fail(row, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+            continue
+        if checker is not None:
+            # MinHash and the index probe are CPU-bound and take the index lock
+            matches = await asyncio.to_thread(checker.check, row, jd)
+            if matches and checker.reject:
+                report.fail(row, "Near-duplicate of " + ", ".join(
+                    f"job description {match['id']}" if "id" in match else f"row {match['row']}" for match in matches
+                ))
+                continue
+            if matches:
+                report.flag(row, matches)
+        batch.append((row, jd))
+        if len(batch) >= chunk_size:
+            await _flush(batch, report)
+            batch = []
+            if checker is not None:
+                checker.clear()
+    if batch:
+        await _flush(batch, report)
+    return report
@@ -0,0 +1,98 @@
+# services/cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+# Returned by get() on a miss, so a cached None can mean "known not to exist"
+MISS = object()
+
+class CacheBackend:
+    """
+    Async cache interface. Methods are coroutines so a shared backend (Redis,
+    Memcached) can be registered without changing callers.
+    """
+    async def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: float):
+        raise NotImplementedError
+
+    async def delete(self, *keys: str):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+class NullCache(CacheBackend):
+    async def get(self, key):
+        return MISS
+
+    async def set(self, key, value, ttl):
+        pass
+
+    async def delete(self, *keys):
+        pass
+
+class InMemoryLRUCache(CacheBackend):
+    """Size-bounded LRU with a per-entry TTL, local to this process."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return MISS
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key, value, ttl):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+_backends: Dict[str, Callable[[int], CacheBackend]] = {
+    "memory": InMemoryLRUCache,
+    "none": lambda max_entries: NullCache(),
+}
+
+def register_backend(name: str, factory: Callable[[int], CacheBackend]):
+    """Make a backend selectable by name, e.g. register_backend("redis", RedisCache)."""
+    _backends[name] = factory
+
+def create_backend(name: str, max_entries: int) -> CacheBackend:
+    try:
+        return _backends[name](max_entries)
+    except KeyError:
+        raise ValueError(f"Unknown cache backend: {name}")
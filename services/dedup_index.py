@@ -0,0 +1,170 @@
+# services/dedup_index.py
+import re
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import settings
+from services import jd_indexes
+
+# Narrative fields compared for near-duplicates; codes, links and pay are excluded
+DEDUP_FIELDS = (
+    "title", "job_summary", "day_to_day_tasks", "performance_indicators", "decision_making",
+    "stakeholder_interactions", "required_qualifications", "preferred_qualifications",
+    "hard_skills", "soft_skills", "domain_expertise", "methodologies", "benefits",
+    "growth_opportunities", "training_development", "mentorship",
+)
+
+WORD = re.compile(r"\w+")
+SHINGLE_SIZE = 3
+PRIME = 4294967311  # smallest prime above 2**32
+SEED = 20240601
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows == num_perm whose candidate threshold
+    (1/bands) ** (1/rows) is the highest one still at or below `threshold`,
+    so near-duplicates are rarely missed and candidates are then confirmed
+    against the full signature.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+class DedupIndex(jd_indexes.JDIndex):
+    """
+    MinHash signatures over word shingles of each job description, bucketed
+    per company with locality-sensitive hashing. A lookup only compares
+    against postings that share at least one band with the new one, so the
+    cost does not grow with the size of the company's backlog.
+    """
+    name = "dedup"
+    fields = ("id", "company_id") + DEDUP_FIELDS
+
+    def __init__(self, num_perm: int = None, threshold: float = None):
+        super().__init__()
+        self.num_perm = num_perm or settings.jd_dedup_num_perm
+        self.threshold = threshold if threshold is not None else settings.jd_dedup_threshold
+        self.bands, self.rows = lsh_bands(self.num_perm, self.threshold)
+        # Snapshots are only valid for the same permutations
+        self.version = (1, self.num_perm, SEED)
+        self._permutations = None
+        self._reset()
+
+    def _reset(self):
+        self.ids = array("q")
+        self.company_ids = array("q")
+        # num_perm uint32 values per document, in ordinal order
+        self.signatures = array("I")
+        self.ordinals: Dict[int, int] = {}
+        self.buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+
+    def __contains__(self, jd_id):
+        return jd_id in self.ordinals
+
+    def __len__(self):
+        return len(self.ids)
+
+    def signature(self, row: dict):
+        """MinHash signature of a row's text, or None when it has no words."""
+        import numpy as np
+        if self._permutations is None:
+            state = np.random.RandomState(SEED)
+            self._permutations = (
+                state.randint(1, 2**32 - 1, self.num_perm, dtype=np.uint64)[:, None],
+                state.randint(0, 2**32 - 1, self.num_perm, dtype=np.uint64)[:, None],
+            )
+        words = WORD.findall(" ".join(row[field] for field in DEDUP_FIELDS if row.get(field)).lower())
+        if not words:
+            return None
+        tokens = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in words), dtype=np.uint64, count=len(words))
+        if len(tokens) >= SHINGLE_SIZE:
+            # Combine consecutive word hashes into one 32-bit hash per shingle
+            shingles = tokens[:1 - SHINGLE_SIZE].copy()
+            for offset in range(1, SHINGLE_SIZE):
+                end = len(tokens) - SHINGLE_SIZE + 1 + offset
+                shingles = (shingles * np.uint64(1000003) + tokens[offset:end]) & np.uint64(0xFFFFFFFF)
+        else:
+            shingles = tokens
+        a, b = self._permutations
+        hashed = (a * np.unique(shingles)[None, :] + b) % np.uint64(PRIME)
+        return np.minimum(hashed.min(axis=1), 0xFFFFFFFF).astype(np.uint32)
+
+    def _band_keys(self, company_id: int, signature):
+        width = self.rows
+        return [hash((company_id, signature[band * width:(band + 1) * width].tobytes())) for band in range(self.bands)]
+
+    def prepare(self, row: dict):
+        return self.signature(row)
+
+    def merge(self, row: dict, signature):
+        self.insert(row["id"], row.get("company_id") or 0, signature)
+
+    def insert(self, jd_id: int, company_id: int, signature):
+        ordinal = len(self.ids)
+        self.ordinals[jd_id] = ordinal
+        self.ids.append(jd_id)
+        self.company_ids.append(company_id)
+        if signature is None:
+            # Keep ordinals aligned; an all-max signature never shares a band with real text
+            self.signatures.extend([0xFFFFFFFF] * self.num_perm)
+            return
+        self.signatures.frombytes(signature.tobytes())
+        for buckets, key in zip(self.buckets, self._band_keys(company_id, signature)):
+            buckets.setdefault(key, []).append(ordinal)
+
+    def query(self, company_id: int, signature, threshold: Optional[float] = None) -> List[dict]:
+        """Indexed postings of the same company at or above `threshold`, most similar first."""
+        import numpy as np
+        if signature is None:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        with self.lock:
+            candidates = set()
+            for buckets, key in zip(self.buckets, self._band_keys(company_id, signature)):
+                candidates.update(buckets.get(key, ()))
+            if not candidates:
+                return []
+            ordinals = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            stored = np.frombuffer(self.signatures, dtype=np.uint32).reshape(-1, self.num_perm)[ordinals]
+            similarity = (stored == signature).mean(axis=1)
+            matches = [
+                {"id": self.ids[ordinal], "similarity": round(float(score), 3)}
+                for ordinal, score in zip(ordinals.tolist(), similarity.tolist())
+                if score >= threshold and self.company_ids[ordinal] == company_id
+            ]
+        return sorted(matches, key=lambda match: -match["similarity"])
+
+    def find_duplicates(self, row: dict, threshold: Optional[float] = None) -> List[dict]:
+        return self.query(row.get("company_id") or 0, self.signature(row), threshold)
+
+    def snapshot(self):
+        # Buckets are cheap to rebuild from the signatures, so only those are stored
+        return {"ids": self.ids, "company_ids": self.company_ids, "signatures": self.signatures}
+
+    def restore(self, state):
+        import numpy as np
+        self._reset()
+        signatures = np.frombuffer(state["signatures"], dtype=np.uint32).reshape(-1, self.num_perm)
+        for jd_id, company_id, signature in zip(state["ids"], state["company_ids"], signatures):
+            self.insert(jd_id, company_id, None if signature[0] == 0xFFFFFFFF and (signature == 0xFFFFFFFF).all() else signature)
+
+    def stats(self):
+        with self.lock:
+            return {
+                **super().stats(),
+                "documents": len(self.ids),
+                "threshold": self.threshold,
+                "num_perm": self.num_perm,
+                "bands": self.bands,
+                "rows_per_band": self.rows,
+            }
+
+index = DedupIndex()
+if settings.jd_dedup_mode != "off":
+    jd_indexes.register(index)
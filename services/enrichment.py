@@ -0,0 +1,235 @@
+# services/enrichment.py
+"""
+Derived data for a job description: normalized text, word and sentence
+counts, Flesch reading scores, a salary range parsed from the free-text
+base_salary and canonical locations from work_locations. Pure functions
+with no app imports, so process pool workers can load this module cheaply.
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+# Bumped whenever the derived values change, so a backfill redoes older rows
+VERSION = 1
+
+TEXT_FIELDS = (
+    "title", "job_summary", "day_to_day_tasks", "performance_indicators", "decision_making",
+    "stakeholder_interactions", "required_qualifications", "preferred_qualifications",
+    "growth_opportunities", "training_development",
+)
+# Columns read to enrich one row
+FIELDS = ("id",) + TEXT_FIELDS + ("base_salary", "work_locations")
+
+PUNCTUATION = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"', "–": "-", "—": "-", " ": " "})
+BULLET = re.compile(r"^\s*(?:[*\-•●▪]|\d+[.)])\s+", re.MULTILINE)
+SPACES = re.compile(r"[^\S\n]+")
+BLANK_LINES = re.compile(r"\s*\n\s*")
+WORD = re.compile(r"[^\W_]+(?:['-][^\W_]+)*")
+# Sentence ends: terminal punctuation followed by whitespace, or a line break (list items)
+SENTENCE_END = re.compile(r"[.!?]+(?:\s+|$)|\n+")
+VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+def normalize_text(value: str) -> str:
+    """NFKC, ASCII quotes and dashes, no list bullets, single spaces and one line per item."""
+    text = unicodedata.normalize("NFKC", value).translate(PUNCTUATION)
+    text = BULLET.sub("", text)
+    text = SPACES.sub(" ", text)
+    return BLANK_LINES.sub("\n", text).strip()
+
+def syllables(word: str) -> int:
+    """Vowel-group estimate, close enough for readability formulas."""
+    word = word.lower()
+    if len(word) <= 3:
+        return 1
+    if word.endswith(("es", "ed")) and not word.endswith(("les", "ted", "ded")):
+        word = word[:-2]
+    elif word.endswith("e") and not word.endswith("le"):
+        word = word[:-1]
+    return max(len(VOWEL_GROUPS.findall(word)), 1)
+
+def readability(text: str) -> Dict[str, Optional[float]]:
+    """Word and sentence counts with Flesch reading ease and Flesch-Kincaid grade."""
+    words = WORD.findall(text)
+    if not words:
+        return {"word_count": 0, "sentence_count": 0, "reading_ease": None, "reading_grade": None}
+    sentences = max(sum(1 for part in SENTENCE_END.split(text) if WORD.search(part)), 1)
+    words_per_sentence = len(words) / sentences
+    syllables_per_word = sum(syllables(word) for word in words) / len(words)
+    return {
+        "word_count": len(words),
+        "sentence_count": sentences,
+        "reading_ease": round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 1),
+        "reading_grade": round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 1),
+    }
+
+CURRENCY_SYMBOLS = (
+    ("CA$", "CAD"), ("C$", "CAD"), ("AU$", "AUD"), ("A$", "AUD"), ("NZ$", "NZD"), ("S$", "SGD"),
+    ("US$", "USD"), ("$", "USD"), ("€", "EUR"), ("£", "GBP"), ("¥", "JPY"), ("₹", "INR"),
+)
+CURRENCY_CODE = re.compile(r"\b(USD|EUR|GBP|CAD|AUD|NZD|SGD|INR|JPY|CHF|SEK|NOK|DKK|PLN|BRL|MXN|ZAR|AED)\b", re.IGNORECASE)
+# 120,000 / 50.000 / 120 000 / 12,00,000 (lakh) / 95.5 / 120k / 1.2m; a trailing % (bonus share) is not an amount
+GROUPED = re.compile(r"\d{1,3}(?:[,.\s]\d{3})+|\d{1,2}(?:,\d{2})+,\d{3}")
+AMOUNT = re.compile(rf"(?<![\w.,])({GROUPED.pattern}|\d+(?:[.,]\d+)?)\s*([km])?(?![\w%])", re.IGNORECASE)
+RANGE_SEPARATOR = re.compile(r"^\s*(?:[-–—~]|to|and)\s*$", re.IGNORECASE)
+PERIODS = (
+    ("hour", re.compile(r"\b(?:hour|hourly|hr|hrs|ph)\b|/\s*h\b", re.IGNORECASE)),
+    ("day", re.compile(r"\b(?:day|daily|diem)\b", re.IGNORECASE)),
+    ("week", re.compile(r"\b(?:week|weekly|wk)\b", re.IGNORECASE)),
+    ("month", re.compile(r"\b(?:month|monthly|mo|pcm)\b", re.IGNORECASE)),
+    ("year", re.compile(r"\b(?:year|yearly|yr|annum|annual|annually|pa|p\.a)\b", re.IGNORECASE)),
+)
+UP_TO = re.compile(r"\b(?:up\s+to|max(?:imum)?|under)\b", re.IGNORECASE)
+AT_LEAST = re.compile(r"\b(?:from|min(?:imum)?|at\s+least|starting(?:\s+at)?)\b|\+", re.IGNORECASE)
+
+def _amount(digits: str, suffix: Optional[str]) -> float:
+    if GROUPED.fullmatch(digits):
+        value = float(re.sub(r"[,.\s]", "", digits))
+    else:
+        value = float(digits.replace(",", "."))
+    if suffix:
+        value *= 1000 if suffix.lower() == "k" else 1000000
+    return value
+
+def parse_salary(value: Optional[str]) -> Dict[str, Optional[object]]:
+    """
+    Salary range from free text such as "$120,000 - $150,000 per year",
+    "60-70k EUR", "up to 45/hr" or "USD 90K+". Without a stated period,
+    amounts of 10,000 or more are taken as yearly.
+    """
+    result = {"salary_min": None, "salary_max": None, "salary_currency": None, "salary_period": None}
+    if not value:
+        return result
+    text = unicodedata.normalize("NFKC", value)
+    matches = [match for match in AMOUNT.finditer(text) if _amount(*match.groups()) > 0]
+    if not matches:
+        return result
+    first = matches[0]
+    low = high = _amount(*first.groups())
+    if len(matches) > 1 and RANGE_SEPARATOR.match(text[first.end():matches[1].start()].strip(" $€£¥₹") or "-"):
+        second = matches[1]
+        high = _amount(*second.groups())
+        # "60-70k": the suffix on the upper bound applies to both
+        if first.group(2) is None and second.group(2) is not None and low < _amount(second.group(1), None) * 1.5:
+            low = _amount(first.group(1), second.group(2))
+        if low > high:
+            low, high = high, low
+    else:
+        before = text[:first.start()]
+        if UP_TO.search(before):
+            low = None
+        elif AT_LEAST.search(before) or text[first.end():].lstrip().startswith("+"):
+            high = None
+
+    code = CURRENCY_CODE.search(text)
+    if code:
+        result["salary_currency"] = code.group(1).upper()
+    else:
+        for symbol, currency in CURRENCY_SYMBOLS:
+            if symbol in text:
+                result["salary_currency"] = currency
+                break
+    for period, pattern in PERIODS:
+        if pattern.search(text):
+            result["salary_period"] = period
+            break
+    else:
+        if max(amount for amount in (low, high) if amount is not None) >= 10000:
+            result["salary_period"] = "year"
+    result["salary_min"] = round(low) if low is not None else None
+    result["salary_max"] = round(high) if high is not None else None
+    return result
+
+LOCATION_SEPARATORS = re.compile(r"[;|\n/•]+|\s+or\s+|\s+&\s+")
+PARENTHESES = re.compile(r"\s*\(([^)]*)\)\s*")
+LOCATION_ALIASES = {
+    "nyc": "New York, NY, US",
+    "new york city": "New York, NY, US",
+    "sf": "San Francisco, CA, US",
+    "san francisco bay area": "San Francisco Bay Area, CA, US",
+    "bay area": "San Francisco Bay Area, CA, US",
+    "la": "Los Angeles, CA, US",
+    "dc": "Washington, DC, US",
+    "washington dc": "Washington, DC, US",
+    "bangalore": "Bengaluru, India",
+    "bombay": "Mumbai, India",
+    "remote": "Remote",
+    "fully remote": "Remote",
+    "anywhere": "Remote",
+    "work from home": "Remote",
+    "wfh": "Remote",
+}
+COUNTRY_ALIASES = {
+    "usa": "US", "u.s.": "US", "u.s.a.": "US", "us": "US", "united states": "US", "united states of america": "US",
+    "uk": "UK", "u.k.": "UK", "united kingdom": "UK", "great britain": "UK", "england": "UK",
+    "uae": "United Arab Emirates", "deutschland": "Germany", "holland": "Netherlands", "the netherlands": "Netherlands",
+}
+# Work-model notes such as "Paris (Hybrid)" are not part of the location
+WORK_MODEL_NOTES = {"hybrid", "onsite", "on-site", "on site", "in office", "in-office", "office"}
+REMOTE = re.compile(r"^(?:remote|anywhere|work from home|wfh)\b\s*[-:,]?\s*", re.IGNORECASE)
+
+def _component(part: str) -> str:
+    country = COUNTRY_ALIASES.get(part.lower())
+    if country is not None:
+        return country
+    if len(part) == 2 and part.isalpha():
+        # State and country codes
+        return part.upper()
+    return part.title() if part.islower() or part.isupper() else part
+
+def canonical_location(value: str) -> Optional[str]:
+    """'remote (usa)' -> 'Remote, US', 'nyc' -> 'New York, NY, US', 'london, united kingdom' -> 'London, UK'."""
+    text = SPACES.sub(" ", normalize_text(value)).strip(" .,-")
+    if not text:
+        return None
+    qualifier = PARENTHESES.search(text)
+    note = None
+    if qualifier:
+        text = PARENTHESES.sub(" ", text).strip(" ,")
+        if qualifier.group(1).strip().lower() not in WORK_MODEL_NOTES:
+            note = canonical_location(qualifier.group(1))
+    if not text:
+        return note
+    alias = LOCATION_ALIASES.get(text.lower())
+    if alias is None and REMOTE.match(text):
+        # "Remote - US" / "Remote (EU)"
+        rest = REMOTE.sub("", text)
+        alias = "Remote" + (f", {canonical_location(rest)}" if rest else "")
+    if alias is not None:
+        text = alias
+    else:
+        parts = [_component(part.strip()) for part in text.split(",") if part.strip()]
+        alias = LOCATION_ALIASES.get(parts[0].lower())
+        if alias is not None:
+            # "Bangalore, India" -> "Bengaluru, India"
+            known = alias.split(", ")
+            parts = known + [part for part in parts[1:] if part not in known]
+        text = ", ".join(parts)
+    return f"{text}, {note}" if note else text
+
+def parse_locations(value: Optional[str]) -> Optional[str]:
+    """Distinct canonical locations in listed order, separated by "; "."""
+    if not value:
+        return None
+    locations: List[str] = []
+    for part in LOCATION_SEPARATORS.split(value):
+        location = canonical_location(part)
+        if location and location not in locations:
+            locations.append(location)
+    return "; ".join(locations) or None
+
+def enrich(row: dict) -> dict:
+    """Derived values for one job description row, keyed like the job_enrichments columns."""
+    parts = [normalize_text(row[field]) for field in TEXT_FIELDS if row.get(field)]
+    text = "\n".join(part for part in parts if part)
+    return {
+        "job_id": row["id"],
+        "version": VERSION,
+        "normalized_text": text or None,
+        **readability(text),
+        **parse_salary(row.get("base_salary")),
+        "locations": parse_locations(row.get("work_locations")),
+    }
+
+def enrich_chunk(rows: List[dict]) -> List[dict]:
+    """Process pool entry point: enrich() for each row of a chunk."""
+    return [enrich(row) for row in rows]
@@ -0,0 +1,244 @@
+# services/enrichment_worker.py
+"""
+Background enrichment of job descriptions (see services/enrichment.py).
+Inserts hand their new ids to the worker as a jd_indexes listener, so
+/jd/submit and /jd/bulk never wait for it. One task drains the queue in
+batches: it reads the rows, runs the CPU-bound enrichment in a process pool
+and writes the batch back with one upsert. Its reads and writes run at bulk
+priority, behind interactive traffic.
+
+Existing rows are covered by the backfill, which pages through every job
+description by id and saves its cursor to a state file after each page, so
+an interrupted run resumes where it stopped. A later run with the same
+state file also picks up rows the live worker dropped or failed since:
+
+    python -m services.enrichment_worker --state enrichment_state.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional
+
+from config.settings import settings
+from services import enrichment, hasura_service, jd_indexes, metrics, resilience
+from services.resilience import ServiceUnavailableError
+from services.state_file import read_state, write_state
+
+logger = logging.getLogger(__name__)
+
+# Attempts per write-back when admission control or the breaker sheds it
+WRITE_ATTEMPTS = 3
+
+class EnrichmentWorker:
+    """
+    Queue of inserted job description ids plus the task that enriches them.
+    Only ids are queued, so a large import costs a few bytes per row until
+    its batch comes up; ids beyond `queue_size` are dropped and counted.
+    """
+
+    def __init__(self, workers: int, batch_size: int, queue_size: int):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.counters = {"enriched": 0, "failed": 0, "dropped": 0, "batches": 0}
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pool = None
+
+    def _executor(self):
+        from concurrent.futures import ProcessPoolExecutor
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def enrich(self, rows: List[dict]) -> List[dict]:
+        """enrichment.enrich() for each row, split evenly across the worker processes."""
+        if not rows:
+            return []
+        if self.workers < 1:
+            return await asyncio.to_thread(enrichment.enrich_chunk, rows)
+        size = -(-len(rows) // self.workers)
+        loop = asyncio.get_running_loop()
+        try:
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(self._executor(), enrichment.enrich_chunk, rows[start:start + size])
+                for start in range(0, len(rows), size)
+            ))
+        except BrokenProcessPool:
+            logger.warning("Enrichment worker pool failed, enriching in-process")
+            self.close()
+            return await asyncio.to_thread(enrichment.enrich_chunk, rows)
+        return [item for chunk in chunks for item in chunk]
+
+    async def _write(self, results: List[dict]):
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                with resilience.priority(resilience.BULK):
+                    return await hasura_service.get_backend().upsert_enrichments(results)
+            except ServiceUnavailableError as e:
+                if attempt == WRITE_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(e.retry_after)
+
+    async def process(self, ids: List[int]) -> int:
+        """Read, enrich and write back one batch of job descriptions; returns the rows written."""
+        start = time.perf_counter()
+        with resilience.priority(resilience.BULK):
+            rows = await hasura_service.get_backend().jobs_by_ids(ids, enrichment.FIELDS)
+        written = len(rows)
+        if rows:
+            await self._write(await self.enrich(rows))
+        metrics.jd_enrichment_batch_duration.observe(("live",), time.perf_counter() - start)
+        return written
+
+    def submit(self, rows):
+        """jd_indexes listener: queue the ids of freshly inserted rows."""
+        if self.queue is None:
+            return
+        dropped = 0
+        for row in rows:
+            try:
+                self.queue.put_nowait(row["id"])
+            except asyncio.QueueFull:
+                dropped += 1
+        if dropped:
+            self.counters["dropped"] += dropped
+            metrics.jd_enrichments.inc(("live", "dropped"), dropped)
+            logger.warning("Enrichment queue is full; %d job descriptions are left for the backfill", dropped)
+        metrics.jd_enrichment_queue_depth.set((), self.queue.qsize())
+
+    async def _run(self):
+        while True:
+            ids = [await self.queue.get()]
+            while len(ids) < self.batch_size and not self.queue.empty():
+                ids.append(self.queue.get_nowait())
+            metrics.jd_enrichment_queue_depth.set((), self.queue.qsize())
+            try:
+                written = await self.process(ids)
+            except Exception as e:
+                self.counters["failed"] += len(ids)
+                self.last_error = str(e)
+                metrics.jd_enrichments.inc(("live", "failed"), len(ids))
+                logger.warning("Failed to enrich %d job descriptions: %s", len(ids), e)
+                continue
+            self.counters["batches"] += 1
+            self.counters["enriched"] += written
+            metrics.jd_enrichments.inc(("live", "enriched"), written)
+
+    def start(self):
+        """Start draining the queue and subscribe to inserts."""
+        if self._task is None or self._task.done():
+            self.queue = asyncio.Queue(self.queue_size)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            jd_indexes.add_listener(self.submit)
+
+    async def stop(self):
+        """Unsubscribe, cancel the task and shut the pool down; queued ids are left to the backfill."""
+        jd_indexes.remove_listener(self.submit)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+            if self.queue.qsize():
+                logger.warning("%d queued job descriptions were not enriched; run the enrichment backfill", self.queue.qsize())
+        self.close()
+
+    async def backfill(self, after: int = 0, page_size: Optional[int] = None, on_page: Optional[Callable[[dict], None]] = None) -> dict:
+        """
+        Enrich every job description with id > after, one keyset page at a
+        time. Writing a page back overlaps reading and enriching the next, so
+        at most two pages are held in memory. After each page is written,
+        `on_page` gets the progress; its `after` is the cursor to resume from.
+        """
+        page_size = page_size or settings.enrichment_backfill_page_size
+        progress = {"after": after, "enriched": 0, "rows_per_second": 0}
+        start = time.perf_counter()
+        writing = None
+
+        async def finish(task, last_id, count, began):
+            await task
+            progress["after"] = last_id
+            progress["enriched"] += count
+            progress["rows_per_second"] = round(progress["enriched"] / max(time.perf_counter() - start, 1e-9))
+            metrics.jd_enrichments.inc(("backfill", "enriched"), count)
+            metrics.jd_enrichment_batch_duration.observe(("backfill",), time.perf_counter() - began)
+            if on_page is not None:
+                on_page(dict(progress))
+
+        try:
+            async for page in hasura_service.iter_all_jobs(page_size, after, enrichment.FIELDS):
+                began = time.perf_counter()
+                results = await self.enrich(page)
+                if writing is not None:
+                    await finish(*writing)
+                    writing = None
+                writing = (asyncio.ensure_future(self._write(results)), page[-1]["id"], len(page), began)
+            if writing is not None:
+                await finish(*writing)
+                writing = None
+        finally:
+            if writing is not None:
+                writing[0].cancel()
+        return progress
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "queue_size": self.queue_size,
+            **self.counters,
+            "last_error": self.last_error,
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+worker = EnrichmentWorker(settings.enrichment_workers, settings.enrichment_batch_size, settings.enrichment_queue_size)
+
+async def run_backfill(state_path: str, page_size: Optional[int] = None, restart: bool = False) -> dict:
+    """Resume the backfill from the cursor in `state_path`, saving it after every page."""
+    state = {} if restart else read_state(state_path)
+    if state and state.get("version") != enrichment.VERSION:
+        logger.info("Enrichment version changed from %s to %s, starting over", state.get("version"), enrichment.VERSION)
+        state = {}
+    after, before = state.get("after", 0), state.get("enriched", 0)
+
+    def checkpoint(progress):
+        write_state(state_path, {"version": enrichment.VERSION, "after": progress["after"], "enriched": before + progress["enriched"]})
+        print(
+            f"Enriched {before + progress['enriched']} job descriptions up to id {progress['after']}"
+            f" ({progress['rows_per_second']} rows/s)",
+            file=sys.stderr,
+        )
+
+    await hasura_service.open_storage()
+    try:
+        progress = await worker.backfill(after, page_size, checkpoint)
+    finally:
+        worker.close()
+        await hasura_service.close_storage()
+    return {"version": enrichment.VERSION, "resumed_after": after, **progress, "total_enriched": before + progress["enriched"]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--state", default="enrichment_state.json", help="JSON file holding the backfill cursor, read and updated after every page")
+    parser.add_argument("--page-size", type=int, default=None)
+    parser.add_argument("--restart", action="store_true", help="ignore the saved cursor and enrich every row again")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(asyncio.run(run_backfill(args.state, args.page_size, args.restart)), indent=2))
+
+if __name__ == "__main__":
+    # python -m services.enrichment_worker
+    main()
@@ -0,0 +1,172 @@
+# services/export.py
+"""
+Streaming exports of company profiles and job descriptions as JSONL, CSV or
+Parquet. Rows are read one keyset page at a time through the storage
+backend and encoded as they arrive, so memory stays flat however large the
+table is: one page for JSONL and CSV, one row group for Parquet.
+
+Every row carries its updated_at. Passing the largest one seen as `since`
+on the next run exports only rows written since then (at least once: rows
+stamped exactly at the watermark are exported again).
+"""
+import asyncio
+import csv
+import io
+from typing import AsyncIterator, Dict, Optional, Sequence
+
+import orjson
+
+from config.settings import settings
+from services import hasura_service, resilience
+from services.schemas import CompanyProfileModel, JobDescriptionModel
+
+# Export name -> (table, model)
+ENTITIES = {
+    "companies": ("company_profiles", CompanyProfileModel),
+    "jobs": ("job_descriptions", JobDescriptionModel),
+}
+
+MEDIA_TYPES = {
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+def export_fields(entity: str, fields: Optional[Sequence[str]] = None) -> tuple:
+    """
+    Normalize a requested field list to model order, with id first and
+    updated_at last; both are always included.
+    """
+    if entity not in ENTITIES:
+        raise ValueError(f"Unknown export: {entity}")
+    available = tuple(name for name in ENTITIES[entity][1].model_fields if name not in ("id", "updated_at"))
+    if fields:
+        unknown = set(fields) - set(available) - {"id", "updated_at"}
+        if unknown:
+            raise ValueError(f"Unknown {entity} fields: {', '.join(sorted(unknown))}")
+        available = tuple(name for name in available if name in fields)
+    return ("id",) + available + ("updated_at",)
+
+def check_format(export_format: str):
+    if export_format not in MEDIA_TYPES:
+        raise ValueError(f"Unknown export format: {export_format} (expected jsonl, csv or parquet)")
+    if export_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export requires the pyarrow package")
+
+async def iter_pages(entity: str, fields: Sequence[str], since: Optional[str] = None, page_size: Optional[int] = None):
+    """Yield keyset pages of an entity's rows ordered by id."""
+    table = ENTITIES[entity][0]
+    page_size = page_size or settings.export_page_size
+    backend = hasura_service.get_backend()
+    after = 0
+    while True:
+        with resilience.priority(resilience.BULK):
+            rows = await backend.export_page(table, after, page_size, fields, since)
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        after = rows[-1]["id"]
+
+def _arrow_schema(entity: str, fields: Sequence[str]):
+    import pyarrow as pa
+    model = ENTITIES[entity][1]
+    return pa.schema([
+        (name, pa.int64() if name != "updated_at" and "int" in str(model.model_fields[name].annotation) else pa.string())
+        for name in fields
+    ])
+
+class _Chunks:
+    """Write-only file object for ParquetWriter, drained after each row group."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+async def export_stream(
+    entity: str,
+    export_format: str,
+    fields: Optional[Sequence[str]] = None,
+    since: Optional[str] = None,
+    page_size: Optional[int] = None,
+    progress: Optional[Dict] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield the encoded export in chunks. `progress`, if given, is updated
+    with the row count and the largest updated_at seen (the watermark for
+    the next incremental export).
+    """
+    fields = export_fields(entity, fields)
+    check_format(export_format)
+    progress = progress if progress is not None else {}
+    progress.update(rows=0, watermark=since)
+
+    def observe(rows):
+        progress["rows"] += len(rows)
+        latest = max((row["updated_at"] for row in rows if row.get("updated_at")), default=None)
+        if latest is not None and (progress["watermark"] is None or latest > progress["watermark"]):
+            progress["watermark"] = latest
+
+    pages = iter_pages(entity, fields, since, page_size)
+    if export_format == "jsonl":
+        async for rows in pages:
+            observe(rows)
+            yield b"".join(orjson.dumps(row) + b"\n" for row in rows)
+    elif export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        async for rows in pages:
+            observe(rows)
+            writer.writerows([row.get(name) for name in fields] for row in rows)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if progress["rows"] == 0:
+            yield buffer.getvalue().encode("utf-8")
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = _arrow_schema(entity, fields)
+        sink = _Chunks()
+        writer = pq.ParquetWriter(sink, schema)
+        buffered = []
+
+        def write_group(rows):
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            return sink.drain()
+
+        async for rows in pages:
+            observe(rows)
+            buffered.extend(rows)
+            if len(buffered) >= settings.export_parquet_row_group_size:
+                # Encoding a row group is CPU-bound; keep it off the event loop
+                yield await asyncio.to_thread(write_group, buffered)
+                buffered = []
+        if buffered:
+            yield await asyncio.to_thread(write_group, buffered)
+        writer.close()
+        yield sink.drain()
@@ -0,0 +1,197 @@
+# services/facet_index.py
+import re
+import sys
+from typing import Dict, List, Optional
+
+from config.settings import settings
+from services import jd_indexes
+
+FACET_FIELDS = ("job_level", "department", "job_function", "work_model", "time_commitment", "shift_type", "visa_sponsorship")
+
+# Spellings folded into one category, after lowercasing and collapsing punctuation
+SYNONYMS = {
+    "job_level": {
+        "sr": "senior", "snr": "senior", "senior level": "senior",
+        "jr": "junior", "entry": "junior", "entry level": "junior", "graduate": "junior",
+        "mid": "mid-level", "mid level": "mid-level", "intermediate": "mid-level",
+        "principal engineer": "principal", "staff engineer": "staff",
+        "lead engineer": "lead", "team lead": "lead",
+    },
+    "work_model": {
+        "fully remote": "remote", "remote first": "remote", "wfh": "remote", "work from home": "remote", "distributed": "remote",
+        "on site": "onsite", "on-site": "onsite", "in office": "onsite", "in-office": "onsite", "office": "onsite",
+        "flexible": "hybrid", "remote hybrid": "hybrid",
+    },
+    "time_commitment": {
+        "full time": "full-time", "fulltime": "full-time", "ft": "full-time",
+        "part time": "part-time", "parttime": "part-time", "pt": "part-time",
+        "contractor": "contract", "freelance": "contract",
+    },
+    "shift_type": {
+        "day": "day shift", "days": "day shift", "night": "night shift", "nights": "night shift",
+        "rotating": "rotating shift", "rotational": "rotating shift",
+    },
+    "visa_sponsorship": {
+        "yes": "available", "true": "available", "sponsorship available": "available", "will sponsor": "available",
+        "no": "not available", "false": "not available", "none": "not available", "no sponsorship": "not available",
+    },
+    "department": {"eng": "engineering", "r&d": "engineering", "hr": "human resources", "people": "human resources"},
+    "job_function": {"swe": "software engineering", "software development": "software engineering"},
+}
+
+SEPARATORS = re.compile(r"\s*[,;/|]\s*")
+NOISE = re.compile(r"[^\w&+#-]+")
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:  # Python < 3.10
+    def popcount(value: int) -> int:
+        return bin(value).count("1")
+
+def normalize(field: str, value) -> List[str]:
+    """Interned categories for a raw field value; "Remote / Hybrid" yields two."""
+    if value is None:
+        return []
+    categories = []
+    synonyms = SYNONYMS.get(field, {})
+    for part in SEPARATORS.split(str(value).lower()):
+        part = NOISE.sub(" ", part).strip()
+        if part:
+            part = synonyms.get(part, part)
+            if part not in categories:
+                categories.append(sys.intern(part))
+    return categories
+
+class FacetIndex(jd_indexes.JDIndex):
+    """
+    One bitmap per (field, category), stored as a Python int with bit i set
+    when document ordinal i has that category. Filters are ANDs of ORs of
+    bitmaps and counts are popcounts, so a query touches each bitmap once
+    instead of every posting.
+    """
+    name = "facets"
+    fields = ("id",) + FACET_FIELDS
+    version = 1
+
+    def __init__(self):
+        super().__init__()
+        self.ids: List[int] = []
+        self.ordinals: Dict[int, int] = {}
+        self.bitmaps: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS}
+
+    def __contains__(self, jd_id):
+        return jd_id in self.ordinals
+
+    def __len__(self):
+        return len(self.ids)
+
+    def prepare(self, row: dict):
+        return [(field, normalize(field, row.get(field))) for field in FACET_FIELDS]
+
+    def merge(self, row: dict, prepared):
+        ordinal = len(self.ids)
+        self.ordinals[row["id"]] = ordinal
+        self.ids.append(row["id"])
+        bit = 1 << ordinal
+        for field, categories in prepared:
+            bitmaps = self.bitmaps[field]
+            for category in categories:
+                bitmaps[category] = bitmaps.get(category, 0) | bit
+
+    def add_many(self, rows, in_order: bool = False):
+        """
+        Bulk version of add(): collect ordinals per category and build each
+        page-relative bitmap once with NumPy, rather than rewriting a growing
+        int per row. Only shifting them into place happens under the lock.
+        """
+        import numpy as np
+        if len(rows) < 64:
+            return super().add_many(rows, in_order)
+        pending = [row for row in rows if row["id"] not in self]
+        ordinals: Dict[tuple, List[int]] = {}
+        for position, row in enumerate(pending):
+            for field, categories in self.prepare(row):
+                for category in categories:
+                    ordinals.setdefault((field, category), []).append(position)
+        page = {}
+        for key, members in ordinals.items():
+            bits = np.zeros(len(pending), dtype=bool)
+            bits[members] = True
+            page[key] = int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+        with self.lock:
+            if any(row["id"] in self for row in pending):
+                # A live insert raced with this page; fall back to adding row by row
+                return super().add_many(rows, in_order)
+            start = len(self.ids)
+            for position, row in enumerate(pending):
+                self.ordinals[row["id"]] = start + position
+                self.ids.append(row["id"])
+            for (field, category), value in page.items():
+                bitmaps = self.bitmaps[field]
+                bitmaps[category] = bitmaps.get(category, 0) | (value << start)
+            if rows and in_order:
+                self.max_id = max(self.max_id, max(row["id"] for row in rows))
+
+    def _match(self, filters: Dict[str, List[str]], skip: Optional[str] = None) -> int:
+        mask = (1 << len(self.ids)) - 1
+        for field, values in filters.items():
+            if field == skip:
+                continue
+            bitmaps = self.bitmaps[field]
+            selected = 0
+            for value in values:
+                for category in normalize(field, value):
+                    selected |= bitmaps.get(category, 0)
+            mask &= selected
+        return mask
+
+    def _ids(self, mask: int, limit: int) -> List[int]:
+        """The ids of the `limit` most recently indexed documents in a mask."""
+        import numpy as np
+        if not mask or limit <= 0:
+            return []
+        raw = np.frombuffer(mask.to_bytes((mask.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+        ordinals = np.flatnonzero(np.unpackbits(raw, bitorder="little"))[::-1][:limit]
+        return [self.ids[ordinal] for ordinal in ordinals.tolist()]
+
+    def query(self, filters: Dict[str, List[str]], facets=FACET_FIELDS, limit: int = 0) -> dict:
+        """
+        Count matches for `filters` (values OR'd within a field, fields AND'd)
+        and per-category counts for each field in `facets`. A field's own
+        filter is left out of its counts, so the counts show how many
+        results each alternative would have.
+        """
+        with self.lock:
+            mask = self._match(filters)
+            counts = {}
+            for field in facets:
+                field_mask = self._match(filters, skip=field) if field in filters else mask
+                counts[field] = {
+                    category: count
+                    for category, count in sorted(
+                        ((category, popcount(field_mask & bitmap)) for category, bitmap in self.bitmaps[field].items()),
+                        key=lambda item: (-item[1], item[0]),
+                    )
+                    if count
+                }
+            return {"total": popcount(mask), "counts": counts, "ids": self._ids(mask, limit)}
+
+    def snapshot(self):
+        return {"ids": self.ids, "bitmaps": self.bitmaps}
+
+    def restore(self, state):
+        self.ids = state["ids"]
+        self.bitmaps = state["bitmaps"]
+        self.ordinals = {jd_id: ordinal for ordinal, jd_id in enumerate(self.ids)}
+
+    def stats(self):
+        with self.lock:
+            return {
+                **super().stats(),
+                "documents": len(self.ids),
+                "categories": {field: len(bitmaps) for field, bitmaps in self.bitmaps.items()},
+            }
+
+index = FacetIndex()
+if settings.jd_facets_enabled:
+    jd_indexes.register(index)
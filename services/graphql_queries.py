@@ -0,0 +1,263 @@
+# services/graphql_queries.py
+import functools
+import hashlib
+import json
+import sys
+from typing import Dict, NamedTuple
+
+class GraphQLDocument(NamedTuple):
+    name: str
+    query: str
+    sha256: str
+
+# All documents are built once at import so Hasura sees a fixed set of query texts
+_registry: Dict[str, GraphQLDocument] = {}
+
+# Projection documents are built per distinct field list and kept in bounded
+# LRU caches instead of the registry, so arbitrary `fields=` values cannot
+# grow memory without limit
+PROJECTION_CACHE_SIZE = 256
+
+def build(name: str, query: str) -> GraphQLDocument:
+    """Build a named operation, normalizing whitespace so the hash is stable."""
+    text = " ".join(query.split())
+    return GraphQLDocument(name, text, hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+def register_document(document: GraphQLDocument) -> GraphQLDocument:
+    """Add a built document to the registry so it is part of the allow-list."""
+    _registry[document.name] = document
+    return document
+
+def register(name: str, query: str) -> GraphQLDocument:
+    """Build and register a named operation."""
+    return register_document(build(name, query))
+
+def get(name: str) -> GraphQLDocument:
+    return _registry[name]
+
+def all_documents():
+    return list(_registry.values())
+
+def allowlist_metadata(collection: str = "athena_queries"):
+    """
+    Hasura metadata API payload that registers every document in a query
+    collection and adds it to the allow-list.
+    """
+    return {
+        "type": "bulk",
+        "args": [
+            {
+                "type": "create_query_collection",
+                "args": {
+                    "name": collection,
+                    "definition": {
+                        "queries": [{"name": doc.name, "query": doc.query} for doc in all_documents()]
+                    }
+                }
+            },
+            {
+                "type": "add_collection_to_allowlist",
+                "args": {"collection": collection}
+            }
+        ]
+    }
+
+# One round trip: on a unique_user_id conflict nothing is written and null is returned
+INSERT_COMPANY_PROFILE = register("InsertCompanyProfile", """
+mutation InsertCompanyProfile($object: company_profiles_insert_input!) {
+  insert_company_profiles_one(
+    object: $object,
+    on_conflict: {constraint: unique_user_id, update_columns: []}
+  ) {
+    id
+    user_id
+    name
+    updated_at
+  }
+}
+""")
+
+UPDATE_COMPANY_PROFILE = register("UpdateCompanyProfile", """
+mutation UpdateCompanyProfile($id: Int!, $set_fields: company_profiles_set_input!) {
+  update_company_profiles_by_pk(pk_columns: {id: $id}, _set: $set_fields) {
+    id
+    user_id
+    name
+    updated_at
+  }
+}
+""")
+
+# Optimistic concurrency: writes only if updated_at still matches, so zero rows means
+# the profile changed since the client read it (or no longer exists)
+UPDATE_COMPANY_PROFILE_IF_UNMODIFIED = register("UpdateCompanyProfileIfUnmodified", """
+mutation UpdateCompanyProfileIfUnmodified($id: Int!, $updated_at: timestamptz!, $set_fields: company_profiles_set_input!) {
+  update_company_profiles(where: {id: {_eq: $id}, updated_at: {_eq: $updated_at}}, _set: $set_fields) {
+    returning {
+      id
+      user_id
+      name
+      updated_at
+    }
+  }
+}
+""")
+
+GET_COMPANY_BY_USER_ID = register("GetCompanyByUserId", """
+query GetCompanyByUserId($user_id: String!) {
+  company_profiles(where: {user_id: {_eq: $user_id}}) {
+    id
+    user_id
+    name
+    updated_at
+  }
+}
+""")
+
+INSERT_JOB_DESCRIPTION = register("InsertJobDescription", """
+mutation InsertJobDescription($object: job_descriptions_insert_input!) {
+  insert_job_descriptions(objects: [$object]) {
+    returning {
+      id
+      company_id
+      title
+    }
+  }
+}
+""")
+
+INSERT_JOB_DESCRIPTIONS = register("InsertJobDescriptions", """
+mutation InsertJobDescriptions($objects: [job_descriptions_insert_input!]!) {
+  insert_job_descriptions(objects: $objects) {
+    affected_rows
+    returning {
+      id
+    }
+  }
+}
+""")
+
+# Derived data from the enrichment worker; one upsert per batch, replacing earlier versions
+UPSERT_JOB_ENRICHMENTS = register("UpsertJobEnrichments", """
+mutation UpsertJobEnrichments($objects: [job_enrichments_insert_input!]!) {
+  insert_job_enrichments(
+    objects: $objects,
+    on_conflict: {
+      constraint: job_enrichments_pkey,
+      update_columns: [version, normalized_text, word_count, sentence_count, reading_ease, reading_grade,
+                       salary_min, salary_max, salary_currency, salary_period, locations, enriched_at]
+    }
+  ) {
+    affected_rows
+  }
+}
+""")
+
+GET_JOB_ENRICHMENTS = register("GetJobEnrichments", """
+query GetJobEnrichments($ids: [Int!]!) {
+  job_enrichments(where: {job_id: {_in: $ids}}) {
+    job_id version normalized_text word_count sentence_count reading_ease reading_grade
+    salary_min salary_max salary_currency salary_period locations enriched_at
+  }
+}
+""")
+
+def company_jobs_page(fields) -> GraphQLDocument:
+    """
+    Keyset-paginated job list selecting only `fields`. Documents are cached
+    per projection, not registered; only the full projection is allow-listed.
+    """
+    return _company_jobs_page(tuple(fields))
+
+@functools.lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def _company_jobs_page(fields) -> GraphQLDocument:
+    name = "GetCompanyJobsPage_" + hashlib.sha256(" ".join(fields).encode("utf-8")).hexdigest()[:12]
+    return build(name, f"""
+query {name}($company_id: Int!, $after: Int!, $limit: Int!) {{
+  job_descriptions(
+    where: {{company_id: {{_eq: $company_id}}, id: {{_gt: $after}}}},
+    order_by: {{id: asc}},
+    limit: $limit
+  ) {{
+    {" ".join(fields)}
+  }}
+}}
+""")
+
+def all_jobs_page(fields) -> GraphQLDocument:
+    """Keyset page over every job description, used to bulk-load in-process indexes."""
+    return _all_jobs_page(tuple(fields))
+
+@functools.lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def _all_jobs_page(fields) -> GraphQLDocument:
+    name = "GetAllJobsPage_" + hashlib.sha256(" ".join(fields).encode("utf-8")).hexdigest()[:12]
+    return build(name, f"""
+query {name}($after: Int!, $limit: Int!) {{
+  job_descriptions(where: {{id: {{_gt: $after}}}}, order_by: {{id: asc}}, limit: $limit) {{
+    {" ".join(fields)}
+  }}
+}}
+""")
+
+def export_page(table: str, fields, since: bool) -> GraphQLDocument:
+    """Keyset page over a whole table for exports, optionally from an updated_at watermark."""
+    return _export_page(table, tuple(fields), since)
+
+@functools.lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def _export_page(table: str, fields, since: bool) -> GraphQLDocument:
+    prefix = {"company_profiles": "ExportCompaniesPage_", "job_descriptions": "ExportJobsPage_"}[table]
+    name = prefix + hashlib.sha256(" ".join(fields + (str(since),)).encode("utf-8")).hexdigest()[:12]
+    where = "{id: {_gt: $after}, updated_at: {_gte: $since}}" if since else "{id: {_gt: $after}}"
+    return build(name, f"""
+query {name}($after: Int!, $limit: Int!{", $since: timestamptz!" if since else ""}) {{
+  {table}(where: {where}, order_by: {{id: asc}}, limit: $limit) {{
+    {" ".join(fields)}
+  }}
+}}
+""")
+
+def jobs_by_ids(fields) -> GraphQLDocument:
+    """Job descriptions by primary key, used to hydrate ids returned by in-process indexes."""
+    return _jobs_by_ids(tuple(fields))
+
+@functools.lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def _jobs_by_ids(fields) -> GraphQLDocument:
+    name = "GetJobsByIds_" + hashlib.sha256(" ".join(fields).encode("utf-8")).hexdigest()[:12]
+    return build(name, f"""
+query {name}($ids: [Int!]!) {{
+  job_descriptions(where: {{id: {{_in: $ids}}}}) {{
+    {" ".join(fields)}
+  }}
+}}
+""")
+
+def dashboard(fields) -> GraphQLDocument:
+    """
+    A user's company and one keyset page of its jobs in a single query, via
+    the company_profiles.job_descriptions array relationship.
+    """
+    return _dashboard(tuple(fields))
+
+@functools.lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def _dashboard(fields) -> GraphQLDocument:
+    name = "GetDashboard_" + hashlib.sha256(" ".join(fields).encode("utf-8")).hexdigest()[:12]
+    return build(name, f"""
+query {name}($user_id: String!, $after: Int!, $limit: Int!) {{
+  company_profiles(where: {{user_id: {{_eq: $user_id}}}}) {{
+    id
+    user_id
+    name
+    updated_at
+    job_descriptions(where: {{id: {{_gt: $after}}}}, order_by: {{id: asc}}, limit: $limit) {{
+      {" ".join(fields)}
+    }}
+  }}
+}}
+""")
+
+if __name__ == "__main__":
+    # python -m services.graphql_queries > allowlist.json
+    # Import through the package so documents registered by the service are included
+    from services import hasura_service
+    json.dump(hasura_service.graphql_queries.allowlist_metadata(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
@@ -1,293 +1,582 @@
 # services/hasura_service.py
-import requests
+import asyncio
+import importlib.util
+import time
+import orjson
 from config.settings import settings
-from pydantic import BaseModel
-from typing import Optional
+from services import cache, graphql_queries, jd_indexes, metrics, resilience, storage
+from services.resilience import ServiceUnavailableError
+from services.microbatch import MicroBatcher
+from services.singleflight import SingleFlight
+from services.graphql_queries import GraphQLDocument
+from services.schemas import CompanyProfileModel, JobDescriptionModel
+from typing import TYPE_CHECKING, Optional
 
-class CompanyProfileModel(BaseModel):
-    id: Optional[int] = None
-    user_id: str
-    
-    # Company Identity
-    name: str
-    overview: Optional[str] = None
-    industry: Optional[str] = None
-    year_founded: Optional[int] = None
-    headquarters_location: Optional[str] = None
-    global_presence: Optional[str] = None
-    company_size: Optional[str] = None
-    ownership_type: Optional[str] = None
-    company_type: Optional[str] = None
-    products_services: Optional[str] = None
-    specialties: Optional[str] = None
-    growth_stage: Optional[str] = None
-    key_markets: Optional[str] = None
-    
-    # Leadership & Team
-    founders: Optional[str] = None
-    leadership_team: Optional[str] = None
-    board_members: Optional[str] = None
-    team_composition: Optional[str] = None
-    
-    # Culture & Brand
-    work_culture: Optional[str] = None
-    dei_statement: Optional[str] = None
-    sustainability_initiatives: Optional[str] = None
-    awards: Optional[str] = None
-    milestones: Optional[str] = None
-    media_mentions: Optional[str] = None
-    success_stories: Optional[str] = None
-    unique_differentiators: Optional[str] = None
-    brand_voice: Optional[str] = None
-    employer_brand_sentiment: Optional[str] = None
-    
-    # Hiring & Operations
-    hiring_volumes: Optional[str] = None
-    company_languages: Optional[str] = None
-    workplace_model: Optional[str] = None
-    hiring_regions: Optional[str] = None
-    
-    # Web Presence & Links
-    logo_url: Optional[str] = None
-    website_url: Optional[str] = None
-    careers_page_url: Optional[str] = None
-    social_media_links: Optional[str] = None
-    employer_review_links: Optional[str] = None
-
-class JobDescriptionModel(BaseModel):
-    id: Optional[int] = None
-    company_id: int
-    
-    # Basic Job Info
-    title: str
-    job_code: Optional[str] = None
-    job_level: Optional[str] = None
-    department: Optional[str] = None
-    job_function: Optional[str] = None
-    
-    # Job Posting Metadata
-    contract_duration: Optional[str] = None
-    time_commitment: Optional[str] = None
-    
-    # Detailed Role Description
-    job_summary: Optional[str] = None
-    day_to_day_tasks: Optional[str] = None
-    performance_indicators: Optional[str] = None
-    decision_making: Optional[str] = None
-    stakeholder_interactions: Optional[str] = None
-    
-    # Requirements Breakdown
-    required_qualifications: Optional[str] = None
-    preferred_qualifications: Optional[str] = None
-    mandatory_certifications: Optional[str] = None
-    legal_eligibility: Optional[str] = None
-    background_checks: Optional[str] = None
-    clearance_level: Optional[str] = None
-    
-    # Skills Classification
-    hard_skills: Optional[str] = None
-    soft_skills: Optional[str] = None
-    domain_expertise: Optional[str] = None
-    methodologies: Optional[str] = None
-    languages: Optional[str] = None
-    skills_priority: Optional[str] = None
-    
-    # Compensation Details
-    base_salary: Optional[str] = None
-    bonus_structure: Optional[str] = None
-    equity_options: Optional[str] = None
-    benefits: Optional[str] = None
-    relocation_assistance: Optional[str] = None
-    visa_sponsorship: Optional[str] = None
-    
-    # Work Environment
-    work_model: Optional[str] = None
-    work_locations: Optional[str] = None
-    travel_requirements: Optional[str] = None
-    shift_type: Optional[str] = None
-    
-    # Career Path Info
-    growth_opportunities: Optional[str] = None
-    training_development: Optional[str] = None
-    mentorship: Optional[str] = None
-    succession_planning: Optional[str] = None
-    culture_page_link: Optional[str] = None
-    careers_page_link: Optional[str] = None
-
-def execute_graphql(query: str, variables: dict = None):
-    headers = {
-        "Content-Type": "application/json",
-        "x-hasura-admin-secret": settings.hasura_admin_secret
-    }
-    
-    # Add better error handling
-    try:
-        response = requests.post(
-            settings.hasura_graphql_endpoint,
-            json={"query": query, "variables": variables},
-            headers=headers,
-            timeout=10  # Add timeout
+if TYPE_CHECKING:
+    import httpx
+
+# Shared keep-alive client, created lazily and closed by the app lifespan.
+# httpx itself is imported on first use to keep cold starts fast.
+_client: Optional["httpx.AsyncClient"] = None
+
+# Concurrent identical reads (same document and variables) share one upstream call
+read_coalescer = SingleFlight()
+
+# Consecutive Hasura failures open the breaker; recent latencies time hedged reads
+breaker = resilience.CircuitBreaker("Hasura", settings.hasura_breaker_failures, settings.hasura_breaker_reset)
+latencies = resilience.LatencyTracker()
+
+# Bound concurrent Hasura calls so a traffic spike queues here instead of overloading Hasura
+read_limiter = resilience.ConcurrencyLimiter("hasura_reads", settings.hasura_read_concurrency, settings.admission_max_queue, settings.admission_queue_timeout)
+write_limiter = resilience.ConcurrencyLimiter("hasura_writes", settings.hasura_write_concurrency, settings.admission_max_queue, settings.admission_queue_timeout)
+
+# Read-through cache for company lookups, keyed by user id and company id
+company_cache = cache.create_backend(settings.company_cache_backend, settings.company_cache_max_entries)
+
+JOB_FIELDS = ("id",) + tuple(name for name in JobDescriptionModel.model_fields if name != "id")
+
+# Register the full-projection list query up front so it is part of the allow-list
+graphql_queries.register_document(graphql_queries.company_jobs_page(JOB_FIELDS))
+
+def get_client() -> "httpx.AsyncClient":
+    """Return the shared Hasura client, creating it on first use."""
+    import httpx
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            # HTTP/2 multiplexes requests over one connection when h2 is installed
+            http2=settings.hasura_http2 and importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=settings.hasura_max_connections,
+                max_keepalive_connections=settings.hasura_max_keepalive_connections,
+                keepalive_expiry=settings.hasura_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.hasura_timeout, connect=settings.hasura_connect_timeout),
+            headers={
+                "Content-Type": "application/json",
+                "x-hasura-admin-secret": settings.hasura_admin_secret
+            },
         )
+    return _client
+
+async def open_client():
+    get_client()
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+class _AttemptFailed(Exception):
+    """A retryable failure; `delivered` is False when Hasura cannot have processed the request."""
+
+    def __init__(self, message: str, delivered: bool = True):
+        super().__init__(message)
+        self.delivered = delivered
+
+class _Answered(Exception):
+    """Hasura responded, but with a 4xx or a body that is not JSON; not retried, and Hasura counts as up."""
+
+async def _attempt(body: bytes, operation, timeout: float):
+    import httpx
+    start = time.perf_counter()
+    try:
+        response = await asyncio.wait_for(get_client().post(settings.hasura_graphql_endpoint, content=body), timeout)
+    except asyncio.TimeoutError:
+        metrics.hasura_errors.inc((operation[0], "timeout"))
+        raise _AttemptFailed(f"no response within {timeout:.2f}s")
+    except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+        metrics.hasura_errors.inc((operation[0], "connect"))
+        raise _AttemptFailed(f"{type(e).__name__}: {e}", delivered=False)
+    except httpx.HTTPError as e:
+        metrics.hasura_errors.inc((operation[0], "http"))
+        raise _AttemptFailed(f"{type(e).__name__}: {e}")
+    finally:
+        metrics.hasura_duration.observe(operation, time.perf_counter() - start)
+    if response.status_code == 429 or response.status_code >= 500:
+        metrics.hasura_errors.inc((operation[0], "status"))
+        # A 429 is rejected before any work is done, so even a mutation can be resent
+        raise _AttemptFailed(f"HTTP {response.status_code}", delivered=response.status_code != 429)
+    try:
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Hasura GraphQL request failed: {str(e)}")
+        result = orjson.loads(response.content)
+    except httpx.HTTPError as e:
+        metrics.hasura_errors.inc((operation[0], "http"))
+        raise _Answered(f"Hasura GraphQL request failed: {str(e)}")
     except ValueError as e:
-        raise Exception(f"Invalid JSON response from Hasura: {str(e)}")
-    except Exception as e:
-        raise Exception(f"Error executing GraphQL query: {str(e)}")
-
-def insert_company_profile(profile):
-    # Build the dynamic fields for the query
-    fields = []
-    variables = {}
-    
-    # Process all fields from the profile model
-    for key, value in profile.dict().items():
-        if key != "id" and value is not None:  # Skip id and None values
-            fields.append(f"{key}: ${key}")
-            variables[key] = value
-    
-    # Build the GraphQL mutation
-    query = f"""
-    mutation ({', '.join(f"${key}: {get_gql_type(key, value)}" for key, value in variables.items())}) {{
-      insert_company_profiles(objects: {{{', '.join(fields)}}}) {{
-        returning {{
-          id
-          user_id
-          name
-          # Include other fields as needed
-        }}
-      }}
-    }}
+        metrics.hasura_errors.inc((operation[0], "invalid_json"))
+        raise _Answered(f"Invalid JSON response from Hasura: {str(e)}")
+    latencies.observe(operation[0], time.perf_counter() - start)
+    if isinstance(result, dict) and result.get("errors"):
+        metrics.hasura_errors.inc((operation[0], "graphql"))
+    return result
+
+async def _hedged(body: bytes, operation, timeout: float):
     """
-    
-    result = execute_graphql(query, variables)
-    try:
-        data = result["data"]["insert_company_profiles"]["returning"][0]
-        return CompanyProfileModel(**data)
-    except (KeyError, IndexError) as e:
-        raise Exception("Error parsing response from Hasura") from e
-
-def update_company_profile(profile):
-    # Extract the id for pk_columns
-    profile_id = profile.id
-    
-    # Build the dynamic fields for _set
-    set_fields = {}
-    
-    # Process all fields from the profile model
-    for key, value in profile.dict().items():
-        if key != "id" and value is not None:  # Skip id and None values
-            set_fields[key] = value
-    
-    # Build the GraphQL mutation
-    query = """
-    mutation ($id: Int!, $set_fields: company_profiles_set_input!) {
-      update_company_profiles_by_pk(
-        pk_columns: {id: $id}, 
-        _set: $set_fields
-      ) {
-        id
-        user_id
-        name
-        # Include other fields as needed
-      }
-    }
+    Send a read and, if it is still outstanding after the operation's recent
+    p95 latency, a duplicate; the first successful response wins.
     """
-    
-    variables = {
-        "id": profile_id,
-        "set_fields": set_fields
-    }
-    
-    result = execute_graphql(query, variables)
+    delay = latencies.p95(operation[0])
+    if delay is None or breaker.state != breaker.CLOSED:
+        return await _attempt(body, operation, timeout)
+    delay = max(delay, settings.hasura_hedge_min_delay)
+    if delay >= timeout:
+        return await _attempt(body, operation, timeout)
+    tasks = [asyncio.ensure_future(_attempt(body, operation, timeout))]
     try:
-        data = result["data"]["update_company_profiles_by_pk"]
-        return CompanyProfileModel(**data)
-    except (KeyError, IndexError) as e:
-        raise Exception("Error parsing response from Hasura") from e
-
-def get_company_by_user_id(user_id: str):
-    query = """
-    query ($user_id: String!) {
-      company_profiles(where: {user_id: {_eq: $user_id}}) {
-        id
-        user_id
-        name
-        # Include other fields you want to retrieve
-      }
-    }
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return tasks[0].result()
+        metrics.hasura_hedges.inc((operation[0],))
+        tasks.append(asyncio.ensure_future(_attempt(body, operation, timeout - delay)))
+        pending, error = set(tasks), None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+async def _post(payload: dict, query_text: str):
+    """
+    Send one GraphQL request within its operation's deadline. Transport
+    errors, timeouts and 5xx/429 responses are retried with jittered backoff:
+    always for reads, and for mutations only when Hasura never received them
+    (or with HASURA_RETRY_MUTATIONS, which can apply a mutation twice).
+    Raises ServiceUnavailableError when
+    the circuit breaker is open or the attempts run out, and when the
+    admission limiter sheds the call.
+    """
+    operation = metrics.graphql_operation(query_text)
+    read = operation[1] == "query"
+    if read:
+        limiter, level = read_limiter, resilience.current_priority(resilience.INTERACTIVE)
+    else:
+        limiter, level = write_limiter, resilience.current_priority(resilience.WRITE)
+    # The slot is held across retries, so retry storms count against the limit too
+    async with limiter.slot(level):
+        return await _post_admitted(payload, operation, read)
+
+async def _post_admitted(payload: dict, operation, read: bool):
+    budget = settings.hasura_read_deadline if read else settings.hasura_write_deadline
+    deadline = time.monotonic() + budget
+    body = orjson.dumps(payload)
+    attempt = 0
+    while True:
+        try:
+            probe = breaker.check()
+        except ServiceUnavailableError:
+            metrics.hasura_errors.inc((operation[0], "circuit_open"))
+            raise
+        remaining = deadline - time.monotonic()
+        # Every attempt settles the breaker, so a half-open probe can never be left outstanding
+        failure, succeeded = None, None
+        try:
+            if read and settings.hasura_hedge_reads:
+                result = await _hedged(body, operation, remaining)
+            else:
+                result = await _attempt(body, operation, remaining)
+            succeeded = True
+        except _Answered:
+            # Any response that arrives means Hasura is up, even if this request was rejected
+            succeeded = True
+            raise
+        except _AttemptFailed as e:
+            failure, succeeded = e, False
+        except Exception:
+            succeeded = False
+            raise
+        finally:
+            if succeeded:
+                breaker.record_success()
+            elif succeeded is False:
+                breaker.record_failure()
+            elif probe:
+                # Cancelled before an outcome: let the next call probe instead
+                breaker.release()
+        if succeeded:
+            return result
+        delay = resilience.backoff(attempt, settings.hasura_retry_backoff, settings.hasura_retry_backoff_max)
+        retryable = read or not failure.delivered or settings.hasura_retry_mutations
+        if not retryable or attempt >= settings.hasura_retries or time.monotonic() + delay >= deadline:
+            raise ServiceUnavailableError(
+                f"Hasura GraphQL request failed after {attempt + 1} attempt(s): {failure}",
+                breaker.reset_timeout if breaker.state == breaker.OPEN else 1,
+            ) from failure
+        attempt += 1
+        metrics.hasura_retries.inc((operation[0],))
+        await asyncio.sleep(delay)
+
+async def execute_graphql(query, variables: dict = None):
+    """
+    Execute a registered GraphQLDocument (or a raw query string). Concurrent
+    identical queries are coalesced into one request.
     """
-    variables = {
-        "user_id": user_id
-    }
-    result = execute_graphql(query, variables)
+    start = time.perf_counter()
     try:
-        companies = result["data"]["company_profiles"]
+        if not isinstance(query, GraphQLDocument):
+            return await _post({"query": query, "variables": variables}, query)
+        
+        if settings.hasura_coalesce_reads and query.query.startswith("query"):
+            # Waiters share the result object, so callers must not mutate it
+            key = (query.sha256, orjson.dumps(variables, option=orjson.OPT_SORT_KEYS))
+            try:
+                return await read_coalescer.do(key, lambda: _send(query, variables), settings.hasura_coalesce_timeout)
+            except asyncio.TimeoutError:
+                # Same 503 + Retry-After as a direct call that runs past its deadline
+                raise ServiceUnavailableError(
+                    f"Hasura GraphQL request timed out after {settings.hasura_coalesce_timeout}s",
+                    breaker.reset_timeout if breaker.state == breaker.OPEN else 1,
+                )
+        return await _send(query, variables)
+    finally:
+        # Time this caller waited, including on a coalesced request
+        metrics.add_timing("hasura", time.perf_counter() - start)
+
+async def _send(query: GraphQLDocument, variables: dict):
+    return await _post({"operationName": query.name, "query": query.query, "variables": variables}, query.query)
+
+def _user_key(user_id: str) -> str:
+    return f"company:user:{user_id}"
+
+def _id_key(company_id: int) -> str:
+    return f"company:id:{company_id}"
+
+async def _cache_company(company):
+    await company_cache.set(_user_key(company.user_id), company, settings.company_cache_ttl)
+    await company_cache.set(_id_key(company.id), company, settings.company_cache_ttl)
+
+async def invalidate_company(company_id: Optional[int] = None, user_id: Optional[str] = None):
+    keys = []
+    if company_id is not None:
+        cached = await company_cache.get(_id_key(company_id))
+        if cached is not cache.MISS and cached is not None:
+            keys.append(_user_key(cached.user_id))
+        keys.append(_id_key(company_id))
+    if user_id is not None:
+        keys.append(_user_key(user_id))
+    await company_cache.delete(*keys)
+
+class HasuraBackend(storage.StorageBackend):
+    """The Hasura GraphQL API, using the registered documents in services.graphql_queries."""
+    name = "hasura"
+
+    async def open(self):
+        await open_client()
+
+    async def close(self):
+        await close_client()
+
+    async def insert_company(self, values):
+        result = await execute_graphql(graphql_queries.INSERT_COMPANY_PROFILE, {"object": values})
+        try:
+            return result["data"]["insert_company_profiles_one"]
+        except (KeyError, TypeError) as e:
+            raise Exception(f"Error parsing response from Hasura: {result.get('errors')}") from e
+
+    async def update_company(self, company_id, values, updated_at=None):
+        if values:
+            # No trigger maintains updated_at, so every write sets it
+            values = {**values, "updated_at": "now()"}
+        if updated_at is None:
+            result = await execute_graphql(graphql_queries.UPDATE_COMPANY_PROFILE, {"id": company_id, "set_fields": values})
+        else:
+            result = await execute_graphql(
+                graphql_queries.UPDATE_COMPANY_PROFILE_IF_UNMODIFIED,
+                {"id": company_id, "updated_at": updated_at, "set_fields": values},
+            )
+        try:
+            if updated_at is None:
+                return result["data"]["update_company_profiles_by_pk"]
+            rows = result["data"]["update_company_profiles"]["returning"]
+            return rows[0] if rows else None
+        except (KeyError, IndexError, TypeError) as e:
+            raise Exception(f"Error parsing response from Hasura: {result.get('errors')}") from e
+
+    async def get_company_by_user_id(self, user_id):
+        result = await execute_graphql(graphql_queries.GET_COMPANY_BY_USER_ID, {"user_id": user_id})
+        try:
+            companies = result["data"]["company_profiles"]
+        except (KeyError, IndexError) as e:
+            raise Exception("Error parsing response from Hasura") from e
+        return companies[0] if companies else None
+
+    async def insert_job(self, values):
+        result = await execute_graphql(graphql_queries.INSERT_JOB_DESCRIPTION, {"object": values})
+        try:
+            return result["data"]["insert_job_descriptions"]["returning"][0]
+        except (KeyError, IndexError) as e:
+            raise Exception("Error parsing response from Hasura") from e
+
+    async def insert_jobs(self, rows):
+        result = await execute_graphql(graphql_queries.INSERT_JOB_DESCRIPTIONS, {"objects": rows})
+        try:
+            return [row["id"] for row in result["data"]["insert_job_descriptions"]["returning"]]
+        except (KeyError, IndexError, TypeError) as e:
+            raise Exception(f"Error parsing response from Hasura: {result.get('errors')}") from e
+
+    async def _jobs(self, document, variables):
+        result = await execute_graphql(document, variables)
+        try:
+            return result["data"]["job_descriptions"]
+        except (KeyError, TypeError) as e:
+            raise Exception(f"Error parsing response from Hasura: {result.get('errors')}") from e
+
+    async def company_jobs(self, company_id, after, limit, fields):
+        variables = {
+            "company_id": company_id,
+            "after": after,
+            "limit": limit
+        }
+        return await self._jobs(graphql_queries.company_jobs_page(fields), variables)
+
+    async def all_jobs(self, after, limit, fields):
+        return await self._jobs(graphql_queries.all_jobs_page(fields), {"after": after, "limit": limit})
+
+    async def export_page(self, table, after, limit, fields, since=None):
+        variables = {"after": after, "limit": limit}
+        if since is not None:
+            variables["since"] = since
+        result = await execute_graphql(graphql_queries.export_page(table, fields, since is not None), variables)
+        try:
+            return result["data"][table]
+        except (KeyError, TypeError) as e:
+            raise Exception(f"Error parsing response from Hasura: {result.get('errors')}") from e
+
+    async def jobs_by_ids(self, ids, fields):
+        return await self._jobs(graphql_queries.jobs_by_ids(fields), {"ids": list(ids)})
+
+    async def upsert_enrichments(self, rows):
+        if not rows:
+            return 0
+        objects = [{**row, "enriched_at": "now()"} for row in rows]
+        result = await execute_graphql(graphql_queries.UPSERT_JOB_ENRICHMENTS, {"objects": objects})
+        try:
+            return result["data"]["insert_job_enrichments"]["affected_rows"]
+        except (KeyError, TypeError) as e:
+            raise Exception(f"Error parsing response from Hasura: {result.get('errors')}") from e
+
+    async def enrichments_by_job_ids(self, ids):
+        result = await execute_graphql(graphql_queries.GET_JOB_ENRICHMENTS, {"ids": list(ids)})
+        try:
+            return result["data"]["job_enrichments"]
+        except (KeyError, TypeError) as e:
+            raise Exception(f"Error parsing response from Hasura: {result.get('errors')}") from e
+
+    async def dashboard(self, user_id, after, limit, fields):
+        variables = {
+            "user_id": user_id,
+            "after": after,
+            "limit": limit
+        }
+        result = await execute_graphql(graphql_queries.dashboard(fields), variables)
+        try:
+            companies = result["data"]["company_profiles"]
+        except (KeyError, TypeError) as e:
+            raise Exception(f"Error parsing response from Hasura: {result.get('errors')}") from e
         if not companies:
-            return None
-        return CompanyProfileModel(**companies[0])
-    except (KeyError, IndexError) as e:
-        raise Exception("Error parsing response from Hasura") from e
-
-def insert_job_description(jd):
-    # Build the dynamic fields for the query
-    fields = []
-    variables = {}
-    
-    # Process all fields from the jd model
-    for key, value in jd.dict().items():
-        if key != "id" and value is not None:  # Skip id and None values
-            fields.append(f"{key}: ${key}")
-            variables[key] = value
-    
-    # Build the GraphQL mutation
-    query = f"""
-    mutation ({', '.join(f"${key}: {get_gql_type(key, value)}" for key, value in variables.items())}) {{
-      insert_job_descriptions(objects: {{{', '.join(fields)}}}) {{
-        returning {{
-          id
-          company_id
-          title
-          # Include other fields as needed
-        }}
-      }}
-    }}
+            return None, []
+        row = dict(companies[0])
+        return row, row.pop("job_descriptions")
+
+_backend: Optional[storage.StorageBackend] = None
+
+def get_backend() -> storage.StorageBackend:
+    """Return the STORAGE_BACKEND implementation, creating it on first use."""
+    global _backend
+    if _backend is None:
+        _backend = storage.create_backend(settings.storage_backend)
+    return _backend
+
+async def open_storage():
+    await get_backend().open()
+
+async def close_storage():
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+async def insert_company_profile(profile):
+    """Insert a profile, or return None if the user already has one."""
+    data = await get_backend().insert_company(profile.model_dump(exclude={"id"}, exclude_none=True))
+    if data is None:
+        # The user already has a company (unique_user_id conflict)
+        return None
+    # Payloads were validated once at the route; stored rows are trusted as-is
+    company = CompanyProfileModel.model_construct(**data)
+    # Drops any negative "no company" entry cached for this user
+    await invalidate_company(company.id, company.user_id)
+    return company
+
+async def update_company_profile(profile):
+    # Only non-None fields are written
+    try:
+        data = await get_backend().update_company(profile.id, profile.model_dump(exclude={"id"}, exclude_none=True))
+    finally:
+        # Invalidate even on failure, the write may still have been applied
+        await invalidate_company(profile.id, profile.user_id)
+    try:
+        company = CompanyProfileModel.model_construct(**data)
+    except TypeError as e:
+        raise Exception(f"Company profile {profile.id} not found") from e
+    # The id entry may have been evicted before the user entry
+    await invalidate_company(user_id=company.user_id)
+    return company
+
+async def patch_company_profile(company_id: int, values: dict, updated_at: Optional[str] = None):
+    """
+    Write only `values` to a profile. With `updated_at` (the version from an
+    If-Match ETag) nothing is written unless the profile is unchanged since.
+    Returns None if the profile does not exist or has changed.
     """
-    
-    result = execute_graphql(query, variables)
     try:
-        data = result["data"]["insert_job_descriptions"]["returning"][0]
-        return JobDescriptionModel(**data)
-    except (KeyError, IndexError) as e:
-        raise Exception("Error parsing response from Hasura") from e
-
-def get_company_jobs(company_id: int):
-    query = """
-    query ($company_id: Int!) {
-      job_descriptions(where: {company_id: {_eq: $company_id}}) {
-        id
-        company_id
-        title
-        # Include other fields you want to retrieve
-      }
-    }
+        data = await get_backend().update_company(company_id, values, updated_at)
+    finally:
+        await invalidate_company(company_id, values.get("user_id"))
+    if data is None:
+        return None
+    company = CompanyProfileModel.model_construct(**data)
+    await invalidate_company(user_id=company.user_id)
+    return company
+
+async def get_company_by_user_id(user_id: str):
+    cached = await company_cache.get(_user_key(user_id))
+    if cached is not cache.MISS:
+        return cached
+    
+    data = await get_backend().get_company_by_user_id(user_id)
+    if data is None:
+        await company_cache.set(_user_key(user_id), None, settings.company_cache_negative_ttl)
+        return None
+    company = CompanyProfileModel.model_construct(**data)
+    await _cache_company(company)
+    return company
+
+async def _insert_job_batch(rows):
+    """
+    Flush for submit_batcher: one multi-row insert for the whole batch. The
+    insert is atomic, so if it fails each row is retried on its own and only
+    the callers whose rows are bad get an error.
     """
-    variables = {
-        "company_id": company_id
-    }
-    result = execute_graphql(query, variables)
+    metrics.jd_submit_batch_size.observe((), len(rows))
     try:
-        jobs = result["data"]["job_descriptions"]
-        return [JobDescriptionModel(**job) for job in jobs]
-    except (KeyError, IndexError) as e:
-        raise Exception("Error parsing response from Hasura") from e
-
-# Helper function to determine GraphQL type from Python type
-def get_gql_type(key, value):
-    if key == "company_id" or key == "id" or key == "year_founded":
-        return "Int!"
-    if isinstance(value, bool):
-        return "Boolean!"
-    return "String!"
+        ids = await get_backend().insert_jobs(rows)
+    except ServiceUnavailableError:
+        raise
+    except Exception:
+        if len(rows) == 1:
+            raise
+        ids = []
+        for row in rows:
+            try:
+                ids.extend(await get_backend().insert_jobs([row]))
+            except ServiceUnavailableError:
+                raise
+            except Exception as e:
+                ids.append(e)
+    inserted = [{**row, "id": new_id} for row, new_id in zip(rows, ids) if not isinstance(new_id, Exception)]
+    await jd_indexes.notify_inserted(inserted)
+    return [
+        new_id if isinstance(new_id, Exception) else {"id": new_id, "company_id": row["company_id"], "title": row["title"]}
+        for row, new_id in zip(rows, ids)
+    ]
+
+# Opt-in (JD_SUBMIT_BATCHING): concurrent single submissions share one insert
+submit_batcher = MicroBatcher(
+    _insert_job_batch,
+    settings.jd_submit_batch_window_ms / 1000,
+    settings.jd_submit_batch_max_size,
+    settings.jd_submit_queue_depth,
+    settings.jd_submit_queue_timeout,
+)
+
+async def insert_job_description(jd):
+    values = jd.model_dump(exclude={"id"}, exclude_none=True)
+    if settings.jd_submit_batching:
+        data = await submit_batcher.submit(values)
+        return JobDescriptionModel.model_construct(**data)
+    data = await get_backend().insert_job(values)
+    await jd_indexes.notify_inserted([{**values, "id": data["id"]}])
+    return JobDescriptionModel.model_construct(**data)
+
+async def insert_job_descriptions(jds):
+    """Insert many job descriptions in one atomic write and return their new ids in input order."""
+    rows = [jd.model_dump(exclude={"id"}, exclude_none=True) for jd in jds]
+    ids = await get_backend().insert_jobs(rows)
+    await jd_indexes.notify_inserted([{**row, "id": new_id} for row, new_id in zip(rows, ids)])
+    return ids
+
+async def get_dashboard(user_id: str, limit: int, after: int = 0, fields=None):
+    """
+    Fetch a user's company and one keyset page of its jobs in one query.
+    Returns (company or None, jobs, next_cursor).
+    """
+    row, jobs = await get_backend().dashboard(user_id, after, limit, job_projection(fields))
+    if row is None:
+        await company_cache.set(_user_key(user_id), None, settings.company_cache_negative_ttl)
+        return None, [], None
+    company = CompanyProfileModel.model_construct(**row)
+    await _cache_company(company)
+    return company, jobs, jobs[-1]["id"] if len(jobs) == limit else None
+
+def job_projection(fields=None):
+    """
+    Normalize a requested field list to JobDescriptionModel order. The id is
+    always selected because it is the pagination cursor.
+    """
+    if not fields:
+        return JOB_FIELDS
+    unknown = set(fields) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown job description fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in JOB_FIELDS if name == "id" or name in fields)
+
+async def get_company_jobs(company_id: int, limit: int, after: int = 0, fields=None):
+    """
+    Fetch one keyset page of a company's jobs ordered by id. Returns the rows
+    and the cursor for the next page (None on the last page).
+    """
+    jobs = await get_backend().company_jobs(company_id, after, limit, job_projection(fields))
+    next_cursor = jobs[-1]["id"] if len(jobs) == limit else None
+    return jobs, next_cursor
+
+async def iter_company_jobs(company_id: int, page_size: int, after: int = 0, fields=None):
+    """Yield pages of a company's jobs as each page arrives."""
+    while True:
+        jobs, after = await get_company_jobs(company_id, page_size, after, fields)
+        if jobs:
+            yield jobs
+        if after is None:
+            return
+
+async def iter_all_jobs(page_size: int, after: int = 0, fields=None):
+    """Yield keyset pages of every job description (across companies) ordered by id."""
+    fields = job_projection(fields)
+    while True:
+        # Index loads queue behind interactive reads for Hasura admission slots
+        with resilience.priority(resilience.BULK):
+            jobs = await get_backend().all_jobs(after, page_size, fields)
+        if jobs:
+            yield jobs
+        if len(jobs) < page_size:
+            return
+        after = jobs[-1]["id"]
+
+async def get_jobs_by_ids(ids, fields=None):
+    """Fetch job descriptions by id, returned in the order of `ids` (missing ids are skipped)."""
+    if not ids:
+        return []
+    rows = {row["id"]: row for row in await get_backend().jobs_by_ids(list(ids), job_projection(fields))}
+    return [rows[jd_id] for jd_id in ids if jd_id in rows]
+
+async def get_job_enrichment(jd_id: int) -> Optional[dict]:
+    """A job description's derived data, or None until the enrichment worker has written it."""
+    rows = await get_backend().enrichments_by_job_ids([jd_id])
+    return rows[0] if rows else None
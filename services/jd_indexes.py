@@ -0,0 +1,234 @@
+# services/jd_indexes.py
+"""
+In-process job description indexes. Each index is restored from its
+on-disk snapshot when one exists, caught up by paging through Hasura from
+the last id it has seen, and kept current by notify_inserted() after every
+successful insert in this process plus a periodic catch-up for the rest.
+"""
+import asyncio
+import logging
+import os
+import pickle
+import threading
+from typing import Callable, List, Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class JDIndex:
+    """
+    Base class for an index over job description rows. Subclasses declare
+    the columns they need in `fields` and implement merge(), __contains__()
+    and, to support persistence, snapshot()/restore(). Per-row work that
+    reads no index state (tokenizing, hashing) belongs in prepare(), which
+    add_many() runs before taking the lock, so queries only wait for merges.
+    """
+    name = "index"
+    fields = ("id",)
+    version = 1
+
+    def __init__(self):
+        # Bulk loads run in a worker thread while queries run on the event loop
+        self.lock = threading.RLock()
+        # Highest id loaded in order; bootstrap resumes from here after a restart
+        self.max_id = 0
+        self.ready = False
+
+    def prepare(self, row: dict):
+        """What merge() needs for a row, computed without the lock."""
+        return None
+
+    def merge(self, row: dict, prepared):
+        """Add a row given its prepare() result; called with the lock held."""
+        raise NotImplementedError
+
+    def add(self, row: dict):
+        self.merge(row, self.prepare(row))
+
+    def __contains__(self, jd_id: int) -> bool:
+        raise NotImplementedError
+
+    def add_many(self, rows, in_order: bool = False):
+        prepared = [(row, self.prepare(row)) for row in rows if row["id"] not in self]
+        with self.lock:
+            for row, item in prepared:
+                # A live insert may have added the row since it was prepared
+                if row["id"] not in self:
+                    self.merge(row, item)
+            # Live inserts can race with other instances, so only ordered pages advance the cursor
+            if rows and in_order:
+                self.max_id = max(self.max_id, max(row["id"] for row in rows))
+
+    def refresh(self):
+        """Pick up state other workers have saved; called after each periodic catch-up."""
+
+    def snapshot(self):
+        return None
+
+    def restore(self, state):
+        pass
+
+    def stats(self) -> dict:
+        return {"ready": self.ready, "max_id": self.max_id}
+
+    def close(self):
+        """Release worker processes or other resources; called on shutdown."""
+
+    @property
+    def path(self) -> Optional[str]:
+        if not settings.jd_index_dir:
+            return None
+        return os.path.join(settings.jd_index_dir, f"{self.name}.pickle")
+
+    def save(self):
+        path = self.path
+        if path is None:
+            return
+        with self.lock:
+            state = self.snapshot()
+            if state is None:
+                return
+            payload = {"version": self.version, "max_id": self.max_id, "state": state}
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so a crash never leaves a truncated snapshot
+            with open(path + ".tmp", "wb") as handle:
+                pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    def load(self) -> bool:
+        path = self.path
+        if path is None or not os.path.exists(path):
+            return False
+        with open(path, "rb") as handle:
+            payload = pickle.load(handle)
+        if payload.get("version") != self.version:
+            logger.info("Ignoring %s snapshot with version %s", self.name, payload.get("version"))
+            return False
+        with self.lock:
+            self.restore(payload["state"])
+            self.max_id = payload["max_id"]
+        return True
+
+_indexes: List[JDIndex] = []
+# Callables given each batch of inserted rows after the indexes, e.g. the enrichment worker
+_listeners: List[Callable[[list], None]] = []
+_bootstrap_task: Optional[asyncio.Task] = None
+
+def register(index: JDIndex) -> JDIndex:
+    _indexes.append(index)
+    return index
+
+def indexes() -> List[JDIndex]:
+    return list(_indexes)
+
+def add_listener(listener: Callable[[list], None]):
+    _listeners.append(listener)
+
+def remove_listener(listener: Callable[[list], None]):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+def _index_inserted(rows):
+    for index in _indexes:
+        try:
+            index.add_many(rows)
+        except Exception:
+            logger.exception("Failed to index job descriptions in %s", index.name)
+
+async def notify_inserted(rows):
+    """
+    Feed freshly inserted rows (input fields plus the new id) to every index
+    and listener. Indexing runs in a worker thread so the event loop never
+    waits on an index lock; listeners run on the loop.
+    """
+    if _indexes and rows:
+        await asyncio.to_thread(_index_inserted, rows)
+    for listener in _listeners:
+        try:
+            listener(rows)
+        except Exception:
+            logger.exception("Insert listener %r failed", listener)
+
+async def bootstrap(page_size: int = None, targets: Optional[List[JDIndex]] = None):
+    """Restore snapshots, then page through Hasura from the lowest max_id to catch up."""
+    targets = _indexes if targets is None else targets
+    if not targets:
+        return
+    page_size = page_size or settings.jd_index_page_size
+    for index in targets:
+        try:
+            await asyncio.to_thread(index.load)
+        except Exception:
+            logger.exception("Failed to load %s snapshot, rebuilding", index.name)
+
+    await catch_up(page_size, targets)
+    for index in targets:
+        index.ready = True
+    await persist(targets)
+
+async def catch_up(page_size: int = None, targets: Optional[List[JDIndex]] = None):
+    """Page through Hasura from the lowest max_id, adding rows each index has not seen."""
+    from services import hasura_service
+
+    targets = _indexes if targets is None else targets
+    page_size = page_size or settings.jd_index_page_size
+    fields = sorted({field for index in targets for field in index.fields})
+    after = min(index.max_id for index in targets)
+    async for page in hasura_service.iter_all_jobs(page_size, after, fields):
+        for index in targets:
+            rows = [row for row in page if row["id"] > index.max_id]
+            # CPU-heavy indexing runs off the event loop
+            await asyncio.to_thread(index.add_many, rows, True)
+
+async def _run():
+    """
+    bootstrap(), then catch up every JD_INDEX_REFRESH_INTERVAL seconds.
+    Inserts only reach the indexes of the worker that made them, so this is
+    how rows inserted through other workers or instances get indexed.
+    """
+    await bootstrap()
+    interval = settings.jd_index_refresh_interval
+    while interval > 0:
+        await asyncio.sleep(interval)
+        try:
+            await catch_up()
+            for index in _indexes:
+                await asyncio.to_thread(index.refresh)
+        except Exception:
+            logger.exception("JD index catch-up failed, retrying in %s seconds", interval)
+
+def _log_failure(task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("JD index bootstrap failed", exc_info=task.exception())
+
+def start():
+    """Run bootstrap() and the periodic catch-up in the background; queries are served from partial indexes meanwhile."""
+    global _bootstrap_task
+    if _indexes and (_bootstrap_task is None or _bootstrap_task.done()):
+        _bootstrap_task = asyncio.get_running_loop().create_task(_run())
+        _bootstrap_task.add_done_callback(_log_failure)
+
+async def stop():
+    """Cancel a running bootstrap or catch-up and snapshot what has been indexed so far."""
+    global _bootstrap_task
+    if _bootstrap_task is not None:
+        _bootstrap_task.cancel()
+        try:
+            await _bootstrap_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _bootstrap_task = None
+    await persist()
+    for index in _indexes:
+        index.close()
+
+async def persist(targets: Optional[List[JDIndex]] = None):
+    for index in _indexes if targets is None else targets:
+        try:
+            await asyncio.to_thread(index.save)
+        except Exception:
+            logger.exception("Failed to save %s snapshot", index.name)
+
+def stats() -> dict:
+    return {index.name: index.stats() for index in _indexes}
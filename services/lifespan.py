@@ -0,0 +1,22 @@
+# services/lifespan.py
+from contextlib import asynccontextmanager
+from config.settings import settings
+from services import enrichment_worker, hasura_service, jd_indexes, warmup
+from services.token_verifier import verifier
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Open shared upstream clients on startup and close them on shutdown. With
+    lazy startup (the default on Vercel) warming is deferred until after the
+    first response by WarmupMiddleware.
+    """
+    if not settings.lazy_startup:
+        await warmup.warm()
+    try:
+        yield
+    finally:
+        await verifier.key_store.stop()
+        await enrichment_worker.worker.stop()
+        await jd_indexes.stop()
+        await hasura_service.close_storage()
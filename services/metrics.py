@@ -0,0 +1,205 @@
+# services/metrics.py
+"""
+Prometheus metrics and per-request Server-Timing, without a client library.
+Metric updates are plain dict/list operations on the event loop thread, so
+they add well under a microsecond per observation (see
+benchmarks/bench_metrics_overhead.py).
+"""
+import bisect
+import contextvars
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import settings
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, labels: Tuple = (), amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        return self.header() + [f"{self.name}{_labels(self.labelnames, labels)} {value}" for labels, value in self.values.items()]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, labels: Tuple = (), value: float = 0):
+        self.values[labels] = value
+
+    def dec(self, labels: Tuple = (), amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self.values: Dict[Tuple, list] = {}
+
+    def observe(self, labels: Tuple, value: float):
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+_registry: List[Metric] = []
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+http_requests = Counter("http_requests_total", "HTTP requests by route, method and status.", ("route", "method", "status"))
+http_duration = Histogram("http_request_duration_seconds", "Time to the response start by route and method.", ("route", "method"))
+http_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+http_errors = Counter("http_request_errors_total", "Requests that ended in a 5xx or an unhandled exception.", ("route", "method"))
+hasura_duration = Histogram("hasura_request_duration_seconds", "Hasura round trips by root field.", ("operation", "type"))
+hasura_errors = Counter("hasura_errors_total", "Failed Hasura round trips by root field and failure kind.", ("operation", "kind"))
+hasura_retries = Counter("hasura_retries_total", "Hasura requests resent after a retryable failure.", ("operation",))
+hasura_hedges = Counter("hasura_hedged_requests_total", "Duplicate Hasura reads sent after the first exceeded its p95.", ("operation",))
+upstream_in_flight = Gauge("upstream_in_flight", "Calls in flight per upstream admission limiter.", ("upstream",))
+upstream_queue_depth = Gauge("upstream_queue_depth", "Calls waiting for an upstream admission slot.", ("upstream",))
+upstream_rejections = Counter("upstream_rejections_total", "Calls shed with 503 by an upstream admission limiter.", ("upstream", "reason"))
+db_duration = Histogram("db_query_duration_seconds", "Direct SQL storage queries by operation.", ("operation",))
+db_errors = Counter("db_errors_total", "Failed direct SQL storage queries by operation.", ("operation",))
+firebase_duration = Histogram("firebase_verify_duration_seconds", "Firebase ID token verification by outcome.", ("result",))
+jd_enrichments = Counter("jd_enrichments_total", "Job descriptions processed by the enrichment worker by source and result.", ("source", "result"))
+jd_enrichment_queue_depth = Gauge("jd_enrichment_queue_depth", "Inserted job descriptions waiting for enrichment.")
+jd_enrichment_batch_duration = Histogram("jd_enrichment_batch_duration_seconds", "Read, enrich and write-back time per enrichment batch.", ("source",))
+jd_submit_batch_size = Histogram("jd_submit_batch_size", "Job descriptions written per coalesced /jd/submit insert.", (), BATCH_BUCKETS)
+
+# Upstream time spent by the current request, keyed by Server-Timing metric name
+_timings: contextvars.ContextVar[Optional[Dict[str, list]]] = contextvars.ContextVar("upstream_timings", default=None)
+
+def add_timing(name: str, seconds: float):
+    """Charge upstream time to the current request's Server-Timing header."""
+    timings = _timings.get()
+    if timings is not None:
+        entry = timings.get(name)
+        if entry is None:
+            timings[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+OPERATION = re.compile(r"^\s*(query|mutation|subscription)?\b[^{]*\{\s*(\w+)")
+_operations: Dict[str, Tuple[str, str]] = {}
+
+def graphql_operation(query: str) -> Tuple[str, str]:
+    """(root field, operation type) of a GraphQL document, cached per text."""
+    operation = _operations.get(query)
+    if operation is None:
+        match = OPERATION.match(query)
+        operation = (match.group(2), match.group(1) or "query") if match else ("unknown", "unknown")
+        if len(_operations) < 1000:
+            _operations[query] = operation
+    return operation
+
+def _route_label(scope) -> str:
+    """
+    The matched route's path template, including any router prefix (newer
+    FastAPI versions give included routes a path relative to their router).
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    path = scope["path"]
+    try:
+        suffix = route.path_format.format(**scope.get("path_params", {}))
+    except (AttributeError, KeyError, IndexError, ValueError):
+        return route.path
+    return path[:len(path) - len(suffix)] + route.path if path.endswith(suffix) else route.path
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording route metrics and adding a Server-Timing
+    header that splits app time from the upstream time charged by
+    add_timing(). Routes are labelled by their path template so ids do not
+    create new series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings: Dict[str, list] = {}
+        token = _timings.set(timings)
+        status = [500]
+        method = scope["method"]
+        http_in_flight.inc()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                elapsed = time.perf_counter() - start
+                http_duration.observe((_route_label(scope), method), elapsed)
+                if settings.server_timing_enabled:
+                    # Concurrent upstream calls can overlap, so app time is floored at zero
+                    upstream = sum(entry[0] for entry in timings.values())
+                    parts = [f"app;dur={max(elapsed - upstream, 0) * 1000:.1f}"]
+                    parts.extend(f'{name};dur={total * 1000:.1f};desc="{count} call{"s" if count != 1 else ""}"'
+                                 for name, (total, count) in timings.items())
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", ", ".join(parts).encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            http_in_flight.dec()
+            _timings.reset(token)
+            labels = (_route_label(scope), method)
+            http_requests.inc(labels + (str(status[0]),))
+            if status[0] >= 500:
+                http_errors.inc(labels)
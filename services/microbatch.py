@@ -0,0 +1,90 @@
+# services/microbatch.py
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from services.resilience import ServiceUnavailableError
+
+class MicroBatcher:
+    """
+    Collects concurrent submit() calls for up to `window` seconds, or until
+    `max_batch` items are waiting, and hands them to `flush` as one list.
+    `flush` returns one result per item in order; an exception in that list
+    is raised to that item's caller only, while an exception raised by
+    `flush` itself goes to every caller in the batch.
+
+    At most `max_queue` items may be waiting or in flight. Further callers
+    wait up to `queue_timeout` seconds for room and then get a
+    ServiceUnavailableError, so a stalled upstream pushes back on clients
+    instead of growing the queue.
+    """
+
+    def __init__(self, flush: Callable[[List[Any]], Awaitable[List[Any]]], window: float, max_batch: int, max_queue: int, queue_timeout: float):
+        self.flush = flush
+        self.window = window
+        self.max_batch = max(max_batch, 1)
+        self.max_queue = max(max_queue, self.max_batch)
+        self.queue_timeout = queue_timeout
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_queue = 0
+        self.items = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.rejected = 0
+
+    async def submit(self, item: Any) -> Any:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_queue)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServiceUnavailableError("Write queue is full", 1)
+        self._in_queue += 1
+        try:
+            future = asyncio.get_running_loop().create_future()
+            self._pending.append((item, future))
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.window, self._dispatch)
+            return await future
+        finally:
+            self._in_queue -= 1
+            self._slots.release()
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            results = await self.flush([item for item, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            # A caller that gave up (cancelled) no longer has a future to resolve
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "average_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "in_queue": self._in_queue,
+            "rejected": self.rejected,
+        }
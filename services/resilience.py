@@ -0,0 +1,251 @@
+# services/resilience.py
+"""
+Building blocks for bounding upstream tail latency: a circuit breaker,
+jittered exponential backoff, a rolling latency estimate used to decide
+when to hedge a read, and per-upstream admission control.
+"""
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import math
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from services import metrics
+
+# Admission priorities, lowest first: user-facing reads and writes go ahead of bulk work
+INTERACTIVE, WRITE, BULK = 0, 1, 2
+
+_priority: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("admission_priority", default=None)
+
+@contextlib.contextmanager
+def priority(level: int):
+    """Run the upstream calls made inside the block at `level`, e.g. BULK for imports and index loads."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def current_priority(default: int) -> int:
+    level = _priority.get()
+    return default if level is None else level
+
+class ServiceUnavailableError(Exception):
+    """An upstream is failing or too slow; answered with 503 and Retry-After."""
+
+    def __init__(self, message: str, retry_after: float = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+async def service_unavailable_handler(request, exc: ServiceUnavailableError):
+    from fastapi.responses import JSONResponse
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(math.ceil(exc.retry_after), 1))},
+    )
+
+def backoff(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class CircuitBreaker:
+    """
+    Closed until `failure_threshold` consecutive failures, then open: calls
+    fail fast for `reset_timeout` seconds instead of queueing on a sick
+    upstream. After that a single probe is let through (half-open); its
+    success closes the breaker and its failure opens it again. A probe that
+    ends without either (it was cancelled) must call release() so the next
+    call can probe instead.
+    """
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+        self.trips = 0
+
+    def check(self) -> bool:
+        """
+        Raise ServiceUnavailableError unless a call may go ahead now. Returns
+        True when the call is the half-open probe.
+        """
+        if self.state == self.CLOSED or self.failure_threshold <= 0:
+            return False
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        raise ServiceUnavailableError(f"{self.name} is unavailable", max(remaining, 1))
+
+    def record_success(self):
+        self.failures = 0
+        self.state = self.CLOSED
+        self._probing = False
+
+    def release(self):
+        """Give up the half-open probe without an outcome, so another call can probe."""
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (self.failure_threshold > 0 and self.failures >= self.failure_threshold):
+            if self.state != self.OPEN:
+                self.trips += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+    def stats(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures, "trips": self.trips, "rejected": self.rejected}
+
+class LatencyTracker:
+    """Rolling p95 of recent successful call latencies, per operation."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._p95: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+
+    def observe(self, operation: str, seconds: float):
+        samples = self._samples.get(operation)
+        if samples is None:
+            samples = self._samples[operation] = deque(maxlen=self.window)
+        samples.append(seconds)
+        count = self._counts[operation] = self._counts.get(operation, 0) + 1
+        # Re-sorting every 10th sample keeps the estimate fresh at a fraction of the cost
+        if len(samples) >= self.min_samples and count % 10 == 0:
+            ordered = sorted(samples)
+            self._p95[operation] = ordered[int(len(ordered) * 0.95) - 1]
+
+    def p95(self, operation: str) -> Optional[float]:
+        """None until enough samples have been seen."""
+        return self._p95.get(operation)
+
+    def stats(self) -> dict:
+        return {operation: round(p95, 4) for operation, p95 in sorted(self._p95.items())}
+
+class ConcurrencyLimiter:
+    """
+    At most `limit` calls in flight to one upstream (0 disables the limit).
+    Further callers wait in a priority queue of at most `max_queue` entries,
+    lowest level first and FIFO within a level. A caller is shed with
+    ServiceUnavailableError immediately when the queue is full, or when its
+    expected wait (callers ahead of it times the recent average call time,
+    divided by `limit`) already exceeds `queue_timeout`. Otherwise it is shed
+    once it has waited `queue_timeout`. BULK callers are never shed on the
+    deadline: they are background work that would only retry.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        # (level, sequence, future); entries whose future is done are stale and skipped
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._queued = 0
+        self._sequence = itertools.count()
+        self._average = 0.0
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "deadline": 0}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, level: int = INTERACTIVE):
+        if self.limit <= 0:
+            yield
+            return
+        await self._acquire(level)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            self._average = elapsed if not self._average else self._average * 0.9 + elapsed * 0.1
+            self._release()
+
+    def _reject(self, reason: str, retry_after: float):
+        self.rejected[reason] += 1
+        metrics.upstream_rejections.inc((self.name, reason))
+        raise ServiceUnavailableError(f"{self.name} is overloaded ({reason.replace('_', ' ')})", retry_after)
+
+    def _update_gauges(self):
+        metrics.upstream_in_flight.set((self.name,), self.in_flight)
+        metrics.upstream_queue_depth.set((self.name,), self._queued)
+
+    async def _acquire(self, level: int):
+        if self.in_flight < self.limit and not self._queued:
+            self.in_flight += 1
+            self.admitted += 1
+            self._update_gauges()
+            return
+        if self._queued >= self.max_queue:
+            self._reject("queue_full", max(self._average, 1))
+        timeout = None if level >= BULK else self.queue_timeout
+        if timeout is not None and self._average:
+            ahead = sum(1 for waiter in self._waiters if waiter[0] <= level and not waiter[2].done())
+            expected = (ahead + 1) * self._average / self.limit
+            if expected > timeout:
+                self._reject("deadline", expected)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (level, next(self._sequence), future))
+        self._queued += 1
+        self._update_gauges()
+        try:
+            await asyncio.wait({future}, timeout=timeout)
+        except asyncio.CancelledError:
+            self._abandon(future)
+            raise
+        if not future.done():
+            self._abandon(future)
+            self._reject("deadline", timeout)
+        self.admitted += 1
+
+    def _abandon(self, future: asyncio.Future):
+        if future.done() and not future.cancelled():
+            # The slot was handed over just as the caller gave up; pass it on
+            self._release()
+            return
+        future.cancel()
+        self._queued -= 1
+        self._update_gauges()
+
+    def _release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Hand the slot straight to the next waiter; in_flight is unchanged
+                self._queued -= 1
+                future.set_result(None)
+                self._update_gauges()
+                return
+        self.in_flight -= 1
+        self._update_gauges()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self._queued,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "average_call_seconds": round(self._average, 4),
+        }
@@ -0,0 +1,63 @@
+# services/responses.py
+import base64
+import binascii
+import hashlib
+from typing import Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson; used as the app's default response
+    class. Returning it directly from a route also skips FastAPI's
+    jsonable_encoder pass, which dominates CPU for large JD lists.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+def version_etag(version: str) -> str:
+    """Weak ETag naming a row version (updated_at); version_from_etag reverses it."""
+    return 'W/"' + base64.urlsafe_b64encode(version.encode("utf-8")).decode("ascii").rstrip("=") + '"'
+
+def version_from_etag(etag: str) -> Optional[str]:
+    """The version inside an ETag made by version_etag, or None if it is not one."""
+    opaque = etag.strip().removeprefix("W/").strip('"')
+    try:
+        return base64.urlsafe_b64decode(opaque + "=" * (-len(opaque) % 4)).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match / If-Match header against an ETag."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+def conditional_response(request: Request, content, etag: Optional[str] = None) -> Response:
+    """
+    A FastJSONResponse carrying an ETag, or an empty 304 when the request's
+    If-None-Match already names it. Without `etag`, a weak hash of the
+    rendered body is used, which saves the transfer but not the query.
+    """
+    response = None
+    if etag is None:
+        response = FastJSONResponse(content)
+        etag = 'W/"' + hashlib.blake2b(response.body, digest_size=12).hexdigest() + '"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if response is None:
+        response = FastJSONResponse(content)
+    response.headers["ETag"] = etag
+    return response
@@ -0,0 +1,169 @@
+# services/schemas.py
+"""
+Single schema source for company profiles and job descriptions. The route
+input models, the service layer and the Hasura response models all derive
+from these classes, so each field is declared exactly once.
+"""
+from pydantic import BaseModel, model_validator
+from typing import Optional
+
+# Company Profile Input Model
+class CompanyProfile(BaseModel):
+    # Required fields
+    user_id: str
+    name: str
+    
+    # Company Identity - optional fields
+    overview: Optional[str] = None
+    industry: Optional[str] = None
+    year_founded: Optional[int] = None
+    headquarters_location: Optional[str] = None
+    global_presence: Optional[str] = None
+    company_size: Optional[str] = None
+    ownership_type: Optional[str] = None
+    company_type: Optional[str] = None
+    products_services: Optional[str] = None
+    specialties: Optional[str] = None
+    growth_stage: Optional[str] = None
+    key_markets: Optional[str] = None
+    
+    # Leadership & Team
+    founders: Optional[str] = None
+    leadership_team: Optional[str] = None
+    board_members: Optional[str] = None
+    team_composition: Optional[str] = None
+    
+    # Culture & Brand
+    work_culture: Optional[str] = None
+    dei_statement: Optional[str] = None
+    sustainability_initiatives: Optional[str] = None
+    awards: Optional[str] = None
+    milestones: Optional[str] = None
+    media_mentions: Optional[str] = None
+    success_stories: Optional[str] = None
+    unique_differentiators: Optional[str] = None
+    brand_voice: Optional[str] = None
+    employer_brand_sentiment: Optional[str] = None
+    
+    # Hiring & Operations
+    hiring_volumes: Optional[str] = None
+    company_languages: Optional[str] = None
+    workplace_model: Optional[str] = None
+    hiring_regions: Optional[str] = None
+    
+    # Web Presence & Links
+    logo_url: Optional[str] = None
+    website_url: Optional[str] = None
+    careers_page_url: Optional[str] = None
+    social_media_links: Optional[str] = None
+    employer_review_links: Optional[str] = None
+
+class CompanyProfileUpdate(CompanyProfile):
+    id: int
+    user_id: Optional[str] = None  # Make user_id optional for updates
+
+class CompanyProfilePatch(CompanyProfile):
+    # Every field is optional; only the ones present in the request are written
+    user_id: Optional[str] = None
+    name: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_patchable(self):
+        # A profile stays with its owner, and required columns can be left out but not cleared
+        if "user_id" in self.model_fields_set:
+            raise ValueError("user_id cannot be changed")
+        cleared = [
+            field for field, info in CompanyProfile.model_fields.items()
+            if info.is_required() and field in self.model_fields_set and getattr(self, field) is None
+        ]
+        if cleared:
+            raise ValueError(f"{', '.join(cleared)} cannot be null")
+        return self
+
+class CompanyProfileModel(CompanyProfile):
+    id: Optional[int] = None
+    # Set by the database on every write; the version behind the ETag
+    updated_at: Optional[str] = None
+
+# Job Description Input Model
+class JDInput(BaseModel):
+    # Required fields
+    company_id: int
+    title: str
+    
+    # Basic Job Info - optional fields
+    job_code: Optional[str] = None
+    job_level: Optional[str] = None
+    department: Optional[str] = None
+    job_function: Optional[str] = None
+    
+    # Job Posting Metadata
+    contract_duration: Optional[str] = None
+    time_commitment: Optional[str] = None
+    
+    # Detailed Role Description
+    job_summary: Optional[str] = None
+    day_to_day_tasks: Optional[str] = None
+    performance_indicators: Optional[str] = None
+    decision_making: Optional[str] = None
+    stakeholder_interactions: Optional[str] = None
+    
+    # Requirements Breakdown
+    required_qualifications: Optional[str] = None
+    preferred_qualifications: Optional[str] = None
+    mandatory_certifications: Optional[str] = None
+    legal_eligibility: Optional[str] = None
+    background_checks: Optional[str] = None
+    clearance_level: Optional[str] = None
+    
+    # Skills Classification
+    hard_skills: Optional[str] = None
+    soft_skills: Optional[str] = None
+    domain_expertise: Optional[str] = None
+    methodologies: Optional[str] = None
+    languages: Optional[str] = None
+    skills_priority: Optional[str] = None
+    
+    # Compensation Details
+    base_salary: Optional[str] = None
+    bonus_structure: Optional[str] = None
+    equity_options: Optional[str] = None
+    benefits: Optional[str] = None
+    relocation_assistance: Optional[str] = None
+    visa_sponsorship: Optional[str] = None
+    
+    # Work Environment
+    work_model: Optional[str] = None
+    work_locations: Optional[str] = None
+    travel_requirements: Optional[str] = None
+    shift_type: Optional[str] = None
+    
+    # Career Path Info
+    growth_opportunities: Optional[str] = None
+    training_development: Optional[str] = None
+    mentorship: Optional[str] = None
+    succession_planning: Optional[str] = None
+    culture_page_link: Optional[str] = None
+    careers_page_link: Optional[str] = None
+
+class JobDescriptionModel(JDInput):
+    id: Optional[int] = None
+
+# Derived data computed in the background by services/enrichment_worker.py
+class JobEnrichmentModel(BaseModel):
+    job_id: int
+    version: int
+    normalized_text: Optional[str] = None
+    word_count: int = 0
+    sentence_count: int = 0
+    # Flesch reading ease (higher is easier) and Flesch-Kincaid grade level
+    reading_ease: Optional[float] = None
+    reading_grade: Optional[float] = None
+    # Parsed from base_salary; the period is "hour", "day", "week", "month" or "year"
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    salary_currency: Optional[str] = None
+    salary_period: Optional[str] = None
+    # Canonical work_locations separated by "; "
+    locations: Optional[str] = None
+    enriched_at: Optional[str] = None
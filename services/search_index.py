@@ -0,0 +1,278 @@
+# services/search_index.py
+import math
+import re
+from array import array
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+from config.settings import settings
+from services import jd_indexes
+
+# Free-text JobDescriptionModel fields and their default boosts
+SEARCH_FIELDS = {
+    "title": 3.0,
+    "hard_skills": 2.0,
+    "job_summary": 1.5,
+    "required_qualifications": 1.2,
+    "preferred_qualifications": 1.0,
+    "day_to_day_tasks": 1.0,
+    "soft_skills": 1.0,
+    "domain_expertise": 1.0,
+    "methodologies": 1.0,
+    "department": 1.0,
+    "job_function": 1.0,
+    "job_level": 1.0,
+    "work_locations": 0.8,
+    "benefits": 0.5,
+}
+
+# Cached per-posting BM25 weights are dropped once the index grows by this fraction
+IMPACT_REFRESH = 0.01
+# Upper bound on cached weights across postings (4 bytes each), least recently used evicted first
+IMPACT_CACHE_ENTRIES = 8_000_000
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the this to we will with you your".split()
+)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+class SearchIndex(jd_indexes.JDIndex):
+    """
+    Inverted index with per-field BM25 scoring. Postings are kept per
+    (field, term) as compact arrays of document ordinals and term
+    frequencies, and scoring is vectorized over them with NumPy, so a query
+    costs a handful of array operations regardless of posting list length.
+    NumPy is imported on first query so it stays out of cold starts.
+
+    A term's BM25 weights, summed over the boosted fields, are cached once
+    computed, so an unscoped query adds one precomputed array per term. Like the similarity
+    index's norms they are only recomputed after the index grows (by 1%),
+    since IDF and average lengths drift slowly; rows added since are
+    weighted on the fly with the cached statistics. Queries
+    scoped to a company score only that company's ordinals, found in each
+    ordinal-sorted posting by binary search.
+    """
+    name = "search"
+    fields = ("id", "company_id") + tuple(SEARCH_FIELDS)
+    version = 1
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        super().__init__()
+        self._reset()
+
+    def _reset(self):
+        self.ids = array("q")
+        self.company_ids = array("q")
+        self.titles: List[str] = []
+        self.ordinals: Dict[int, int] = {}
+        # field -> term -> (ordinals, term frequencies)
+        self.postings: Dict[str, Dict[str, tuple]] = {field: {} for field in SEARCH_FIELDS}
+        self.lengths: Dict[str, array] = {field: array("I") for field in SEARCH_FIELDS}
+        self.total_lengths: Dict[str, int] = {field: 0 for field in SEARCH_FIELDS}
+        self.doc_freq: Dict[str, int] = {}
+        self.company_ordinals: Dict[int, array] = {}
+        # (term, boosts) -> (weights, {field: (idf, average length)}, documents covered)
+        self._impacts: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._impact_entries = 0
+        # Documents when the cached weights were first computed
+        self._impact_count = 0
+
+    def __contains__(self, jd_id):
+        return jd_id in self.ordinals
+
+    def __len__(self):
+        return len(self.ids)
+
+    def prepare(self, row: dict):
+        # (length, term counts) per field; tokenizing is most of the cost of indexing a row
+        prepared = []
+        for field in SEARCH_FIELDS:
+            tokens = tokenize(row.get(field))
+            prepared.append((len(tokens), Counter(tokens)))
+        return prepared
+
+    def merge(self, row: dict, prepared):
+        ordinal = len(self.ids)
+        self.ordinals[row["id"]] = ordinal
+        self.ids.append(row["id"])
+        self.company_ids.append(row.get("company_id") or 0)
+        self._company(row.get("company_id") or 0).append(ordinal)
+        self.titles.append(row.get("title") or "")
+        seen = set()
+        for field, (length, counts) in zip(SEARCH_FIELDS, prepared):
+            self.lengths[field].append(length)
+            if not length:
+                continue
+            self.total_lengths[field] += length
+            postings = self.postings[field]
+            for token, count in counts.items():
+                entry = postings.get(token)
+                if entry is None:
+                    entry = postings[token] = (array("I"), array("H"))
+                entry[0].append(ordinal)
+                entry[1].append(count if count < 65535 else 65535)
+            seen.update(counts)
+        doc_freq = self.doc_freq
+        for token in seen:
+            doc_freq[token] = doc_freq.get(token, 0) + 1
+
+    def _company(self, company_id: int) -> array:
+        ordinals = self.company_ordinals.get(company_id)
+        if ordinals is None:
+            ordinals = self.company_ordinals[company_id] = array("I")
+        return ordinals
+
+    def _stats(self, field: str, term: str, count: int):
+        """(idf, average field length) for BM25 over `count` documents."""
+        df = self.doc_freq[term]
+        return math.log(1 + (count - df + 0.5) / (df + 0.5)), self.total_lengths[field] / count or 1.0
+
+    def _weights(self, field: str, term: str, stats, start: int = 0, ordinals=None):
+        """
+        Unboosted BM25 weights of a posting from entry `start` on, or for the
+        documents in `ordinals` (sorted) as (weights, their positions in
+        `ordinals`).
+        """
+        import numpy as np
+        docs, tf = self.postings[field][term]
+        docs = np.frombuffer(docs, dtype=np.uint32)
+        tf = np.frombuffer(tf, dtype=np.uint16)
+        hits = None
+        if ordinals is None:
+            docs, tf = docs[start:], tf[start:]
+        else:
+            found = np.minimum(np.searchsorted(docs, ordinals), len(docs) - 1)
+            hits = np.flatnonzero(docs[found] == ordinals)
+            docs, tf = ordinals[hits], tf[found[hits]]
+        tf = tf.astype(np.float32)
+        idf, average = stats
+        norm = self.k1 * (1 - self.b + self.b * np.frombuffer(self.lengths[field], dtype=np.uint32)[docs] / average)
+        weights = (idf * tf * (self.k1 + 1) / (tf + norm)).astype(np.float32)
+        return weights if ordinals is None else (weights, hits)
+
+    def _term_weights(self, term: str, boosts: tuple, count: int):
+        """
+        A term's boosted BM25 weights summed over every field, cached per
+        (term, boosts) as a dense array, or as (ordinals, weights) when few
+        documents contain the term. Returns (weights, per-field statistics,
+        documents covered); later documents are left to the caller.
+        """
+        import numpy as np
+        if count > self._impact_count * (1 + IMPACT_REFRESH):
+            # Dropped together so every cached term was computed at nearly the same size
+            self._impacts.clear()
+            self._impact_entries = 0
+            self._impact_count = count
+        key = (term, boosts)
+        cached = self._impacts.get(key)
+        if cached is not None:
+            self._impacts.move_to_end(key)
+            return cached
+        dense = np.zeros(count, dtype=np.float32)
+        stats = {}
+        for field, boost in boosts:
+            if term in self.postings[field]:
+                stats[field] = self._stats(field, term, count)
+                docs = np.frombuffer(self.postings[field][term][0], dtype=np.uint32)
+                dense[docs] += boost * self._weights(field, term, stats[field])
+        matches = np.flatnonzero(dense)
+        weights = dense if len(matches) * 2 > count / 4 else (matches.astype(np.uint32), dense[matches])
+        size = count if weights is dense else len(matches) * 2
+        cached = self._impacts[key] = (weights, stats, count)
+        self._impact_entries += size
+        while self._impact_entries > IMPACT_CACHE_ENTRIES and len(self._impacts) > 1:
+            evicted = self._impacts.popitem(last=False)[1]
+            self._impact_entries -= evicted[2] if isinstance(evicted[0], np.ndarray) else len(evicted[0][0]) * 2
+        return cached
+
+    def search(self, query: str, company_id: Optional[int] = None, limit: int = 20, offset: int = 0,
+               boosts: Optional[Dict[str, float]] = None):
+        """Return (total matches, [{id, company_id, title, score}]) for one page of results."""
+        import numpy as np
+        terms = set(tokenize(query))
+        boosts = {**SEARCH_FIELDS, **(boosts or {})}
+        with self.lock:
+            count = len(self.ids)
+            if not terms or not count:
+                return 0, []
+            ordinals = None
+            if company_id is not None:
+                if company_id not in self.company_ordinals:
+                    return 0, []
+                ordinals = np.frombuffer(self.company_ordinals[company_id], dtype=np.uint32).copy()
+            boosts = tuple((field, boost) for field, boost in boosts.items() if boost > 0 and field in self.postings)
+            scores = np.zeros(count if ordinals is None else len(ordinals), dtype=np.float32)
+            for term in terms:
+                if term not in self.doc_freq:
+                    continue
+                if ordinals is not None:
+                    for field, boost in boosts:
+                        if term in self.postings[field]:
+                            weights, hits = self._weights(field, term, self._stats(field, term, count), ordinals=ordinals)
+                            scores[hits] += boost * weights
+                    continue
+                weights, stats, covered = self._term_weights(term, boosts, count)
+                if isinstance(weights, np.ndarray):
+                    scores[:covered] += weights
+                else:
+                    scores[weights[0]] += weights[1]
+                if covered < count:
+                    # Documents added since the weights were cached, scored with the same statistics
+                    for field, boost in boosts:
+                        if term in self.postings[field]:
+                            docs = np.frombuffer(self.postings[field][term][0], dtype=np.uint32)
+                            start = int(np.searchsorted(docs, covered))
+                            if start < len(docs):
+                                stats.setdefault(field, self._stats(field, term, count))
+                                scores[docs[start:]] += boost * self._weights(field, term, stats[field], start)
+            matches = np.flatnonzero(scores)
+            total = len(matches)
+            wanted = offset + limit
+            if total == 0 or offset >= total:
+                return total, []
+            if wanted < total:
+                matches = matches[np.argpartition(-scores[matches], wanted - 1)[:wanted]]
+            ranked = matches[np.argsort(-scores[matches], kind="stable")][offset:wanted]
+            documents = ranked if ordinals is None else ordinals[ranked]
+            return total, [
+                {
+                    "id": self.ids[ordinal],
+                    "company_id": self.company_ids[ordinal],
+                    "title": self.titles[ordinal],
+                    "score": round(score, 4),
+                }
+                for ordinal, score in zip(documents.tolist(), scores[ranked].tolist())
+            ]
+
+    def snapshot(self):
+        return {
+            "ids": self.ids,
+            "company_ids": self.company_ids,
+            "titles": self.titles,
+            "postings": self.postings,
+            "lengths": self.lengths,
+            "total_lengths": self.total_lengths,
+            "doc_freq": self.doc_freq,
+        }
+
+    def restore(self, state):
+        self._reset()
+        self.__dict__.update(state)
+        self.ordinals = {jd_id: ordinal for ordinal, jd_id in enumerate(self.ids)}
+        for ordinal, company_id in enumerate(self.company_ids):
+            self._company(company_id).append(ordinal)
+
+    def stats(self):
+        with self.lock:
+            return {**super().stats(), "documents": len(self.ids), "terms": len(self.doc_freq)}
+
+index = SearchIndex()
+if settings.jd_search_enabled:
+    jd_indexes.register(index)
@@ -0,0 +1,388 @@
+# services/similarity_index.py
+import math
+import os
+import pickle
+import shutil
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from config.settings import settings
+from services import jd_indexes
+from services.search_index import SEARCH_FIELDS, tokenize
+
+QUERY_BATCH = 32
+# Suffix of a generation directory that is still being written
+PARTIAL = ".partial"
+
+SHARED, EXCLUSIVE = "shared", "exclusive"
+
+@contextmanager
+def _locked(path: str, mode: str):
+    """
+    flock() on path/LOCK: shared while a generation is read and mapped,
+    exclusive while CURRENT changes. Without fcntl (Windows) nothing is
+    locked: mapped files cannot be deleted there, and a load that loses a
+    race with cleanup fails and the index is rebuilt from Hasura.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(os.path.join(path, "LOCK"), "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_SH if mode == SHARED else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+def _read_current(path: str) -> Optional[str]:
+    try:
+        with open(os.path.join(path, "CURRENT")) as handle:
+            return handle.read().strip()
+    except FileNotFoundError:
+        return None
+
+class SimilarityIndex(jd_indexes.JDIndex):
+    """
+    TF-IDF vectors of every job description as a sparse document-term
+    matrix, scored by cosine similarity with SciPy sparse products.
+
+    Rows loaded from a snapshot form the "base" matrix, whose arrays are
+    memory-mapped .npy files so every worker on a host shares one copy in
+    the page cache. Rows added since then go to a small in-memory "tail"
+    matrix; the next save() folds the tail into a new base generation.
+    Term weights are stored as sublinear tf and IDF is applied at query
+    time, so adding a document never rewrites existing rows.
+    """
+    name = "similarity"
+    fields = ("id", "company_id") + tuple(SEARCH_FIELDS)
+    version = 1
+
+    def __init__(self):
+        super().__init__()
+        self.vocabulary: Dict[str, int] = {}
+        self.doc_freq = array("I")
+        self.titles: List[str] = []
+        self.ordinals: Dict[int, int] = {}
+        # SciPy is imported on first use, so the base starts out as None (no rows)
+        self.base = None
+        self.base_ids = ()
+        self.base_company_ids = ()
+        self._reset_tail()
+        self._norms = None
+        # Generation last loaded or saved, and the max_id it was saved with
+        self._generation: Optional[str] = None
+        self._saved_max_id = 0
+
+    def _set_base(self, arrays):
+        """Install memory-mapped (indptr, indices, data, ids, company_ids) as the base matrix."""
+        from scipy import sparse
+        indptr, indices, data, ids, company_ids = arrays
+        # Matching index dtypes and copy=False keep SciPy from copying the mapped arrays
+        self.base = sparse.csr_matrix((data, indices, indptr), shape=(len(ids), len(self.vocabulary)), copy=False)
+        self.base_ids = ids
+        self.base_company_ids = company_ids
+
+    def _base_matrix(self):
+        """The base matrix widened to the current vocabulary, still backed by the mapped arrays."""
+        from scipy import sparse
+        if self.base.shape[1] == len(self.vocabulary):
+            return self.base
+        base = self.base
+        return sparse.csr_matrix((base.data, base.indices, base.indptr), shape=(base.shape[0], len(self.vocabulary)), copy=False)
+
+    @property
+    def base_rows(self) -> int:
+        return 0 if self.base is None else self.base.shape[0]
+
+    def _reset_tail(self):
+        self.tail_indptr = array("i", [0])
+        self.tail_indices = array("i")
+        self.tail_data = array("f")
+        self.tail_ids = array("q")
+        self.tail_company_ids = array("q")
+        self._tail = None
+
+    def __contains__(self, jd_id):
+        return jd_id in self.ordinals
+
+    def __len__(self):
+        return self.base_rows + len(self.tail_ids)
+
+    def prepare(self, row: dict):
+        return Counter(token for field in SEARCH_FIELDS for token in tokenize(row.get(field)))
+
+    def merge(self, row: dict, counts):
+        # The cached tail matrix holds views of the arrays below, which blocks resizing them
+        self._tail = None
+        for term, count in counts.items():
+            column = self.vocabulary.get(term)
+            if column is None:
+                column = self.vocabulary[term] = len(self.vocabulary)
+                self.doc_freq.append(0)
+            self.doc_freq[column] += 1
+            self.tail_indices.append(column)
+            self.tail_data.append(1 + math.log(count))
+        self.tail_indptr.append(len(self.tail_indices))
+        self.ordinals[row["id"]] = len(self)
+        self.tail_ids.append(row["id"])
+        self.tail_company_ids.append(row.get("company_id") or 0)
+        self.titles.append(row.get("title") or "")
+
+    def _tail_matrix(self):
+        from scipy import sparse
+        import numpy as np
+        if self._tail is None:
+            self._tail = sparse.csr_matrix(
+                (
+                    np.frombuffer(self.tail_data, dtype=np.float32),
+                    np.frombuffer(self.tail_indices, dtype=np.int32),
+                    np.frombuffer(self.tail_indptr, dtype=np.int32),
+                ),
+                shape=(len(self.tail_ids), len(self.vocabulary)),
+                copy=False,
+            )
+        return self._tail
+
+    def _idf(self):
+        import numpy as np
+        df = np.frombuffer(self.doc_freq, dtype=np.uint32)
+        return (np.log((1 + len(self)) / (1 + df)) + 1).astype(np.float32)
+
+    def _row_norms(self, matrix, idf):
+        import numpy as np
+        if matrix is None or matrix.shape[0] == 0:
+            return np.zeros(0, dtype=np.float32)
+        squared = matrix.multiply(matrix) @ (idf[:matrix.shape[1]] ** 2)
+        return np.sqrt(np.asarray(squared, dtype=np.float32)).ravel()
+
+    def _norms_for(self, idf):
+        """
+        Row norms under the current IDF. They are cached and recomputed only
+        after the corpus grows by 10%, since IDF drifts slowly as documents
+        are added; rows added since then are normed on the fly.
+        """
+        import numpy as np
+        total = len(self)
+        if self._norms is None or total > len(self._norms) * 1.1:
+            self._norms = np.concatenate([self._row_norms(self.base, idf), self._row_norms(self._tail_matrix(), idf)])
+        missing = total - len(self._norms)
+        if missing <= 0:
+            return self._norms
+        recent = self._row_norms(self._tail_matrix()[-missing:], idf)
+        return np.concatenate([self._norms, recent])
+
+    def _row(self, ordinal: int):
+        if ordinal < self.base_rows:
+            return self.base[ordinal]
+        return self._tail_matrix()[ordinal - self.base_rows]
+
+    def _id_at(self, ordinal: int) -> int:
+        return int(self.base_ids[ordinal]) if ordinal < self.base_rows else self.tail_ids[ordinal - self.base_rows]
+
+    def _company_ids(self):
+        import numpy as np
+        return np.concatenate([np.asarray(self.base_company_ids, dtype=np.int64), np.frombuffer(self.tail_company_ids, dtype=np.int64)])
+
+    def similar_many(self, jd_ids, k: int = 10, exclude_company: bool = False) -> Dict[int, Optional[List[dict]]]:
+        """
+        Top-k most similar postings for each id, scored QUERY_BATCH queries
+        at a time with one sparse matrix product per batch. Ids that are not
+        indexed map to None.
+        """
+        from scipy import sparse
+        import numpy as np
+        results: Dict[int, Optional[List[dict]]] = {jd_id: None for jd_id in jd_ids}
+        with self.lock:
+            known = [jd_id for jd_id in jd_ids if jd_id in self.ordinals]
+            if not known:
+                return results
+            idf = self._idf()
+            norms = self._norms_for(idf)
+            norms = np.where(norms == 0, 1, norms)
+            company_ids = self._company_ids()
+            columns = len(self.vocabulary)
+            for start in range(0, len(known), QUERY_BATCH):
+                batch = known[start:start + QUERY_BATCH]
+                ordinals = [self.ordinals[jd_id] for jd_id in batch]
+                queries = sparse.vstack([self._row(ordinal) for ordinal in ordinals], format="csr")
+                queries.resize((len(batch), columns))
+                # Cosine numerator: sum over shared terms of tf_d * tf_q * idf^2
+                weighted = (queries @ sparse.diags(idf ** 2)).T.tocsr()
+                blocks = [self._tail_matrix() @ weighted]
+                if self.base_rows:
+                    blocks.insert(0, self._base_matrix() @ weighted)
+                # Only documents sharing a term with the query are stored per column
+                scores = sparse.vstack(blocks, format="csc")
+                for column, (jd_id, ordinal) in enumerate(zip(batch, ordinals)):
+                    rows = scores.indices[scores.indptr[column]:scores.indptr[column + 1]]
+                    values = scores.data[scores.indptr[column]:scores.indptr[column + 1]] / (norms[rows] * norms[ordinal])
+                    keep = rows != ordinal
+                    if exclude_company:
+                        keep &= company_ids[rows] != company_ids[ordinal]
+                    rows, values = rows[keep], values[keep]
+                    if len(rows) > k:
+                        top = np.argpartition(-values, k - 1)[:k]
+                        rows, values = rows[top], values[top]
+                    order = np.argsort(-values, kind="stable")
+                    results[jd_id] = [
+                        {
+                            "id": self._id_at(row),
+                            "company_id": int(company_ids[row]),
+                            "title": self.titles[row],
+                            "score": round(float(value), 4),
+                        }
+                        for row, value in zip(rows[order].tolist(), values[order].tolist())
+                    ]
+        return results
+
+    def similar(self, jd_id: int, k: int = 10, exclude_company: bool = False) -> Optional[List[dict]]:
+        return self.similar_many([jd_id], k, exclude_company)[jd_id]
+
+    @property
+    def path(self) -> Optional[str]:
+        if not settings.jd_index_dir:
+            return None
+        return os.path.join(settings.jd_index_dir, self.name)
+
+    def save(self):
+        """
+        Write base and tail together as a new generation of .npy files, point
+        CURRENT at it, then memory-map it as the new base. Workers still
+        mapping an older generation keep reading it until they reload.
+
+        Workers share the directory: when another worker has already published
+        a generation holding every row this one has, that generation is mapped
+        instead of writing another copy. Nothing is written when no rows were
+        added since the last load or save.
+        """
+        from scipy import sparse
+        import numpy as np
+        path = self.path
+        if path is None:
+            return
+        with self.lock:
+            if not self.tail_ids and self.max_id == self._saved_max_id:
+                return
+            os.makedirs(path, exist_ok=True)
+            if self._adopt_current(path):
+                return
+            blocks = [self._tail_matrix()]
+            if self.base_rows:
+                blocks.insert(0, self._base_matrix())
+            matrix = sparse.vstack(blocks, format="csr")
+            # One index dtype for indptr and indices so the mapped arrays are used as-is
+            index_dtype = np.int32 if matrix.nnz < 2**31 else np.int64
+            generation = f"{int(time.time() * 1000)}-{os.getpid()}"
+            # Written under a temporary name, so cleanup never sees a half-written generation
+            partial = os.path.join(path, f"{generation}{PARTIAL}")
+            os.makedirs(partial, exist_ok=True)
+            arrays = {
+                "indptr": matrix.indptr.astype(index_dtype),
+                "indices": matrix.indices.astype(index_dtype),
+                "data": matrix.data.astype(np.float32),
+                "ids": np.concatenate([np.asarray(self.base_ids, dtype=np.int64), np.frombuffer(self.tail_ids, dtype=np.int64)]),
+                "company_ids": self._company_ids(),
+            }
+            for name, values in arrays.items():
+                np.save(os.path.join(partial, f"{name}.npy"), values)
+            meta = {
+                "version": self.version,
+                "max_id": self.max_id,
+                "terms": list(self.vocabulary),
+                "doc_freq": self.doc_freq,
+                "titles": self.titles,
+            }
+            with open(os.path.join(partial, "meta.pickle"), "wb") as handle:
+                pickle.dump(meta, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            with _locked(path, EXCLUSIVE):
+                os.replace(partial, os.path.join(path, generation))
+                with open(os.path.join(path, "CURRENT.tmp"), "w") as handle:
+                    handle.write(generation)
+                os.replace(os.path.join(path, "CURRENT.tmp"), os.path.join(path, "CURRENT"))
+                self._load_generation(os.path.join(path, generation), meta)
+                self._generation = generation
+                self._saved_max_id = self.max_id
+                # Unlinking is safe on POSIX once the files are mapped, and loads map
+                # under the shared lock; newer generations and ones still being written
+                # (PARTIAL) are left alone
+                for name in os.listdir(path):
+                    if not name.endswith(PARTIAL) and name < generation and os.path.isdir(os.path.join(path, name)):
+                        shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    def _adopt_current(self, path: str) -> bool:
+        """Map the generation CURRENT names if it is another worker's and holds every row this one has."""
+        import numpy as np
+        with _locked(path, SHARED):
+            current = _read_current(path)
+            if current is None or current == self._generation:
+                return False
+            directory = os.path.join(path, current)
+            with open(os.path.join(directory, "meta.pickle"), "rb") as handle:
+                meta = pickle.load(handle)
+            if meta.get("version") != self.version or meta["max_id"] < self.max_id:
+                return False
+            ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode="r")
+            mine = np.concatenate([np.asarray(self.base_ids, dtype=np.int64), np.frombuffer(self.tail_ids, dtype=np.int64)])
+            if not np.isin(mine, ids).all():
+                return False
+            self._load_generation(directory, meta)
+            self._generation = current
+            self.max_id = self._saved_max_id = meta["max_id"]
+        return True
+
+    def refresh(self):
+        """Map a generation another worker published if it holds every row this one has."""
+        path = self.path
+        if path is None or not os.path.isdir(path):
+            return
+        with self.lock:
+            self._adopt_current(path)
+
+    def _load_generation(self, directory: str, meta: dict):
+        import numpy as np
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                  for name in ("indptr", "indices", "data", "ids", "company_ids")]
+        self.vocabulary = {term: column for column, term in enumerate(meta["terms"])}
+        self.doc_freq = meta["doc_freq"]
+        self.titles = meta["titles"]
+        self._set_base(arrays)
+        self._reset_tail()
+        self.ordinals = {int(jd_id): ordinal for ordinal, jd_id in enumerate(arrays[3])}
+        self._norms = None
+
+    def load(self) -> bool:
+        path = self.path
+        if path is None or not os.path.exists(os.path.join(path, "CURRENT")):
+            return False
+        # The shared lock keeps a concurrent save from deleting the generation before it is mapped
+        with _locked(path, SHARED):
+            generation = _read_current(path)
+            directory = os.path.join(path, generation)
+            with open(os.path.join(directory, "meta.pickle"), "rb") as handle:
+                meta = pickle.load(handle)
+            if meta.get("version") != self.version:
+                return False
+            with self.lock:
+                self._load_generation(directory, meta)
+                self._generation = generation
+                self.max_id = self._saved_max_id = meta["max_id"]
+        return True
+
+    def stats(self):
+        with self.lock:
+            return {
+                **super().stats(),
+                "documents": len(self),
+                "terms": len(self.vocabulary),
+                "mapped_rows": self.base_rows,
+                "memory_rows": len(self.tail_ids),
+            }
+
+index = SimilarityIndex()
+if settings.jd_similarity_enabled:
+    jd_indexes.register(index)
@@ -0,0 +1,53 @@
+# services/singleflight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one upstream call.
+    The first caller starts the call; everyone arriving while it is in flight
+    awaits the same task and receives its result or exception.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.upstream_calls = 0
+        self.collapsed = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception retrieved even if every waiter timed out
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.upstream_calls += 1
+            task = asyncio.get_running_loop().create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.collapsed += 1
+        try:
+            # shield: one waiter timing out or being cancelled must not cancel the shared call
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.upstream_calls,
+            "collapsed": self.collapsed,
+            "collapse_ratio": round(self.collapsed / self.calls, 4) if self.calls else 0.0,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "in_flight": len(self._in_flight),
+        }
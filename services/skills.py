@@ -0,0 +1,71 @@
+# services/skills.py
+"""
+Skill taxonomy: splits the free-text skill fields of a job description into
+normalized skill names. Kept free of app imports so process pool workers
+can load it cheaply.
+"""
+import re
+from typing import Dict, List
+
+SKILL_FIELDS = ("hard_skills", "soft_skills", "domain_expertise", "methodologies", "languages")
+
+# Alias -> canonical name, matched after normalize_skill() has cleaned the alias
+SKILL_SYNONYMS = {
+    "k8s": "kubernetes", "kube": "kubernetes",
+    "js": "javascript", "ecmascript": "javascript", "es6": "javascript",
+    "ts": "typescript",
+    "py": "python", "python3": "python",
+    "golang": "go",
+    "node": "node.js", "nodejs": "node.js",
+    "react.js": "react", "reactjs": "react",
+    "vue.js": "vue", "vuejs": "vue",
+    "postgres": "postgresql", "psql": "postgresql",
+    "mongo": "mongodb",
+    "amazon web services": "aws", "google cloud": "gcp", "google cloud platform": "gcp", "microsoft azure": "azure",
+    "ml": "machine learning", "dl": "deep learning", "ai": "artificial intelligence",
+    "nlp": "natural language processing", "cv": "computer vision",
+    "ci cd": "ci/cd", "cicd": "ci/cd", "continuous integration": "ci/cd",
+    "tf": "terraform",
+    "gql": "graphql",
+    "c sharp": "c#", "csharp": "c#",
+    "cpp": "c++",
+    "comms": "communication", "communication skills": "communication", "verbal communication": "communication",
+    "teamwork": "collaboration", "team player": "collaboration",
+    "problem-solving": "problem solving", "problem solving skills": "problem solving",
+    "leadership skills": "leadership",
+    "scrum master": "scrum", "agile methodology": "agile", "agile methodologies": "agile",
+    "tdd": "test-driven development", "test driven development": "test-driven development",
+    "english language": "english", "fluent english": "english", "spanish language": "spanish",
+}
+
+SEPARATORS = re.compile(r"[,;\n\r|•]+")
+BULLET = re.compile(r"^\s*(?:[*\-•]|\d+[.)])\s*")
+PROFICIENCY = re.compile(r"\s*\((?:[^)]*)\)\s*$")
+SPACES = re.compile(r"\s+")
+MAX_SKILL_LENGTH = 60
+
+def normalize_skill(raw: str) -> str:
+    """Lowercase, drop bullets and trailing "(advanced)" style notes, then map synonyms."""
+    skill = BULLET.sub("", SPACES.sub(" ", raw.lower())).strip().rstrip(".:")
+    skill = PROFICIENCY.sub("", skill)
+    return SKILL_SYNONYMS.get(skill, skill)
+
+def extract_skills(row: dict) -> Dict[str, List[str]]:
+    """Normalized, de-duplicated skills per skill field of one job description."""
+    extracted = {}
+    for field in SKILL_FIELDS:
+        value = row.get(field)
+        if not value:
+            continue
+        skills = []
+        for part in SEPARATORS.split(value):
+            skill = normalize_skill(part)
+            if skill and len(skill) <= MAX_SKILL_LENGTH and skill not in skills:
+                skills.append(skill)
+        if skills:
+            extracted[field] = skills
+    return extracted
+
+def extract_chunk(rows: List[dict]) -> List[tuple]:
+    """Process pool entry point: [(id, extract_skills(row)), ...] for a chunk of rows."""
+    return [(row["id"], extract_skills(row)) for row in rows]
@@ -0,0 +1,160 @@
+# services/skills_index.py
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import sys
+from array import array
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import settings
+from services import jd_indexes, skills
+
+logger = logging.getLogger(__name__)
+
+class SkillsIndex(jd_indexes.JDIndex):
+    """
+    Normalized skill -> job description id postings, kept sorted by id so
+    listings can be paged with a cursor. Large batches (the backfill) are
+    parsed in a process pool; single inserts are parsed inline.
+    """
+    name = "skills"
+    fields = ("id",) + skills.SKILL_FIELDS
+    version = 1
+
+    def __init__(self):
+        super().__init__()
+        self.postings: Dict[str, array] = {}
+        # field -> skill -> number of postings listing it under that field
+        self.field_counts: Dict[str, Dict[str, int]] = {field: {} for field in skills.SKILL_FIELDS}
+        self.indexed = set()
+        self._pool = None
+
+    def __contains__(self, jd_id):
+        return jd_id in self.indexed
+
+    def _merge(self, jd_id: int, extracted: Dict[str, List[str]]):
+        self.indexed.add(jd_id)
+        seen = set()
+        for field, names in extracted.items():
+            counts = self.field_counts[field]
+            for skill in names:
+                counts[skill] = counts.get(skill, 0) + 1
+                if skill in seen:
+                    continue
+                seen.add(skill)
+                ids = self.postings.get(skill)
+                if ids is None:
+                    ids = self.postings[skill] = array("q")
+                # Live inserts can arrive ahead of the bootstrap pages, so keep the order explicit
+                if not ids or ids[-1] < jd_id:
+                    ids.append(jd_id)
+                else:
+                    ids.insert(bisect.bisect_left(ids, jd_id), jd_id)
+
+    def prepare(self, row: dict):
+        return skills.extract_skills(row)
+
+    def merge(self, row: dict, extracted):
+        self._merge(row["id"], extracted)
+
+    def _executor(self):
+        from concurrent.futures import ProcessPoolExecutor
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=settings.skills_backfill_workers)
+        return self._pool
+
+    def add_many(self, rows, in_order: bool = False):
+        chunk_size = settings.skills_backfill_chunk_size
+        rows = [row for row in rows if row["id"] not in self]
+        if settings.skills_backfill_workers > 1 and len(rows) >= 2 * chunk_size:
+            chunks = [rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size)]
+            # Parsing runs in worker processes without holding the lock; merging is cheap
+            try:
+                extracted = [item for chunk in self._executor().map(skills.extract_chunk, chunks) for item in chunk]
+            except BrokenProcessPool:
+                logger.warning("Skills worker pool failed, parsing in-process")
+                self.close()
+                extracted = skills.extract_chunk(rows)
+        else:
+            extracted = skills.extract_chunk(rows)
+        with self.lock:
+            for jd_id, fields in extracted:
+                if jd_id not in self.indexed:
+                    self._merge(jd_id, fields)
+            if rows and in_order:
+                self.max_id = max(self.max_id, max(row["id"] for row in rows))
+
+    def top(self, field: Optional[str] = None, limit: int = 20, prefix: str = "") -> List[dict]:
+        """Most common skills overall or within one skill field, optionally by name prefix."""
+        prefix = prefix.lower()
+        with self.lock:
+            if field is None:
+                counts = ((skill, len(ids)) for skill, ids in self.postings.items())
+            else:
+                counts = self.field_counts[field].items()
+            ranked = sorted(
+                ((skill, count) for skill, count in counts if skill.startswith(prefix)),
+                key=lambda item: (-item[1], item[0]),
+            )
+        return [{"skill": skill, "jobs": count} for skill, count in ranked[:limit]]
+
+    def jobs(self, skill: str, limit: int, before: Optional[int] = None) -> Tuple[str, int, List[int], Optional[int]]:
+        """
+        Newest-first page of ids for a skill (raw names are normalized first).
+        Returns (skill, total, ids, next_cursor).
+        """
+        skill = skills.normalize_skill(skill)
+        with self.lock:
+            ids = self.postings.get(skill)
+            if not ids:
+                return skill, 0, [], None
+            end = len(ids) if before is None else bisect.bisect_left(ids, before)
+            page = ids[max(end - limit, 0):end].tolist()[::-1]
+            total = len(ids)
+        return skill, total, page, page[-1] if end > limit else None
+
+    def snapshot(self):
+        return {"postings": self.postings, "field_counts": self.field_counts}
+
+    def restore(self, state):
+        self.postings = state["postings"]
+        self.field_counts = state["field_counts"]
+        self.indexed = {jd_id for ids in self.postings.values() for jd_id in ids}
+
+    def stats(self):
+        with self.lock:
+            return {**super().stats(), "documents": len(self.indexed), "skills": len(self.postings)}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+index = SkillsIndex()
+if settings.jd_skills_enabled:
+    jd_indexes.register(index)
+
+async def backfill(page_size: int = None) -> dict:
+    """Build (or catch up) the skills index from Hasura and write its snapshot."""
+    from services import hasura_service
+    try:
+        await jd_indexes.bootstrap(page_size, targets=[index])
+    finally:
+        index.close()
+        await hasura_service.close_storage()
+    return index.stats()
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the normalized skills index from Hasura.")
+    parser.add_argument("--page-size", type=int, default=None)
+    args = parser.parse_args()
+    if not settings.jd_index_dir:
+        sys.exit("Set JD_INDEX_DIR so the backfilled index can be saved")
+    print(json.dumps(asyncio.run(backfill(args.page_size)), indent=2))
+
+if __name__ == "__main__":
+    # python -m services.skills_index
+    main()
@@ -0,0 +1,417 @@
+# services/sql_storage.py
+"""
+Direct SQL storage backends (STORAGE_BACKEND=sqlite or postgres), which skip
+the app -> Hasura -> Postgres hop. Statement texts are built once per
+projection or column set and reused, so each driver prepares a statement
+once per pooled connection and serves later calls from its statement cache.
+"""
+import asyncio
+import sqlite3
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+from config.settings import settings
+from services import metrics, storage
+from services.schemas import CompanyProfileModel, JobDescriptionModel, JobEnrichmentModel
+
+COMPANY_COLUMNS = tuple(name for name in CompanyProfileModel.model_fields if name not in ("id", "updated_at"))
+JOB_COLUMNS = tuple(name for name in JobDescriptionModel.model_fields if name != "id")
+ENRICHMENT_COLUMNS = tuple(name for name in JobEnrichmentModel.model_fields if name != "enriched_at")
+COMPANY_RETURNING = ("id", "user_id", "name", "updated_at")
+JOB_RETURNING = ("id", "company_id", "title")
+# updated_at is returned as text so it can be sent back verbatim as an If-Match version
+COMPANY_SELECT = "id, user_id, name, CAST(updated_at AS TEXT) AS updated_at"
+
+def _quote(name: str) -> str:
+    return f'"{name}"'
+
+def _column_type(model, name: str) -> str:
+    annotation = str(model.model_fields[name].annotation)
+    return "INTEGER" if "int" in annotation else "REAL" if "float" in annotation else "TEXT"
+
+def schema_sql(dialect: str) -> str:
+    """
+    CREATE TABLE statements for the README schema, with one column per field
+    of the models in services/schemas.py.
+    """
+    if dialect == "postgres":
+        id_column, timestamp = "id SERIAL PRIMARY KEY", "TIMESTAMP WITH TIME ZONE DEFAULT NOW()"
+    else:
+        id_column, timestamp = "id INTEGER PRIMARY KEY AUTOINCREMENT", f"TEXT DEFAULT ({SQLiteBackend.now})"
+
+    def columns(model, names, required):
+        return [
+            f"    {name} {_column_type(model, name)}{' NOT NULL' if name in required else ''},"
+            for name in names
+        ]
+
+    return "\n".join([
+        "CREATE TABLE IF NOT EXISTS company_profiles (",
+        f"    {id_column},",
+        *columns(CompanyProfileModel, COMPANY_COLUMNS, ("user_id", "name")),
+        f"    created_at {timestamp},",
+        f"    updated_at {timestamp},",
+        "    CONSTRAINT unique_user_id UNIQUE (user_id)",
+        ");",
+        "CREATE INDEX IF NOT EXISTS idx_company_profiles_user_id ON company_profiles (user_id);",
+        "CREATE TABLE IF NOT EXISTS job_descriptions (",
+        f"    {id_column},",
+        *columns(JobDescriptionModel, JOB_COLUMNS, ("company_id", "title")),
+        f"    created_at {timestamp},",
+        f"    updated_at {timestamp},",
+        "    CONSTRAINT fk_company FOREIGN KEY (company_id) REFERENCES company_profiles (id) ON DELETE CASCADE",
+        ");",
+        "CREATE INDEX IF NOT EXISTS idx_job_descriptions_company_id ON job_descriptions (company_id);",
+        "CREATE TABLE IF NOT EXISTS job_enrichments (",
+        "    job_id INTEGER PRIMARY KEY,",
+        *columns(JobEnrichmentModel, ENRICHMENT_COLUMNS[1:], ("version", "word_count", "sentence_count")),
+        f"    enriched_at {timestamp},",
+        "    CONSTRAINT fk_job FOREIGN KEY (job_id) REFERENCES job_descriptions (id) ON DELETE CASCADE",
+        ");",
+        "",
+    ])
+
+class SQLBackend(storage.StorageBackend):
+    """
+    The queries shared by the SQL dialects. Subclasses provide the parameter
+    style, the id-list condition and the driver calls (_fetch, _batch).
+    """
+    # Bind parameters allowed in one statement; multi-row inserts are split to fit
+    max_params = 32766
+    # The updated_at (and enriched_at) value written on update
+    now = "CURRENT_TIMESTAMP"
+
+    def __init__(self):
+        self._statements: Dict[tuple, str] = {}
+        self._open_lock = asyncio.Lock()
+        self._opened = False
+
+    def _param(self, position: int) -> str:
+        raise NotImplementedError
+
+    def _ids_condition(self, position: int, column: str = "id") -> Tuple[str, object]:
+        """(WHERE condition matching a column against a list parameter, argument converter)."""
+        raise NotImplementedError
+
+    def _since_condition(self, position: int) -> str:
+        """WHERE condition for updated_at at or after a timestamp string parameter."""
+        raise NotImplementedError
+
+    async def _connect(self):
+        raise NotImplementedError
+
+    async def _fetch(self, sql: str, args: Sequence) -> List[dict]:
+        raise NotImplementedError
+
+    async def _batch(self, statements: List[Tuple[str, Sequence]]) -> List[List[dict]]:
+        """Run statements in one transaction and return each one's rows."""
+        raise NotImplementedError
+
+    async def open(self):
+        async with self._open_lock:
+            if not self._opened:
+                await self._connect()
+                self._opened = True
+
+    def _statement(self, key: tuple, build) -> str:
+        sql = self._statements.get(key)
+        if sql is None:
+            sql = self._statements[key] = build()
+        return sql
+
+    async def _run(self, operation: str, call):
+        if not self._opened:
+            await self.open()
+        start = time.perf_counter()
+        try:
+            return await call
+        except Exception as e:
+            metrics.db_errors.inc((operation,))
+            raise Exception(f"Database query failed: {e}") from e
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.db_duration.observe((operation,), elapsed)
+            metrics.add_timing("db", elapsed)
+
+    def _insert_sql(self, table: str, columns: Tuple[str, ...], rows: int, suffix: str) -> str:
+        def build():
+            width = len(columns)
+            values = ", ".join(
+                "(" + ", ".join(self._param(row * width + column + 1) for column in range(width)) + ")"
+                for row in range(rows)
+            )
+            return f"INSERT INTO {table} ({', '.join(map(_quote, columns))}) VALUES {values} {suffix}"
+        return self._statement(("insert", table, columns, rows, suffix), build)
+
+    async def insert_company(self, values):
+        columns = tuple(values)
+        sql = self._insert_sql("company_profiles", columns, 1, f"ON CONFLICT (user_id) DO NOTHING RETURNING {COMPANY_SELECT}")
+        rows = await self._run("insert_company", self._fetch(sql, [values[name] for name in columns]))
+        return rows[0] if rows else None
+
+    async def update_company(self, company_id, values, updated_at=None):
+        columns = tuple(values)
+        conditional = updated_at is not None
+        condition = f"id = {self._param(len(columns) + 1)}" + (f" AND CAST(updated_at AS TEXT) = {self._param(len(columns) + 2)}" if conditional else "")
+        if not columns:
+            sql = self._statement(("company_by_id", conditional), lambda: f"SELECT {COMPANY_SELECT} FROM company_profiles WHERE {condition}")
+        else:
+            sql = self._statement(("update_company", columns, conditional), lambda: (
+                "UPDATE company_profiles SET "
+                + "".join(f"{_quote(name)} = {self._param(position)}, " for position, name in enumerate(columns, 1))
+                + f"updated_at = {self.now} WHERE {condition} RETURNING {COMPANY_SELECT}"
+            ))
+        args = [values[name] for name in columns] + [company_id] + ([updated_at] if conditional else [])
+        rows = await self._run("update_company", self._fetch(sql, args))
+        return rows[0] if rows else None
+
+    async def get_company_by_user_id(self, user_id):
+        sql = self._statement(("company_by_user",), lambda: f"SELECT {COMPANY_SELECT} FROM company_profiles WHERE user_id = {self._param(1)}")
+        rows = await self._run("get_company_by_user_id", self._fetch(sql, [user_id]))
+        return rows[0] if rows else None
+
+    async def insert_job(self, values):
+        columns = tuple(values)
+        sql = self._insert_sql("job_descriptions", columns, 1, "RETURNING id, company_id, title")
+        rows = await self._run("insert_job", self._fetch(sql, [values[name] for name in columns]))
+        return rows[0]
+
+    async def insert_jobs(self, rows):
+        if not rows:
+            return []
+        present = set().union(*rows)
+        columns = tuple(name for name in JOB_COLUMNS if name in present)
+        per_statement = max(self.max_params // len(columns), 1)
+        statements = []
+        for start in range(0, len(rows), per_statement):
+            chunk = rows[start:start + per_statement]
+            sql = self._insert_sql("job_descriptions", columns, len(chunk), "RETURNING id")
+            statements.append((sql, [row.get(name) for row in chunk for name in columns]))
+        results = await self._run("insert_jobs", self._batch(statements))
+        # Ids are assigned in VALUES order, but RETURNING order is not guaranteed
+        return [jd_id for result in results for jd_id in sorted(row["id"] for row in result)]
+
+    def _select(self, fields: Sequence[str]) -> str:
+        return ", ".join(map(_quote, fields))
+
+    async def company_jobs(self, company_id, after, limit, fields):
+        fields = tuple(fields)
+        sql = self._statement(("company_jobs", fields), lambda: (
+            f"SELECT {self._select(fields)} FROM job_descriptions"
+            f" WHERE company_id = {self._param(1)} AND id > {self._param(2)} ORDER BY id LIMIT {self._param(3)}"
+        ))
+        return await self._run("company_jobs", self._fetch(sql, [company_id, after, limit]))
+
+    async def all_jobs(self, after, limit, fields):
+        fields = tuple(fields)
+        sql = self._statement(("all_jobs", fields), lambda: (
+            f"SELECT {self._select(fields)} FROM job_descriptions"
+            f" WHERE id > {self._param(1)} ORDER BY id LIMIT {self._param(2)}"
+        ))
+        return await self._run("all_jobs", self._fetch(sql, [after, limit]))
+
+    async def export_page(self, table, after, limit, fields, since=None):
+        fields = tuple(fields)
+        conditional = since is not None
+        sql = self._statement(("export_page", table, fields, conditional), lambda: (
+            f"SELECT {', '.join('CAST(updated_at AS TEXT) AS updated_at' if name == 'updated_at' else _quote(name) for name in fields)}"
+            f" FROM {table} WHERE id > {self._param(1)}"
+            + (f" AND {self._since_condition(2)}" if conditional else "")
+            + f" ORDER BY id LIMIT {self._param(3 if conditional else 2)}"
+        ))
+        return await self._run("export_page", self._fetch(sql, [after] + ([since] if conditional else []) + [limit]))
+
+    async def jobs_by_ids(self, ids, fields):
+        fields = tuple(fields)
+        condition, convert = self._ids_condition(1)
+        sql = self._statement(("jobs_by_ids", fields), lambda: f"SELECT {self._select(fields)} FROM job_descriptions WHERE {condition}")
+        return await self._run("jobs_by_ids", self._fetch(sql, [convert(ids)]))
+
+    async def upsert_enrichments(self, rows):
+        if not rows:
+            return 0
+        columns = ENRICHMENT_COLUMNS
+        suffix = (
+            "ON CONFLICT (job_id) DO UPDATE SET "
+            + "".join(f"{_quote(name)} = excluded.{_quote(name)}, " for name in columns if name != "job_id")
+            + f"enriched_at = {self.now}"
+        )
+        per_statement = max(self.max_params // len(columns), 1)
+        statements = []
+        for start in range(0, len(rows), per_statement):
+            chunk = rows[start:start + per_statement]
+            sql = self._insert_sql("job_enrichments", columns, len(chunk), suffix)
+            statements.append((sql, [row.get(name) for row in chunk for name in columns]))
+        await self._run("upsert_enrichments", self._batch(statements))
+        return len(rows)
+
+    async def enrichments_by_job_ids(self, ids):
+        condition, convert = self._ids_condition(1, "job_id")
+        sql = self._statement(("enrichments_by_job_ids",), lambda: (
+            f"SELECT {self._select(ENRICHMENT_COLUMNS)}, CAST(enriched_at AS TEXT) AS enriched_at"
+            f" FROM job_enrichments WHERE {condition}"
+        ))
+        return await self._run("enrichments_by_job_ids", self._fetch(sql, [convert(ids)]))
+
+    async def dashboard(self, user_id, after, limit, fields):
+        company = await self.get_company_by_user_id(user_id)
+        if company is None:
+            return None, []
+        return company, await self.company_jobs(company["id"], after, limit, fields)
+
+class SQLiteBackend(SQLBackend):
+    """
+    SQLite through aiosqlite, for local development and tests. Tables are
+    created on first use. Each pooled connection runs on its own thread; WAL
+    mode lets readers proceed while a write is in progress.
+    """
+    name = "sqlite"
+    max_params = 32766 if sqlite3.sqlite_version_info >= (3, 32) else 999
+    # CURRENT_TIMESTAMP has one-second resolution, too coarse for an If-Match version
+    now = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__()
+        path = path or settings.database_url or "athena.db"
+        self.path = path[len("sqlite:///"):] if path.startswith("sqlite:///") else path
+        self._idle: List[object] = []
+        self._connections = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _param(self, position):
+        return "?"
+
+    def _ids_condition(self, position, column="id"):
+        return f"{column} IN (SELECT value FROM json_each(?))", lambda ids: orjson.dumps(list(ids)).decode()
+
+    def _since_condition(self, position):
+        # Timestamps are stored as text; julianday also accepts ISO 8601 with "T" and an offset
+        return "julianday(updated_at) >= julianday(?)"
+
+    async def _new_connection(self):
+        import aiosqlite
+        connection = await aiosqlite.connect(
+            self.path,
+            timeout=settings.database_timeout,
+            cached_statements=settings.database_statement_cache_size,
+            isolation_level=None,
+        )
+        connection.row_factory = sqlite3.Row
+        await connection.execute("PRAGMA journal_mode=WAL")
+        await connection.execute("PRAGMA synchronous=NORMAL")
+        await connection.execute("PRAGMA foreign_keys=ON")
+        self._connections += 1
+        return connection
+
+    async def _connect(self):
+        self._slots = asyncio.Semaphore(max(settings.database_pool_max_size, 1))
+        connection = await self._new_connection()
+        await connection.executescript(schema_sql("sqlite"))
+        self._idle.append(connection)
+        while self._connections < settings.database_pool_min_size:
+            self._idle.append(await self._new_connection())
+
+    async def _acquire(self):
+        await self._slots.acquire()
+        try:
+            return self._idle.pop() if self._idle else await self._new_connection()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, connection):
+        self._idle.append(connection)
+        self._slots.release()
+
+    async def _fetch(self, sql, args):
+        connection = await self._acquire()
+        try:
+            return [dict(row) for row in await connection.execute_fetchall(sql, args)]
+        finally:
+            self._release(connection)
+
+    async def _batch(self, statements):
+        connection = await self._acquire()
+        try:
+            await connection.execute("BEGIN IMMEDIATE")
+            try:
+                results = [[dict(row) for row in await connection.execute_fetchall(sql, args)] for sql, args in statements]
+            except BaseException:
+                await connection.execute("ROLLBACK")
+                raise
+            await connection.execute("COMMIT")
+            return results
+        finally:
+            self._release(connection)
+
+    async def close(self):
+        while self._idle:
+            await self._idle.pop().close()
+        self._connections = 0
+        self._opened = False
+
+    def stats(self):
+        return {**super().stats(), "path": self.path, "connections": self._connections, "idle": len(self._idle)}
+
+class PostgresBackend(SQLBackend):
+    """
+    Postgres through an asyncpg connection pool. asyncpg prepares each
+    statement on first use per connection and keeps it in its statement
+    cache. The tables are expected to exist (see schema_sql).
+    """
+    name = "postgres"
+    max_params = 32767
+
+    def __init__(self, dsn: Optional[str] = None):
+        super().__init__()
+        self.dsn = dsn or settings.database_url
+        self._pool = None
+
+    def _param(self, position):
+        return f"${position}"
+
+    def _ids_condition(self, position, column="id"):
+        return f"{column} = ANY(${position}::int[])", list
+
+    def _since_condition(self, position):
+        # Bound as text, so callers pass the watermark string rather than a datetime
+        return f"updated_at >= CAST(CAST(${position} AS TEXT) AS TIMESTAMP WITH TIME ZONE)"
+
+    async def _connect(self):
+        import asyncpg
+        if not self.dsn:
+            raise Exception("DATABASE_URL is not configured")
+        self._pool = await asyncpg.create_pool(
+            self.dsn,
+            min_size=settings.database_pool_min_size,
+            max_size=settings.database_pool_max_size,
+            statement_cache_size=settings.database_statement_cache_size,
+            command_timeout=settings.database_timeout,
+        )
+
+    async def _fetch(self, sql, args):
+        async with self._pool.acquire() as connection:
+            return [dict(row) for row in await connection.fetch(sql, *args)]
+
+    async def _batch(self, statements):
+        async with self._pool.acquire() as connection:
+            async with connection.transaction():
+                return [[dict(row) for row in await connection.fetch(sql, *args)] for sql, args in statements]
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        self._opened = False
+
+    def stats(self):
+        if self._pool is None:
+            return super().stats()
+        return {**super().stats(), "connections": self._pool.get_size(), "idle": self._pool.get_idle_size()}
+
+if __name__ == "__main__":
+    # python -m services.sql_storage postgres > schema.sql
+    sys.stdout.write(schema_sql(sys.argv[1] if len(sys.argv) > 1 else "postgres"))
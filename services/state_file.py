@@ -0,0 +1,22 @@
+# services/state_file.py
+"""
+Small JSON state files for resumable command-line jobs, such as the export
+watermark and the enrichment backfill cursor.
+"""
+import os
+
+import orjson
+
+def read_state(path) -> dict:
+    """The saved state, or {} when there is no path or no file yet."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+def write_state(path, state: dict):
+    # Written to a temporary file and renamed, so a crash never leaves a half-written state file
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
+    os.replace(temporary, path)
@@ -0,0 +1,106 @@
+# services/storage.py
+"""
+Repository interface for company profiles and job descriptions. The service
+functions in services.hasura_service (caching, index updates, model
+wrapping) call a StorageBackend for the actual reads and writes, so the
+GraphQL API can be swapped for a direct database connection with
+STORAGE_BACKEND.
+"""
+import importlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+class StorageBackend:
+    """
+    Async data access for the company_profiles and job_descriptions tables
+    and the derived job_enrichments table. Rows are plain dicts; company rows carry id, user_id, name and updated_at,
+    a string in the backend's own format. Failures raise Exception with a
+    message suitable for the route's 500 detail.
+    """
+    name = "base"
+
+    async def open(self):
+        """Create clients or connection pools ahead of the first request."""
+
+    async def close(self):
+        """Release clients or connection pools; called on shutdown."""
+
+    async def insert_company(self, values: dict) -> Optional[dict]:
+        """Insert a profile, or return None if the user already has one."""
+        raise NotImplementedError
+
+    async def update_company(self, company_id: int, values: dict, updated_at: Optional[str] = None) -> Optional[dict]:
+        """
+        Write `values` to a profile, bump its updated_at and return it, or
+        None if it does not exist. With `updated_at` the write only happens
+        while the profile's updated_at still equals it; None then also means
+        the profile has changed since.
+        """
+        raise NotImplementedError
+
+    async def get_company_by_user_id(self, user_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def insert_job(self, values: dict) -> dict:
+        """Insert one job description and return its id, company_id and title."""
+        raise NotImplementedError
+
+    async def insert_jobs(self, rows: List[dict]) -> List[int]:
+        """Insert job descriptions atomically and return their ids in input order."""
+        raise NotImplementedError
+
+    async def company_jobs(self, company_id: int, after: int, limit: int, fields: Sequence[str]) -> List[dict]:
+        """Up to `limit` of a company's jobs with id > after, ordered by id."""
+        raise NotImplementedError
+
+    async def all_jobs(self, after: int, limit: int, fields: Sequence[str]) -> List[dict]:
+        """Up to `limit` jobs across companies with id > after, ordered by id."""
+        raise NotImplementedError
+
+    async def export_page(self, table: str, after: int, limit: int, fields: Sequence[str], since: Optional[str] = None) -> List[dict]:
+        """
+        Up to `limit` rows of `table` ("company_profiles" or "job_descriptions")
+        with id > after, ordered by id. `fields` may include updated_at. With
+        `since`, only rows whose updated_at is at or after it.
+        """
+        raise NotImplementedError
+
+    async def jobs_by_ids(self, ids: List[int], fields: Sequence[str]) -> List[dict]:
+        """Jobs with the given ids, in any order."""
+        raise NotImplementedError
+
+    async def upsert_enrichments(self, rows: List[dict]) -> int:
+        """
+        Insert or replace job_enrichments rows (keyed by job_id, columns as in
+        JobEnrichmentModel without enriched_at, which the write sets) in one
+        atomic write. Returns the number of rows written.
+        """
+        raise NotImplementedError
+
+    async def enrichments_by_job_ids(self, ids: List[int]) -> List[dict]:
+        """job_enrichments rows for the given job ids, in any order."""
+        raise NotImplementedError
+
+    async def dashboard(self, user_id: str, after: int, limit: int, fields: Sequence[str]) -> Tuple[Optional[dict], List[dict]]:
+        """A user's company (or None) and one keyset page of its jobs."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+# Implementations are imported on first use, so the SQL drivers stay optional
+_backends: Dict[str, Tuple[str, str]] = {
+    "hasura": ("services.hasura_service", "HasuraBackend"),
+    "sqlite": ("services.sql_storage", "SQLiteBackend"),
+    "postgres": ("services.sql_storage", "PostgresBackend"),
+}
+
+def register_backend(name: str, module: str, class_name: str):
+    """Make a backend selectable by name, e.g. register_backend("mysql", "myapp.storage", "MySQLBackend")."""
+    _backends[name] = (module, class_name)
+
+def create_backend(name: str) -> StorageBackend:
+    try:
+        module, class_name = _backends[name]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {name}")
+    return getattr(importlib.import_module(module), class_name)()
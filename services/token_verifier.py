@@ -0,0 +1,181 @@
+# services/token_verifier.py
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from typing import Dict, Optional
+
+from config.settings import settings
+from services import cache, metrics, resilience
+
+logger = logging.getLogger(__name__)
+
+class InvalidTokenError(Exception):
+    pass
+
+class SigningKeyStore:
+    """
+    Google's rotating Firebase signing certificates, refreshed in the
+    background ahead of their Cache-Control expiry so verification never
+    waits on a fetch after a key rotation.
+    """
+
+    def __init__(self, certs_url: str, refresh_margin: float = 300, min_refresh_interval: float = 30):
+        self.certs_url = certs_url
+        self.refresh_margin = refresh_margin
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, object] = {}
+        self._expires_at = 0.0
+        self._last_refresh = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def set_keys(self, pem_certs: Dict[str, str], max_age: float = 3600):
+        """Install certificates directly, e.g. from a locally generated key pair."""
+        from cryptography import x509
+        self._keys = {
+            kid: x509.load_pem_x509_certificate(pem.encode("utf-8")).public_key()
+            for kid, pem in pem_certs.items()
+        }
+        self._expires_at = time.monotonic() + max_age
+
+    def get(self, kid: str):
+        return self._keys.get(kid)
+
+    @property
+    def stale(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+    async def refresh(self, force: bool = False):
+        import httpx
+        async with self._lock:
+            # Another waiter may have refreshed while we queued on the lock
+            if not force and not self.stale:
+                return
+            if time.monotonic() - self._last_refresh < self.min_refresh_interval and self._keys:
+                return
+            self._last_refresh = time.monotonic()
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.get(self.certs_url)
+                response.raise_for_status()
+            match = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+            self.set_keys(response.json(), float(match.group(1)) if match else 3600)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh(force=True)
+                delay = max(self._expires_at - time.monotonic() - self.refresh_margin, self.min_refresh_interval)
+            except Exception as e:
+                logger.warning("Firebase signing key refresh failed: %s", e)
+                delay = self.min_refresh_interval
+            await asyncio.sleep(delay)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+class FirebaseTokenVerifier:
+    """
+    Verifies Firebase ID tokens the way firebase_admin.auth.verify_id_token
+    does, caching verified claims by token hash until the token's exp.
+    PyJWT, cryptography and httpx are imported on first use (see
+    services.warmup) so they stay out of the cold-start path.
+    """
+
+    def __init__(self, project_id: str, key_store: SigningKeyStore, token_cache: cache.CacheBackend, leeway: float = 0, limiter: Optional[resilience.ConcurrencyLimiter] = None):
+        self.project_id = project_id
+        self.key_store = key_store
+        self.cache = token_cache
+        self.leeway = leeway
+        # Bounds concurrent uncached verifications (key fetches and RSA checks)
+        self.limiter = limiter or resilience.ConcurrencyLimiter("firebase", 0, 0, 0)
+
+    def _decode(self, token: str, key) -> dict:
+        import jwt
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=f"https://securetoken.google.com/{self.project_id}",
+                leeway=self.leeway,
+                options={"require": ["exp", "iat", "sub"]},
+            )
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(str(e)) from e
+        sub = claims.get("sub")
+        if not isinstance(sub, str) or not sub or len(sub) > 128:
+            raise InvalidTokenError("Token has an invalid subject")
+        if claims.get("auth_time", 0) > time.time() + self.leeway:
+            raise InvalidTokenError("Token auth_time is in the future")
+        claims["uid"] = sub
+        return claims
+
+    async def verify(self, token: str) -> dict:
+        start = time.perf_counter()
+        result = "invalid"
+        try:
+            claims, result = await self._verify(token)
+            return claims
+        except resilience.ServiceUnavailableError:
+            result = "shed"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.firebase_duration.observe((result,), elapsed)
+            metrics.add_timing("firebase", elapsed)
+
+    async def _verify(self, token: str):
+        """Returns (claims, "cached" or "verified")."""
+        import jwt
+        if not self.project_id:
+            raise InvalidTokenError("FIREBASE_PROJECT_ID is not configured")
+        cache_key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        claims = await self.cache.get(cache_key)
+        if claims is not cache.MISS:
+            return claims, "cached"
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(str(e)) from e
+        async with self.limiter.slot(resilience.INTERACTIVE):
+            claims = await self._verify_signature(token, kid)
+        await self.cache.set(cache_key, claims, max(claims["exp"] - time.time(), 0))
+        return claims, "verified"
+
+    async def _verify_signature(self, token: str, kid: str) -> dict:
+        if self.key_store.stale or self.key_store.get(kid) is None:
+            try:
+                await self.key_store.refresh(force=self.key_store.get(kid) is None)
+            except Exception as e:
+                # A stale but known key is still usable if Google is unreachable
+                if self.key_store.get(kid) is None:
+                    raise InvalidTokenError(f"Could not fetch signing keys: {e}") from e
+        key = self.key_store.get(kid)
+        if key is None:
+            raise InvalidTokenError("Token was signed with an unknown key")
+
+        # RSA verification is CPU work, keep it off the event loop
+        return await asyncio.to_thread(self._decode, token, key)
+
+verifier = FirebaseTokenVerifier(
+    settings.firebase_project_id,
+    SigningKeyStore(settings.firebase_certs_url, settings.firebase_certs_refresh_margin),
+    cache.InMemoryLRUCache(settings.token_cache_max_entries),
+    limiter=resilience.ConcurrencyLimiter(
+        "firebase", settings.firebase_verify_concurrency, settings.admission_max_queue, settings.admission_queue_timeout,
+    ),
+)
@@ -0,0 +1,69 @@
+# services/warmup.py
+import asyncio
+import importlib
+import logging
+from config.settings import settings
+from services import assets, enrichment_worker, hasura_service, jd_indexes
+from services.token_verifier import verifier
+
+logger = logging.getLogger(__name__)
+
+# Heavy modules kept out of the import path of api/index.py
+PRELOAD_MODULES = ("httpx", "h2", "jwt", "cryptography.x509", "numpy", "scipy.sparse")
+
+_warm_task = None
+
+def preload():
+    """Import the lazily loaded dependencies; safe to call from any thread."""
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+async def _warm():
+    # Imports and asset compression run in a worker thread so in-flight requests are not blocked
+    await asyncio.to_thread(preload)
+    await asyncio.to_thread(assets.load)
+    await hasura_service.open_storage()
+    verifier.key_store.start()
+    jd_indexes.start()
+    if settings.enrichment_enabled:
+        enrichment_worker.worker.start()
+
+async def warm():
+    """
+    Preload dependencies, build the compressed asset cache, open the storage
+    backend's client or pool, start the signing key refresher, begin
+    loading JD indexes and start the enrichment worker.
+    """
+    global _warm_task
+    if _warm_task is None:
+        _warm_task = asyncio.get_running_loop().create_task(_warm())
+    await _warm_task
+
+def _log_failure(task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Warmup failed: %s", task.exception())
+
+def schedule_warm():
+    """Start warm() in the background if it has not run yet."""
+    if _warm_task is None:
+        asyncio.get_running_loop().create_task(warm()).add_done_callback(_log_failure)
+
+class WarmupMiddleware:
+    """ASGI middleware that schedules warm() once the first response has been sent."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if _warm_task is not None or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_then_warm(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                schedule_warm()
+
+        await self.app(scope, receive, send_then_warm)
@@ -9,8 +9,11 @@ function showCompanyForm() {
 // Load user's company data
 async function loadUserCompany(userId) {
     try {
-        const response = await fetch(`/company/user/${userId}`);
-        const data = await response.json();
+        // The dashboard returns the company and its first page of jobs in one request
+        const response = await fetch(`/dashboard/${userId}?fields=${JOB_LIST_FIELDS}`);
+        const dashboard = await response.json();
+        const data = { status: dashboard.status, data: dashboard.data ? dashboard.data.company : null };
+        window.prefetchedJobs = data.data ? dashboard.data : null;
         
         if (data.status === 'success' && data.data) {
             // Store company data
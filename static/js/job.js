@@ -15,6 +15,113 @@ function showJobForm() {
     loadCompanyJobs();
 }
 
+// Columns the list shows; the rest of a posting is fetched when it is opened
+const JOB_LIST_FIELDS = 'id,company_id,title,job_level,department,work_locations';
+// Cursor of the next page of the list, or null once it is complete
+let nextJobCursor = null;
+
+function jobDetail(key, value) {
+    const detail = document.createElement('p');
+    const label = key.replace(/_/g, ' ');
+    detail.innerHTML = `<strong>${label.charAt(0).toUpperCase() + label.slice(1)}:</strong> ${value}`;
+    return detail;
+}
+
+function renderJobDetails(details, job) {
+    details.innerHTML = '';
+    // Add all non-null job properties to details
+    for (const [key, value] of Object.entries(job)) {
+        if (value !== null && key !== 'id' && key !== 'company_id' && key !== 'title' && 
+            key !== 'created_at' && key !== 'updated_at') {
+            details.appendChild(jobDetail(key, value));
+        }
+    }
+}
+
+// Fetch the full posting the first time an item is opened
+async function toggleJobDetails(jobElement, job) {
+    const details = jobElement.querySelector('.job-details');
+    if (jobElement.dataset.loaded) {
+        const expanded = jobElement.dataset.expanded === 'true';
+        renderJobDetails(details, expanded ? jobElement.summary : jobElement.full);
+        jobElement.dataset.expanded = expanded ? 'false' : 'true';
+        return;
+    }
+    try {
+        const response = await fetch(`/jd/company/${job.company_id}?after=${job.id - 1}&limit=1`);
+        const page = await response.json();
+        if (page.status !== 'success' || !page.data.length) {
+            throw new Error(page.detail || 'Job description not found');
+        }
+        jobElement.summary = job;
+        jobElement.full = page.data[0];
+        jobElement.dataset.loaded = 'true';
+        jobElement.dataset.expanded = 'true';
+        renderJobDetails(details, jobElement.full);
+    } catch (error) {
+        details.appendChild(jobDetail('error', error.message));
+    }
+}
+
+function renderJob(job) {
+    const jobElement = document.createElement('div');
+    jobElement.className = 'job-item';
+    
+    // Create job title
+    const title = document.createElement('h3');
+    title.textContent = job.title;
+    
+    // Create job details section
+    const details = document.createElement('div');
+    details.className = 'job-details';
+    renderJobDetails(details, job);
+    
+    // Append elements to job item
+    jobElement.appendChild(title);
+    jobElement.appendChild(details);
+    jobElement.addEventListener('click', () => toggleJobDetails(jobElement, job));
+    return jobElement;
+}
+
+function renderLoadMore(jobList, companyId) {
+    const existing = document.getElementById('load-more-jobs');
+    if (existing) {
+        existing.remove();
+    }
+    if (nextJobCursor === null) {
+        return;
+    }
+    const button = document.createElement('button');
+    button.id = 'load-more-jobs';
+    button.className = 'btn-secondary';
+    button.textContent = 'Load more';
+    button.addEventListener('click', () => loadJobPage(jobList, companyId));
+    jobList.appendChild(button);
+}
+
+// Fetch and append the next page of the list
+async function loadJobPage(jobList, companyId) {
+    const button = document.getElementById('load-more-jobs');
+    if (button) {
+        button.disabled = true;
+    }
+    try {
+        const response = await fetch(`/jd/company/${companyId}?after=${nextJobCursor}&fields=${JOB_LIST_FIELDS}`);
+        const page = await response.json();
+        if (page.status !== 'success') {
+            throw new Error(page.detail || 'Error loading job descriptions');
+        }
+        page.data.forEach(job => jobList.insertBefore(renderJob(job), button));
+        nextJobCursor = page.next_cursor;
+        renderLoadMore(jobList, companyId);
+    } catch (error) {
+        console.error('Error loading job descriptions:', error);
+        if (button) {
+            button.disabled = false;
+        }
+    }
+}
+
 // Load company's job descriptions
 async function loadCompanyJobs() {
     // Try to get companyId from window object or localStorage
@@ -28,47 +135,30 @@ async function loadCompanyJobs() {
     jobList.innerHTML = '<p class="loading-jobs">Loading job descriptions...</p>';
     
     try {
-        const response = await fetch(`/jd/company/${companyId}`);
-        const data = await response.json();
+        // Only the first page is loaded up front; "Load more" fetches the rest on demand
+        let page;
+        // Start from the page already fetched by the dashboard request, if any
+        if (window.prefetchedJobs) {
+            page = { status: 'success', data: window.prefetchedJobs.jobs, next_cursor: window.prefetchedJobs.next_cursor };
+            window.prefetchedJobs = null;
+        } else {
+            const response = await fetch(`/jd/company/${companyId}?fields=${JOB_LIST_FIELDS}`);
+            page = await response.json();
+        }
         
         jobList.innerHTML = ''; // Clear loading message
         
-        if (data.status === 'success') {
+        if (page.status === 'success') {
             window.currentCompanyId = companyId; // Ensure it's set in memory
             
-            if (!data.data || data.data.length === 0) {
+            if (!page.data || page.data.length === 0) {
                 jobList.innerHTML = '<p class="no-jobs">No job descriptions added yet.</p>';
                 return;
             }
             
-            data.data.forEach(job => {
-                const jobElement = document.createElement('div');
-                jobElement.className = 'job-item';
-                
-                // Create job title
-                const title = document.createElement('h3');
-                title.textContent = job.title;
-                
-                // Create job details section
-                const details = document.createElement('div');
-                details.className = 'job-details';
-                
-                // Add all non-null job properties to details
-                for (const [key, value] of Object.entries(job)) {
-                    if (value !== null && key !== 'id' && key !== 'company_id' && key !== 'title' && 
-                        key !== 'created_at' && key !== 'updated_at') {
-                        const detail = document.createElement('p');
-                        const label = key.replace(/_/g, ' ');
-                        detail.innerHTML = `<strong>${label.charAt(0).toUpperCase() + label.slice(1)}:</strong> ${value}`;
-                        details.appendChild(detail);
-                    }
-                }
-                
-                // Append elements to job item
-                jobElement.appendChild(title);
-                jobElement.appendChild(details);
-                jobList.appendChild(jobElement);
-            });
+            page.data.forEach(job => jobList.appendChild(renderJob(job)));
+            nextJobCursor = page.next_cursor;
+            renderLoadMore(jobList, companyId);
         } else {
             jobList.innerHTML = '<p class="error">Error loading job descriptions</p>';
         }
@@ -0,0 +1,161 @@
+# tests/test_circuit_breaker.py
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from config.settings import settings
+from services import hasura_service, resilience
+from services.resilience import CircuitBreaker, ServiceUnavailableError
+
+RESET = 0.05
+
+def tripped(threshold: int = 2) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", threshold, RESET)
+    for _ in range(threshold):
+        breaker.check()
+        breaker.record_failure()
+    return breaker
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", 3, RESET)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == breaker.CLOSED
+    breaker.record_success()
+    assert breaker.failures == 0
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    assert breaker.trips == 1
+
+def test_open_rejects_until_reset():
+    breaker = tripped()
+    with pytest.raises(ServiceUnavailableError):
+        breaker.check()
+    assert breaker.rejected == 1
+
+def test_half_open_lets_one_probe_through():
+    breaker = tripped()
+    time.sleep(RESET * 1.5)
+    assert breaker.check() is True
+    assert breaker.state == breaker.HALF_OPEN
+    with pytest.raises(ServiceUnavailableError):
+        breaker.check()
+
+def test_probe_success_closes():
+    breaker = tripped()
+    time.sleep(RESET * 1.5)
+    breaker.check()
+    breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+    assert breaker.check() is False
+
+def test_probe_failure_reopens():
+    breaker = tripped()
+    time.sleep(RESET * 1.5)
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    with pytest.raises(ServiceUnavailableError):
+        breaker.check()
+
+def test_released_probe_lets_the_next_call_probe():
+    breaker = tripped()
+    time.sleep(RESET * 1.5)
+    breaker.check()
+    breaker.release()
+    assert breaker.state == breaker.HALF_OPEN
+    assert breaker.check() is True
+
+def test_disabled_breaker_never_opens():
+    breaker = CircuitBreaker("test", 0, RESET)
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.check() is False
+
+@pytest.fixture
+def hasura(monkeypatch):
+    """Point hasura_service at a scripted transport and a fresh, fast-resetting breaker."""
+    responses = []
+
+    async def handler(request):
+        response = responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        if callable(response):
+            return await response()
+        return response
+
+    monkeypatch.setattr(hasura_service, "breaker", CircuitBreaker("Hasura", 2, RESET))
+    monkeypatch.setattr(hasura_service, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://hasura"))
+    monkeypatch.setattr(settings, "hasura_graphql_endpoint", "http://hasura/v1/graphql")
+    monkeypatch.setattr(settings, "hasura_retries", 0)
+    monkeypatch.setattr(settings, "hasura_hedge_reads", False)
+    return responses
+
+def post():
+    return hasura_service._post_admitted({"query": "query { jobs { id } }"}, ("jobs", "query"), True)
+
+def trip(responses):
+    for _ in range(2):
+        responses.append(httpx.Response(500))
+        with pytest.raises(ServiceUnavailableError):
+            asyncio.run(post())
+    assert hasura_service.breaker.state == resilience.CircuitBreaker.OPEN
+    time.sleep(RESET * 1.5)
+
+def test_probe_answered_with_4xx_closes_the_breaker(hasura):
+    trip(hasura)
+    hasura.append(httpx.Response(401, json={"error": "unauthorized"}))
+    with pytest.raises(Exception, match="Hasura GraphQL request failed"):
+        asyncio.run(post())
+    assert hasura_service.breaker.state == resilience.CircuitBreaker.CLOSED
+    hasura.append(httpx.Response(200, json={"data": {"jobs": []}}))
+    assert asyncio.run(post()) == {"data": {"jobs": []}}
+
+def test_probe_answered_with_invalid_json_closes_the_breaker(hasura):
+    trip(hasura)
+    hasura.append(httpx.Response(200, content=b"<html>"))
+    with pytest.raises(Exception, match="Invalid JSON"):
+        asyncio.run(post())
+    assert hasura_service.breaker.state == resilience.CircuitBreaker.CLOSED
+
+def test_probe_with_unexpected_error_reopens_the_breaker(hasura):
+    trip(hasura)
+    hasura.append(RuntimeError("boom"))
+    with pytest.raises(RuntimeError):
+        asyncio.run(post())
+    assert hasura_service.breaker.state == resilience.CircuitBreaker.OPEN
+
+def test_cancelled_probe_is_released(hasura):
+    trip(hasura)
+
+    async def stall():
+        await asyncio.sleep(10)
+
+    async def cancel_probe():
+        task = asyncio.ensure_future(post())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    hasura.append(stall)
+    asyncio.run(cancel_probe())
+    assert hasura_service.breaker.state == resilience.CircuitBreaker.HALF_OPEN
+    hasura.append(httpx.Response(200, json={"data": {"jobs": []}}))
+    assert asyncio.run(post()) == {"data": {"jobs": []}}
+    assert hasura_service.breaker.state == resilience.CircuitBreaker.CLOSED
+
+def test_coalesced_read_timeout_is_service_unavailable(hasura, monkeypatch):
+    async def stall():
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(settings, "hasura_coalesce_reads", True)
+    monkeypatch.setattr(settings, "hasura_coalesce_timeout", 0.05)
+    hasura.append(stall)
+    document = hasura_service.graphql_queries.build("StallingRead", "query StallingRead { jobs { id } }")
+    with pytest.raises(ServiceUnavailableError, match="timed out"):
+        asyncio.run(hasura_service.execute_graphql(document, {}))
@@ -0,0 +1,55 @@
+# tests/test_jd_indexes.py
+import asyncio
+
+import pytest
+
+from services import hasura_service, jd_indexes
+from services.search_index import SearchIndex
+
+def row(jd_id):
+    return {"id": jd_id, "company_id": 1, "title": f"Engineer {jd_id}", "job_summary": "python services"}
+
+@pytest.fixture
+def table(monkeypatch):
+    """Rows in "Hasura", paged by id like iter_all_jobs."""
+    rows = []
+
+    async def iter_all_jobs(page_size, after=0, fields=None):
+        page = [item for item in rows if item["id"] > after]
+        for start in range(0, len(page), page_size):
+            yield page[start:start + page_size]
+
+    monkeypatch.setattr(hasura_service, "iter_all_jobs", iter_all_jobs)
+    return rows
+
+def test_catch_up_adds_rows_inserted_by_other_workers(table):
+    index = SearchIndex()
+    table.extend(row(jd_id) for jd_id in (1, 2, 3))
+    asyncio.run(jd_indexes.catch_up(2, [index]))
+    assert len(index) == 3 and index.max_id == 3
+    # 4 and 5 went through another worker; 6 through this one
+    table.extend(row(jd_id) for jd_id in (4, 5, 6))
+    index.add_many([row(6)])
+    assert 4 not in index and index.max_id == 3
+    asyncio.run(jd_indexes.catch_up(2, [index]))
+    assert all(jd_id in index for jd_id in (4, 5, 6))
+    assert len(index) == 6 and index.max_id == 6
+
+def test_refresh_loop_catches_up_periodically(table, monkeypatch):
+    index = SearchIndex()
+    monkeypatch.setattr(jd_indexes, "_indexes", [index])
+    monkeypatch.setattr(jd_indexes.settings, "jd_index_dir", "")
+    monkeypatch.setattr(jd_indexes.settings, "jd_index_refresh_interval", 0.01)
+
+    async def scenario():
+        task = asyncio.ensure_future(jd_indexes._run())
+        await asyncio.sleep(0.02)
+        assert index.ready
+        table.append(row(7))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert 7 in index
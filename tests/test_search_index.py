@@ -0,0 +1,53 @@
+# tests/test_search_index.py
+import pickle
+import random
+
+from services.search_index import SearchIndex
+
+WORDS = "python java rust kafka spark sql react docker kubernetes terraform".split()
+
+def rows(count, start=1, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": jd_id,
+            "company_id": rng.randint(1, 5),
+            "title": " ".join(rng.choices(WORDS, k=2)),
+            "job_summary": " ".join(rng.choices(WORDS, k=rng.randint(3, 12))),
+        }
+        for jd_id in range(start, start + count)
+    ]
+
+def test_company_scope_matches_filtered_unscoped_results():
+    index = SearchIndex()
+    index.add_many(rows(500), True)
+    total, hits = index.search("python kafka", limit=500)
+    expected = [hit for hit in hits if hit["company_id"] == 3]
+    scoped_total, scoped = index.search("python kafka", company_id=3, limit=500)
+    assert scoped_total == len(expected)
+    assert [hit["id"] for hit in scoped] == [hit["id"] for hit in expected]
+    assert index.search("python", company_id=99) == (0, [])
+
+def test_cached_weights_score_documents_added_later():
+    index = SearchIndex()
+    index.add_many(rows(500), True)
+    index.search("terraform")
+    # Below the refresh threshold, so the cached weights are reused for the new row
+    index.add({"id": 1000, "company_id": 1, "title": "terraform terraform", "job_summary": "terraform"})
+    total, hits = index.search("terraform", limit=1)
+    assert hits[0]["id"] == 1000
+
+def test_custom_boosts_are_cached_separately():
+    index = SearchIndex()
+    index.add_many(rows(200), True)
+    default = index.search("rust", limit=200)[1]
+    title_only = index.search("rust", limit=200, boosts={field: 0 for field in ("job_summary",)})[1]
+    assert {hit["id"] for hit in title_only} <= {hit["id"] for hit in default}
+    assert index.search("rust", limit=200)[1] == default
+
+def test_restore_rebuilds_company_postings():
+    index = SearchIndex()
+    index.add_many(rows(300), True)
+    restored = SearchIndex()
+    restored.restore(pickle.loads(pickle.dumps(index.snapshot())))
+    assert restored.search("docker", company_id=2) == index.search("docker", company_id=2)
@@ -0,0 +1,74 @@
+# tests/test_similarity_index.py
+import os
+import sys
+
+import pytest
+
+from services import similarity_index
+from services.similarity_index import PARTIAL, SimilarityIndex
+
+def row(jd_id):
+    return {"id": jd_id, "company_id": jd_id % 3, "title": f"Job {jd_id}", "job_summary": f"python data engineer pipelines team{jd_id % 5}"}
+
+def generations(path):
+    return sorted(name for name in os.listdir(path) if os.path.isdir(os.path.join(path, name)))
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(similarity_index.settings, "jd_index_dir", str(tmp_path))
+    return tmp_path / "similarity"
+
+def test_save_is_skipped_when_nothing_was_added(index_dir):
+    index = SimilarityIndex()
+    index.add_many([row(jd_id) for jd_id in range(1, 20)], True)
+    index.save()
+    saved = generations(index_dir)
+    index.save()
+    loaded = SimilarityIndex()
+    assert loaded.load()
+    loaded.save()
+    assert generations(index_dir) == saved
+
+def test_save_maps_a_current_generation_that_holds_every_row(index_dir):
+    first, second = SimilarityIndex(), SimilarityIndex()
+    first.add_many([row(jd_id) for jd_id in range(1, 20)], True)
+    first.save()
+    second.load()
+    second.add_many([row(jd_id) for jd_id in range(20, 30)], True)
+    second.save()
+    first.add_many([row(jd_id) for jd_id in range(20, 25)], True)
+    first.save()
+    assert generations(index_dir) == [second._generation]
+    assert first._generation == second._generation
+    assert len(first) == 29 and first.stats()["memory_rows"] == 0
+
+def test_save_keeps_generations_still_being_written(index_dir):
+    index = SimilarityIndex()
+    index.add_many([row(jd_id) for jd_id in range(1, 20)], True)
+    index.save()
+    os.makedirs(index_dir / f"0-1{PARTIAL}")
+    index.add(row(20))
+    index.save()
+    assert generations(index_dir) == [f"0-1{PARTIAL}", index._generation]
+    assert index.similar(20, 3)
+
+def test_refresh_maps_a_newer_generation_holding_every_row(index_dir):
+    first, second = SimilarityIndex(), SimilarityIndex()
+    first.add_many([row(jd_id) for jd_id in range(1, 20)], True)
+    first.save()
+    second.load()
+    first.add_many([row(jd_id) for jd_id in range(20, 25)], True)
+    second.add_many([row(jd_id) for jd_id in range(20, 30)], True)
+    second.save()
+    first.refresh()
+    assert first._generation == second._generation
+    assert len(first) == 29 and first.stats()["memory_rows"] == 0
+
+def test_saves_and_loads_without_fcntl(index_dir, monkeypatch):
+    # Windows has no fcntl; importing it there raises ImportError
+    monkeypatch.setitem(sys.modules, "fcntl", None)
+    index = SimilarityIndex()
+    index.add_many([row(jd_id) for jd_id in range(1, 20)], True)
+    index.save()
+    loaded = SimilarityIndex()
+    assert loaded.load() and len(loaded) == 19
@@ -0,0 +1,131 @@
+# tests/test_token_verifier.py
+import asyncio
+import datetime
+import time
+
+import jwt
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from services import cache
+from services.token_verifier import FirebaseTokenVerifier, InvalidTokenError, SigningKeyStore
+
+PROJECT = "athena-test"
+
+def key_pair():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken.system.gserviceaccount.com")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    return private_pem, cert.public_bytes(serialization.Encoding.PEM).decode("utf-8")
+
+PRIVATE, CERT = key_pair()
+OTHER_PRIVATE, _ = key_pair()
+
+def token(key=PRIVATE, kid="k1", **overrides) -> str:
+    now = int(time.time())
+    claims = {
+        "aud": PROJECT,
+        "iss": f"https://securetoken.google.com/{PROJECT}",
+        "sub": "user-1",
+        "iat": now - 10,
+        "exp": now + 3600,
+        "auth_time": now - 10,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
+
+class StubKeyStore(SigningKeyStore):
+    """Serves the generated certificate and counts refreshes instead of fetching."""
+
+    def __init__(self):
+        super().__init__("http://certs.invalid")
+        self.set_keys({"k1": CERT})
+        self.refreshes = 0
+
+    async def refresh(self, force: bool = False):
+        self.refreshes += 1
+
+def verifier():
+    return FirebaseTokenVerifier(PROJECT, StubKeyStore(), cache.InMemoryLRUCache(100))
+
+def test_valid_token():
+    claims = asyncio.run(verifier().verify(token()))
+    assert claims["uid"] == "user-1"
+    assert claims["aud"] == PROJECT
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "other-project"},
+    {"iss": "https://securetoken.google.com/other-project"},
+    {"iss": "https://accounts.google.com"},
+])
+def test_wrong_audience_or_issuer(overrides):
+    with pytest.raises(InvalidTokenError):
+        asyncio.run(verifier().verify(token(**overrides)))
+
+def test_expired_token():
+    now = int(time.time())
+    with pytest.raises(InvalidTokenError):
+        asyncio.run(verifier().verify(token(iat=now - 7200, exp=now - 3600)))
+
+@pytest.mark.parametrize("field", ["iat", "auth_time"])
+def test_issued_in_the_future(field):
+    with pytest.raises(InvalidTokenError):
+        asyncio.run(verifier().verify(token(**{field: int(time.time()) + 600})))
+
+def test_unknown_kid_refreshes_then_rejects():
+    subject = verifier()
+    with pytest.raises(InvalidTokenError, match="unknown key"):
+        asyncio.run(subject.verify(token(kid="rotated-away")))
+    assert subject.key_store.refreshes == 1
+
+def test_bad_signature():
+    with pytest.raises(InvalidTokenError):
+        asyncio.run(verifier().verify(token(key=OTHER_PRIVATE)))
+
+def test_tampered_payload():
+    header, payload, signature = token().split(".")
+    forged = token(sub="someone-else").split(".")[1]
+    with pytest.raises(InvalidTokenError):
+        asyncio.run(verifier().verify(".".join((header, forged, signature))))
+
+def test_claims_are_cached_until_exp(monkeypatch):
+    subject = verifier()
+    decodes = []
+    original = subject._decode
+    monkeypatch.setattr(subject, "_decode", lambda raw, key: decodes.append(raw) or original(raw, key))
+    valid = token()
+
+    async def run():
+        first = await subject.verify(valid)
+        second = await subject.verify(valid)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert len(decodes) == 1
+
+def test_invalid_tokens_are_not_cached():
+    subject = verifier()
+    bad = token(key=OTHER_PRIVATE)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(InvalidTokenError):
+                await subject.verify(bad)
+
+    asyncio.run(run())
+    assert len(subject.cache._entries) == 0